@@ -0,0 +1,4 @@
+"""Ponto de entrada ASGI: `uvicorn asgi:app` (API assíncrona + demais rotas do Flask)."""
+from calorie_tracker.asgi import create_asgi_app
+
+app = create_asgi_app()
@@ -0,0 +1,60 @@
+"""Rastreador de calorias: fábrica da aplicação Flask."""
+import os
+from collections.abc import Mapping
+
+from flask import Flask
+
+from .cache import init_cache
+from .compression import init_compression
+from .config import Config
+from .database import configure_engine_options, init_engines
+from .extensions import db, migrate, login_manager
+from .instrumentation import init_instrumentation
+from .json_provider import init_json_provider
+from .ratelimit import init_rate_limits
+from .replicas import init_replicas
+from .sessions import init_sessions
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_app(config=None):
+    """Cria a aplicação.
+
+    `config` (dict ou objeto/classe de configuração) é aplicado por último,
+    depois de Config e de instance/config.py. Nada acessa o banco aqui: o
+    schema é criado por `flask init-db` ou `flask db upgrade`.
+    """
+    app = Flask(__name__, instance_relative_config=True,
+                root_path=ROOT_PATH, instance_path=os.path.join(ROOT_PATH, 'instance'))
+    app.config.from_object(Config)
+    # Ajustes locais em instance/config.py (ex.: gerados por `flask bench-login --write`)
+    app.config.from_pyfile('config.py', silent=True)
+    if isinstance(config, Mapping):
+        app.config.from_mapping(config)
+    elif config is not None:
+        app.config.from_object(config)
+
+    configure_engine_options(app)
+    db.init_app(app)
+    init_engines(app)
+    init_instrumentation(app)
+    migrate.init_app(app)
+    login_manager.init_app(app)
+    init_replicas(app)
+    init_cache(app)
+    init_json_provider(app)
+    init_compression(app)
+    init_sessions(app)
+    init_rate_limits(app)
+
+    # Os módulos de resumos, versões e identidades registram os hooks de sessão ao serem importados
+    from . import summaries, versions, identity  # noqa: F401
+    from . import auth, main, api, health
+    from .cli import register_commands
+    app.register_blueprint(auth.bp)
+    app.register_blueprint(main.bp)
+    app.register_blueprint(api.bp)
+    app.register_blueprint(health.bp)
+    register_commands(app)
+    return app
@@ -0,0 +1,570 @@
+import csv
+import hashlib
+import io
+import re
+from datetime import datetime, date, timedelta
+
+from flask import Blueprint, current_app, request, jsonify, url_for, Response, stream_with_context
+from flask_login import login_required, current_user
+from sqlalchemy import func, select, insert, text
+from sqlalchemy.orm import joinedload
+
+from .cache import cache_is_shared
+from .extensions import db
+from .food_import import FOOD_IMPORT_FORMATS, iter_food_rows, import_food_rows
+from .models import User, FoodItem, FoodEntry, DailySummary
+from .replicas import read_only, reading_from_replica
+from .security import PasswordCheckBusy, password_needs_rehash
+from .summaries import NUTRIENTS, get_nutrition_totals
+from .tokens import issue_token
+from .versions import catalog_versions, get_version, _summary_version_key
+
+bp = Blueprint('api', __name__, url_prefix='/api')
+
+FOOD_FIELDS = ('id', 'name', 'calories', 'protein', 'carbs', 'fat')
+
+@bp.route('/food', methods=['GET', 'POST'])
+@read_only
+@login_required
+def api_food():
+    if request.method == 'POST':
+        food, error = _food_item_from_payload(request.get_json(), current_user.id)
+        if error:
+            return jsonify({'error': error[0]}), error[1]
+
+        try:
+            db.session.add(food)
+            db.session.commit()
+            return jsonify({'message': 'Food item added', 'id': food.id}), 201
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 400
+
+    # GET - Listar alimentos (paginação por cursor no id)
+    page, error = _parse_food_page_args(request.args, current_app.config)
+    if error:
+        return jsonify(error[0]), error[1]
+    limit, after, fields = page
+
+    # GET condicional: o ETag vem das versões do catálogo, sem consultar o banco
+    etag = _food_page_etag(current_user.id, limit, after, fields, request.args.get('fields'))
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    rows = db.session.execute(_food_page_query(current_user.id, limit, after, fields)).all()
+    items, next_args = _food_page(rows, limit, fields, request.args.get('fields'))
+    response = jsonify(items)
+    if next_args:
+        response.headers['X-Next-Cursor'] = str(next_args['after'])
+        response.headers['Link'] = f'<{url_for("api.api_food", **next_args)}>; rel="next"'
+    return _revalidate(response, etag)
+
+def _etag(*parts):
+    """ETag forte a partir das versões e parâmetros que determinam a resposta.
+
+    Os _*_etag retornam None (resposta sem ETag) se o cache das versões não é
+    compartilhado: um processo não veria as versões trocadas nos outros.
+    """
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+def _food_page_etag(user_id, limit, after, fields, fields_arg):
+    if not cache_is_shared():
+        return None
+    return _etag('food', user_id, *catalog_versions(user_id), limit, after, fields, bool(fields_arg))
+
+def _dashboard_etag(user, day):
+    # Entradas e totais do dia, nomes/nutrientes dos alimentos e a meta do usuário
+    if not cache_is_shared():
+        return None
+    return _etag('dashboard', user.id, day.isoformat(), user.daily_calorie_goal,
+                 get_version(_summary_version_key(user.id, day)), *catalog_versions(user.id))
+
+def _not_modified(etag):
+    """Resposta 304 se o If-None-Match do cliente já contém `etag`; senão None."""
+    # Comparação fraca: respostas comprimidas levam o mesmo ETag como W/"..."
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        return _revalidate(current_app.response_class(status=304), etag)
+    return None
+
+def _revalidate(response, etag):
+    """ETag e Cache-Control de respostas que o navegador guarda e revalida a cada uso."""
+    # Um corpo lido de uma réplica atrasada não pode ficar associado à versão atual
+    if etag is not None and (response.status_code == 304 or not reading_from_replica()):
+        response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Cookie')
+    return response
+
+def _food_item_from_payload(data, user_id):
+    """Monta o FoodItem de um POST /api/food; retorna (food, None) ou (None, (erro, status))."""
+    if not data:
+        return None, ('No data provided', 400)
+
+    # Validação de campos obrigatórios
+    if 'name' not in data or 'calories' not in data:
+        return None, ('Name and calories are required', 400)
+
+    return FoodItem(
+        name=data['name'],
+        calories=data['calories'],
+        protein=data.get('protein', 0),
+        carbs=data.get('carbs', 0),
+        fat=data.get('fat', 0),
+        is_public=data.get('is_public', True),
+        user_id=user_id
+    ), None
+
+def _parse_food_page_args(args, config):
+    """Lê limit, after e fields da query string; retorna ((limit, after, fields), None) ou (None, (corpo, status))."""
+    try:
+        limit = int(args.get('limit', config['FOOD_PAGE_DEFAULT_LIMIT']))
+        after = int(args.get('after', 0))
+    except ValueError:
+        return None, ({'error': 'limit and after must be integers'}, 400)
+    if limit <= 0:
+        return None, ({'error': 'limit must be greater than 0'}, 400)
+    limit = min(limit, config['FOOD_PAGE_MAX_LIMIT'])
+
+    fields = FOOD_FIELDS
+    if args.get('fields'):
+        fields = tuple(f.strip() for f in args['fields'].split(',') if f.strip())
+        unknown = [f for f in fields if f not in FOOD_FIELDS]
+        if unknown or not fields:
+            return None, ({'error': f"Invalid fields: {', '.join(unknown)}",
+                           'allowed': list(FOOD_FIELDS)}, 400)
+    return (limit, after, fields), None
+
+def _food_page_query(user_id, limit, after, fields):
+    # Busca apenas as colunas pedidas (+ id para o cursor) e uma linha extra
+    # para saber se existe próxima página
+    columns = [FoodItem.id] + [getattr(FoodItem, f) for f in fields if f != 'id']
+    return select(*columns).where(
+        (FoodItem.is_public == True) | (FoodItem.user_id == user_id),
+        FoodItem.id > after
+    ).order_by(FoodItem.id).limit(limit + 1)
+
+def _food_page(rows, limit, fields, fields_arg):
+    """Retorna (itens da página, argumentos do link da próxima página ou None)."""
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    items = [{f: row._mapping[f] for f in fields} for row in rows]
+    if not has_next:
+        return items, None
+    next_args = {'after': rows[-1].id, 'limit': limit}
+    if fields_arg:
+        next_args['fields'] = ','.join(fields)
+    return items, next_args
+
+def _search_terms(query):
+    return re.findall(r'\w+', query)
+
+def _search_foods_fts(terms, user_id, limit, candidates):
+    # Cada termo vira uma busca por prefixo: "feij"* "pre"*
+    match = ' '.join(f'"{term}"*' for term in terms)
+    # O bm25 (rank) custa uma leitura por match: é calculado só para os
+    # `candidates` primeiros, sem o JOIN, e a ordem entre eles é a do rank.
+    # Buscas com até `candidates` matches têm a ordem exata
+    return db.session.execute(text(
+        "SELECT food_item.id, food_item.name, food_item.calories, food_item.protein, "
+        "food_item.carbs, food_item.fat "
+        "FROM (SELECT rowid, rank FROM food_item_fts WHERE food_item_fts MATCH :match "
+        "LIMIT :candidates) AS candidate "
+        "JOIN food_item ON food_item.id = candidate.rowid "
+        "WHERE food_item.is_public = 1 OR food_item.user_id = :user_id "
+        "ORDER BY candidate.rank, food_item.id LIMIT :limit"
+    ), {'match': match, 'user_id': user_id, 'candidates': candidates, 'limit': limit}).all()
+
+def _search_foods_like(terms, user_id, limit):
+    # Fallback para bancos sem FTS5 (sem normalização de acentos)
+    columns = [getattr(FoodItem, f) for f in FOOD_FIELDS]
+    return db.session.execute(
+        select(*columns).where(
+            (FoodItem.is_public == True) | (FoodItem.user_id == user_id),
+            *[FoodItem.name.ilike(f'%{term}%') for term in terms]
+        ).order_by(FoodItem.name).limit(limit)
+    ).all()
+
+@bp.route('/food/search')
+@read_only
+@login_required
+def api_food_search():
+    terms = _search_terms(request.args.get('q', ''))
+    if not terms:
+        return jsonify({'error': 'q is required'}), 400
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if limit <= 0:
+        return jsonify({'error': 'limit must be greater than 0'}), 400
+    limit = min(limit, current_app.config['FOOD_SEARCH_MAX_LIMIT'])
+
+    if db.engine.dialect.name == 'sqlite':
+        rows = _search_foods_fts(terms, current_user.id, limit,
+                                 current_app.config['FOOD_SEARCH_RANK_CANDIDATES'])
+    else:
+        rows = _search_foods_like(terms, current_user.id, limit)
+    return jsonify([{f: row._mapping[f] for f in FOOD_FIELDS} for row in rows])
+
+@bp.route('/food/import', methods=['POST'])
+@login_required
+def api_food_import():
+    # Pela API os alimentos importados são privados; o catálogo público só
+    # recebe importações pelo comando flask import-foods
+    if request.args.get('is_public', 'false').lower() not in ('0', 'false', 'no'):
+        return jsonify({'error': 'Public imports are only available through the import-foods command'}), 403
+    # Tamanho conferido antes de ler o corpo; um corpo chunked (sem Content-Length) não teria limite
+    if request.content_length is None and 'chunked' in request.headers.get('Transfer-Encoding', ''):
+        return jsonify({'error': 'Content-Length is required'}), 411
+    if (request.content_length or 0) > current_app.config['FOOD_IMPORT_MAX_BYTES']:
+        return jsonify({'error': 'File too large'}), 413
+
+    # Aceita upload multipart (campo "file") ou o arquivo direto no corpo
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+    filename = upload.filename if upload else ''
+
+    fmt = request.args.get('format')
+    if not fmt:
+        if filename.endswith(('.jsonl', '.ndjson')) or 'ndjson' in (request.mimetype or ''):
+            fmt = 'jsonl'
+        else:
+            fmt = 'csv'
+    if fmt not in FOOD_IMPORT_FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(FOOD_IMPORT_FORMATS)}"}), 400
+
+    try:
+        stats = import_food_rows(iter_food_rows(stream, fmt),
+                                 user_id=current_user.id, is_public=False)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    return jsonify(stats), 201 if stats['inserted'] else 200
+
+def _parse_date_arg(name):
+    """Lê um parâmetro de data ISO (AAAA-MM-DD) da query string; lança ValueError se inválido."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'{name} must be a date in YYYY-MM-DD format')
+
+EXPORT_COLUMNS = ('date', 'food_item_id', 'food', 'quantity', 'calories', 'protein', 'carbs', 'fat')
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'jsonl': 'application/jsonl', 'ndjson': 'application/x-ndjson'}
+
+@bp.route('/export')
+@read_only
+@login_required
+def api_export():
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_MIMETYPES:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_MIMETYPES)}"}), 400
+    try:
+        date_from = _parse_date_arg('from')
+        date_to = _parse_date_arg('to')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if date_from and date_to and date_from > date_to:
+        return jsonify({'error': 'from must not be after to'}), 400
+
+    stmt = select(
+        FoodEntry.date, FoodEntry.food_item_id, FoodItem.name, FoodEntry.quantity,
+        *[getattr(FoodItem, nutrient) * FoodEntry.quantity for nutrient in NUTRIENTS]
+    ).join(FoodEntry.food_item).where(
+        FoodEntry.user_id == current_user.id
+    ).order_by(FoodEntry.date, FoodEntry.id)
+    if date_from:
+        stmt = stmt.where(FoodEntry.date >= date_from)
+    if date_to:
+        stmt = stmt.where(FoodEntry.date <= date_to)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == 'csv':
+            # O cabeçalho sai antes da query para o primeiro byte chegar imediatamente
+            writer.writerow(EXPORT_COLUMNS)
+            yield buffer.getvalue()
+        # yield_per busca as linhas em partes, sem materializar o resultado inteiro
+        result = db.session.execute(stmt.execution_options(yield_per=current_app.config['EXPORT_YIELD_PER']))
+        for partition in result.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            for row in partition:
+                # Nutrientes arredondados como em _entry_payload (sem ruído de float)
+                values = (row[0].isoformat(), *row[1:4], *(round(value or 0, 1) for value in row[4:]))
+                if fmt == 'csv':
+                    writer.writerow(values)
+                else:
+                    buffer.write(current_app.json.dumps(dict(zip(EXPORT_COLUMNS, values))) + '\n')
+            yield buffer.getvalue()
+
+    extension = 'csv' if fmt == 'csv' else 'jsonl'
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename=diario.{extension}'}
+    )
+
+HISTORY_BUCKETS = ('day', 'week', 'month')
+
+def _history_bucket(bucket):
+    """Expressão SQL que agrupa DailySummary.date em dia, semana (segunda-feira) ou mês."""
+    if bucket == 'day':
+        return DailySummary.date
+    if db.engine.dialect.name == 'sqlite':
+        if bucket == 'week':
+            return func.date(DailySummary.date, 'weekday 0', '-6 days')
+        return func.strftime('%Y-%m-01', DailySummary.date)
+    return func.cast(func.date_trunc(bucket, DailySummary.date), db.Date)
+
+@bp.route('/history')
+@read_only
+@login_required
+def api_history():
+    bucket = request.args.get('bucket', 'day')
+    if bucket not in HISTORY_BUCKETS:
+        return jsonify({'error': f"bucket must be one of: {', '.join(HISTORY_BUCKETS)}"}), 400
+    today = datetime.utcnow().date()
+    try:
+        date_to = _parse_date_arg('to') or today
+        date_from = _parse_date_arg('from') or date_to - timedelta(days=29)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if date_from > date_to:
+        return jsonify({'error': 'from must not be after to'}), 400
+    if (date_to - date_from).days + 1 > current_app.config['HISTORY_MAX_DAYS']:
+        return jsonify({'error': f"range must not exceed {current_app.config['HISTORY_MAX_DAYS']} days"}), 400
+
+    # Agrega os resumos diários já materializados com GROUP BY no banco
+    period = _history_bucket(bucket).label('period')
+    rows = db.session.execute(
+        select(
+            period,
+            *[func.sum(getattr(DailySummary, nutrient)).label(nutrient) for nutrient in NUTRIENTS],
+            func.sum(DailySummary.entry_count).label('entries')
+        ).where(
+            DailySummary.user_id == current_user.id,
+            DailySummary.date >= date_from,
+            DailySummary.date <= date_to,
+            DailySummary.entry_count > 0
+        ).group_by(period).order_by(period)
+    ).all()
+
+    series = []
+    for row in rows:
+        item = {'period': str(row.period)}
+        item.update({nutrient: round(getattr(row, nutrient), 1) for nutrient in NUTRIENTS})
+        item['entries'] = row.entries
+        series.append(item)
+
+    response = jsonify({
+        'from': date_from.isoformat(),
+        'to': date_to.isoformat(),
+        'bucket': bucket,
+        'series': series
+    })
+    # A resposta depende só de (usuário, intervalo); períodos passados mudam raramente
+    max_age = current_app.config['HISTORY_CACHE_MAX_AGE_PAST' if date_to < today else 'HISTORY_CACHE_MAX_AGE']
+    response.headers['Cache-Control'] = f'private, max-age={max_age}'
+    response.vary.add('Cookie')
+    return response
+
+def _entry_payload(entry):
+    """Linha do diário em JSON, com os nutrientes já multiplicados pela quantidade."""
+    food = entry.food_item
+    return {
+        'id': entry.id,
+        'food_item_id': entry.food_item_id,
+        'name': food.name,
+        'quantity': entry.quantity,
+        **{nutrient: round((getattr(food, nutrient) or 0) * entry.quantity, 1) for nutrient in NUTRIENTS}
+    }
+
+def _day_totals_payload(user, day, totals):
+    """Totais de um dia, meta de calorias e saldo restante."""
+    return {
+        'date': day.isoformat(),
+        'totals': {nutrient: round(totals[nutrient], 1) for nutrient in NUTRIENTS},
+        'goal': user.daily_calorie_goal,
+        'remaining': round(max(0, user.daily_calorie_goal - totals['calories']), 1)
+    }
+
+def _dashboard_payload(user, day, entries, totals):
+    """Dados do dashboard de um dia: totais, meta, saldo e entradas."""
+    return {**_day_totals_payload(user, day, totals), 'entries': [_entry_payload(entry) for entry in entries]}
+
+def _validate_entry_payload(data):
+    """Valida os campos de uma entrada; retorna (erro, status) ou None."""
+    if not data:
+        return 'No data provided', 400
+
+    # Verifica se food_item_id foi fornecido
+    if 'food_item_id' not in data:
+        return 'food_item_id is required', 400
+
+    # Validação de quantidade
+    quantity = data.get('quantity', 1.0)
+    if isinstance(quantity, bool) or not isinstance(quantity, (int, float)):
+        return 'Quantity must be a number', 400
+    if quantity <= 0:
+        return 'Quantity must be greater than 0', 400
+    return None
+
+def _validate_food_access(food_item, user_id):
+    """Verifica se o food_item existe e é público ou do usuário; retorna (erro, status) ou None."""
+    if not food_item:
+        return 'Food item not found', 404
+    if not food_item.is_public and food_item.user_id != user_id:
+        return 'Food item not accessible', 403
+    return None
+
+@bp.route('/token', methods=['POST'])
+def api_token():
+    # Troca usuário e senha por um token Bearer: a senha é verificada só aqui,
+    # as chamadas seguintes validam apenas a assinatura do token
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not data.get('username') or not data.get('password'):
+        return jsonify({'error': 'username and password are required'}), 400
+
+    user = User.query.filter_by(username=data['username']).first()
+    try:
+        valid = user is not None and user.check_password(data['password'])
+    except PasswordCheckBusy:
+        return jsonify({'error': 'Too many login attempts right now, please try again'}), 503
+    if not valid:
+        return jsonify({'error': 'Invalid username or password'}), 401
+    if password_needs_rehash(user.password_hash):
+        user.set_password(data['password'])
+        db.session.commit()
+
+    return jsonify({'access_token': issue_token(user), 'token_type': 'Bearer',
+                    'expires_in': current_app.config['API_TOKEN_MAX_AGE']})
+
+@bp.route('/entry', methods=['POST'])
+@login_required
+def add_entry():
+    data = request.get_json()
+
+    # Validação de dados
+    error = _validate_entry_payload(data)
+    if error:
+        return jsonify({'error': error[0]}), error[1]
+
+    food_item_id = data['food_item_id']
+    quantity = data.get('quantity', 1.0)
+
+    # Verifica se o food_item existe e se o usuário tem acesso a ele
+    food_item = db.session.get(FoodItem, food_item_id)
+    error = _validate_food_access(food_item, current_user.id)
+    if error:
+        return jsonify({'error': error[0]}), error[1]
+
+    today = datetime.utcnow().date()
+    try:
+        entry = FoodEntry(
+            user_id=current_user.id,
+            food_item_id=food_item.id,
+            quantity=quantity,
+            date=today
+        )
+        db.session.add(entry)
+        db.session.flush()
+        # Monta a linha antes do commit, que expira os objetos da sessão
+        row = _entry_payload(entry)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+
+    # Devolve a linha e os totais atualizados: o dashboard se atualiza sem recarregar
+    totals = get_nutrition_totals(current_user.id, today)
+    return jsonify({'message': 'Entry added', 'id': row['id'], 'entry': row,
+                    **_day_totals_payload(current_user, today, totals)}), 201
+
+@bp.route('/dashboard/today')
+@read_only
+@login_required
+def dashboard_today():
+    today = datetime.utcnow().date()
+    etag = _dashboard_etag(current_user, today)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    entries = FoodEntry.query.options(
+        joinedload(FoodEntry.food_item)
+    ).filter_by(user_id=current_user.id, date=today).order_by(FoodEntry.id).all()
+    totals = get_nutrition_totals(current_user.id, today)
+    return _revalidate(jsonify(_dashboard_payload(current_user, today, entries, totals)), etag)
+
+@bp.route('/entries/batch', methods=['POST'])
+@login_required
+def add_entries_batch():
+    data = request.get_json()
+    # Aceita uma lista de entradas ou {"entries": [...]}
+    items = data.get('entries') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'A non-empty list of entries is required'}), 400
+    if len(items) > current_app.config['ENTRY_BATCH_MAX_SIZE']:
+        return jsonify({'error': f"At most {current_app.config['ENTRY_BATCH_MAX_SIZE']} entries per batch"}), 400
+
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        error = _validate_entry_payload(item) if isinstance(item, dict) else ('Entry must be an object', 400)
+        if not error and (isinstance(item['food_item_id'], bool) or not isinstance(item['food_item_id'], int)):
+            error = ('food_item_id must be an integer', 400)
+        if error:
+            results[index] = {'index': index, 'status': error[1], 'error': error[0]}
+        else:
+            valid.append(index)
+
+    # Carrega todos os alimentos referenciados com uma única query IN
+    food_ids = {items[index]['food_item_id'] for index in valid}
+    food_items = {}
+    if food_ids:
+        food_items = {f.id: f for f in FoodItem.query.filter(FoodItem.id.in_(food_ids))}
+
+    today = datetime.utcnow().date()
+    accepted = []
+    for index in valid:
+        item = items[index]
+        error = _validate_food_access(food_items.get(item['food_item_id']), current_user.id)
+        if error:
+            results[index] = {'index': index, 'status': error[1], 'error': error[0]}
+            continue
+        accepted.append((index, {
+            'user_id': current_user.id,
+            'food_item_id': item['food_item_id'],
+            'quantity': float(item.get('quantity', 1.0)),
+            'date': today
+        }))
+
+    if accepted:
+        # Um único INSERT ... VALUES (...), (...) RETURNING na mesma transação
+        try:
+            inserted = db.session.execute(
+                insert(FoodEntry).returning(FoodEntry.id, FoodEntry.food_item_id, FoodEntry.quantity),
+                [row for _, row in accepted]
+            ).all()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 400
+        # Entradas com o mesmo alimento e quantidade são equivalentes, então a
+        # ordem do RETURNING não importa para associar os ids aos itens
+        ids = {}
+        for row in sorted(inserted, key=lambda r: r.id):
+            ids.setdefault((row.food_item_id, row.quantity), []).append(row.id)
+        for index, row in accepted:
+            entry_id = ids[(row['food_item_id'], row['quantity'])].pop(0)
+            results[index] = {'index': index, 'status': 201, 'id': entry_id}
+
+    created = len(accepted)
+    failed = len(items) - created
+    status = 201 if not failed else (207 if created else 400)
+    return jsonify({'created': created, 'failed': failed, 'results': results}), status
@@ -0,0 +1,271 @@
+"""Camada ASGI: versões assíncronas dos endpoints JSON de maior tráfego.
+
+GET/POST /api/food, POST /api/entry e GET /api/dashboard/today são atendidos
+por views assíncronas com AsyncSession (aiosqlite/asyncpg): enquanto esperam o
+banco, não ocupam uma thread. O resto do site (páginas, login, demais rotas da
+API) segue para o app Flask, montado como WSGI na raiz. O contrato JSON e a
+autenticação (cookie de sessão do Flask-Login, 401 em JSON) são os das views
+síncronas.
+
+Execute: WEB_CONCURRENCY=4 uvicorn asgi:app
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import wraps
+from urllib.parse import urlencode
+
+from a2wsgi import WSGIMiddleware
+from flask_login.utils import decode_cookie
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, joinedload
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from werkzeug.http import parse_etags, quote_etag
+from starlette.routing import Mount, Route
+
+from . import create_app
+from .api import (_dashboard_etag, _dashboard_payload, _day_totals_payload, _entry_payload,
+                  _food_item_from_payload, _food_page, _food_page_etag, _food_page_query,
+                  _parse_food_page_args, _validate_entry_payload, _validate_food_access)
+from .cache import cache_is_shared, get_cache
+from .compression import compress_body, weak_etag
+from .database import listen_sqlite_pragmas
+from .identity import cached_identity, detached_user, remember_identity
+from .instrumentation import (begin_request_timing, end_request_timing, listen_query_timing,
+                              record_request)
+from .models import User, FoodItem, FoodEntry, DailySummary
+from .ratelimit import retry_after, user_client
+from .sessions import session_data
+from .tokens import bearer_token, verify_token
+from .summaries import _summary_totals, listen_summary_hooks, totals_key
+from .versions import listen_version_hooks
+
+# Driver assíncrono de cada banco suportado
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+
+class AsyncTierSession(Session):
+    """Sessão síncrona por trás de cada AsyncSession, com os mesmos hooks de DailySummary e versões."""
+
+listen_summary_hooks(AsyncTierSession)
+listen_version_hooks(AsyncTierSession)
+
+
+def async_database_uri(uri):
+    """Troca o driver da URI do banco pelo equivalente assíncrono."""
+    url = make_url(uri)
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
+async def _json_body(request):
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+async def _load_user(request, flask_app, session):
+    """Usuário do cookie de sessão do Flask, do "lembrar-me" ou do token Bearer, como faz o Flask-Login."""
+    cookie = request.cookies.get(flask_app.config['SESSION_COOKIE_NAME'])
+    data = session_data(flask_app, cookie) if cookie else {}
+    user_id = data.get('_user_id')
+    if user_id is None and data.get('_remember') != 'clear':
+        remember = request.cookies.get(flask_app.config.get('REMEMBER_COOKIE_NAME', 'remember_token'))
+        if remember:
+            user_id = decode_cookie(remember)
+        else:
+            # Mesmo request_loader do Flask-Login: token Bearer, sem consultar o banco
+            user_id = verify_token(bearer_token(request.headers.get('authorization')))
+    if user_id is None:
+        return None
+    try:
+        user_id = int(user_id)
+    except ValueError:
+        return None
+    # Mesmo cache de identidades do user_loader síncrono
+    identity = cached_identity(user_id)
+    if identity is not None:
+        return await session.merge(detached_user(identity), load=False)
+    user = await session.get(User, user_id)
+    if user is not None:
+        remember_identity(user)
+    return user
+
+async def _nutrition_totals(session, user_id, day):
+    """Versão assíncrona de get_nutrition_totals (mesmo cache, mesmas chaves)."""
+    if not cache_is_shared():
+        return _summary_totals(await session.get(DailySummary, (user_id, day)))
+    cache = get_cache()
+    key = totals_key(user_id, day)
+    totals = cache.get(key)
+    if totals is None:
+        totals = _summary_totals(await session.get(DailySummary, (user_id, day)))
+        cache.set(key, totals)
+    return totals
+
+def _json_response(request, content, headers):
+    """JSON do provedor do app Flask (orjson), com a mesma compressão das respostas síncronas."""
+    flask_app = request.app.state.flask_app
+    body, encoding = compress_body(flask_app.json.dumps(content).encode(),
+                                   request.headers.get('accept-encoding'), flask_app.config)
+    headers['Vary'] = ', '.join(filter(None, (headers.get('Vary'), 'Accept-Encoding')))
+    if encoding:
+        headers['Content-Encoding'] = encoding
+        if 'ETag' in headers:
+            headers['ETag'] = weak_etag(headers['ETag'])
+    return Response(body, media_type='application/json', headers=headers)
+
+def _not_modified(request, etag):
+    """Resposta 304 se o If-None-Match do cliente já contém `etag`; senão None."""
+    if etag is not None and parse_etags(request.headers.get('if-none-match')).contains_weak(etag):
+        return Response(status_code=304, headers=_revalidation_headers(etag))
+    return None
+
+def _revalidation_headers(etag):
+    # Mesmos cabeçalhos de _revalidate() na API síncrona
+    headers = {'Cache-Control': 'private, no-cache', 'Vary': 'Cookie'}
+    if etag is not None:
+        headers['ETag'] = quote_etag(etag)
+    return headers
+
+async def _call_view(request, view, endpoint):
+    state = request.app.state
+    async with state.sessionmaker() as session:
+        user = await _load_user(request, state.flask_app, session)
+        if user is None:
+            return JSONResponse({'error': 'Authentication required'}, status_code=401)
+        # Mesmas regras de RATE_LIMITS (e mesmos baldes) das views síncronas
+        limiter = state.flask_app.extensions.get('rate_limiter')
+        wait = limiter.wait(endpoint, request.method, user_client(user.id)) if limiter is not None else 0
+        if wait:
+            return JSONResponse({'error': 'Too many requests'}, status_code=429,
+                                headers={'Retry-After': str(retry_after(wait))})
+        return await view(request, session, user)
+
+def _api_view(view):
+    """Executa a view no contexto do app Flask, com uma AsyncSession e o usuário autenticado."""
+    # Mesmo nome de endpoint da view síncrona (regras de limite e estatísticas)
+    endpoint_name = f'api.{view.__name__}'
+
+    @wraps(view)
+    async def endpoint(request):
+        flask_app = request.app.state.flask_app
+        with flask_app.app_context():
+            token = begin_request_timing(flask_app)
+            try:
+                response = await _call_view(request, view, endpoint_name)
+                if token is not None:
+                    response.headers['Server-Timing'] = record_request(
+                        flask_app, endpoint_name, request.method, request.url.path, response.status_code)
+                return response
+            finally:
+                if token is not None:
+                    end_request_timing(token)
+    return endpoint
+
+@_api_view
+async def api_food(request, session, user):
+    if request.method == 'POST':
+        food, error = _food_item_from_payload(await _json_body(request), user.id)
+        if error:
+            return JSONResponse({'error': error[0]}, status_code=error[1])
+        try:
+            session.add(food)
+            await session.commit()
+            return JSONResponse({'message': 'Food item added', 'id': food.id}, status_code=201)
+        except Exception as e:
+            await session.rollback()
+            return JSONResponse({'error': str(e)}, status_code=400)
+
+    page, error = _parse_food_page_args(request.query_params, request.app.state.flask_app.config)
+    if error:
+        return JSONResponse(error[0], status_code=error[1])
+    limit, after, fields = page
+
+    etag = _food_page_etag(user.id, limit, after, fields, request.query_params.get('fields'))
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    rows = (await session.execute(_food_page_query(user.id, limit, after, fields))).all()
+    items, next_args = _food_page(rows, limit, fields, request.query_params.get('fields'))
+    headers = _revalidation_headers(etag)
+    if next_args:
+        headers['X-Next-Cursor'] = str(next_args['after'])
+        query = urlencode(next_args, safe=',')
+        headers['Link'] = f'<{request.url.path}?{query}>; rel="next"'
+    return _json_response(request, items, headers)
+
+@_api_view
+async def add_entry(request, session, user):
+    data = await _json_body(request)
+    error = _validate_entry_payload(data)
+    if error:
+        return JSONResponse({'error': error[0]}, status_code=error[1])
+
+    food_item = await session.get(FoodItem, data['food_item_id'])
+    error = _validate_food_access(food_item, user.id)
+    if error:
+        return JSONResponse({'error': error[0]}, status_code=error[1])
+
+    today = datetime.utcnow().date()
+    try:
+        entry = FoodEntry(
+            user_id=user.id,
+            food_item_id=food_item.id,
+            quantity=data.get('quantity', 1.0),
+            date=today
+        )
+        session.add(entry)
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+    totals = await _nutrition_totals(session, user.id, today)
+    return JSONResponse({'message': 'Entry added', 'id': entry.id, 'entry': _entry_payload(entry),
+                         **_day_totals_payload(user, today, totals)}, status_code=201)
+
+@_api_view
+async def dashboard_today(request, session, user):
+    today = datetime.utcnow().date()
+    etag = _dashboard_etag(user, today)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    entries = (await session.scalars(
+        select(FoodEntry).options(joinedload(FoodEntry.food_item))
+        .where(FoodEntry.user_id == user.id, FoodEntry.date == today)
+        .order_by(FoodEntry.id)
+    )).all()
+    totals = await _nutrition_totals(session, user.id, today)
+    return _json_response(request, _dashboard_payload(user, today, entries, totals), _revalidation_headers(etag))
+
+def create_asgi_app(flask_app=None):
+    """Cria o app ASGI. `flask_app` (padrão: create_app()) fornece a configuração e atende as demais rotas."""
+    flask_app = flask_app or create_app()
+    config = flask_app.config
+    uri = async_database_uri(config['SQLALCHEMY_DATABASE_URI'])
+    # Mesmas opções de pool do engine síncrono (vazias no SQLite)
+    engine = create_async_engine(uri, **config['SQLALCHEMY_ENGINE_OPTIONS'])
+    listen_sqlite_pragmas(engine.sync_engine, config)
+    if 'request_stats' in flask_app.extensions:
+        listen_query_timing(engine.sync_engine)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await engine.dispose()
+
+    app = Starlette(routes=[
+        Route('/api/food', api_food, methods=['GET', 'POST']),
+        Route('/api/entry', add_entry, methods=['POST']),
+        Route('/api/dashboard/today', dashboard_today, methods=['GET']),
+        Mount('/', app=WSGIMiddleware(flask_app)),
+    ], lifespan=lifespan)
+    app.state.flask_app = flask_app
+    app.state.engine = engine
+    app.state.sessionmaker = async_sessionmaker(engine, sync_session_class=AsyncTierSession,
+                                                expire_on_commit=False)
+    return app
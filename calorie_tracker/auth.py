@@ -0,0 +1,80 @@
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask_login import login_user, logout_user, current_user
+
+from .extensions import db, login_manager
+from .forms import LoginForm, RegistrationForm
+from .identity import load_identity
+from .models import User
+from .security import PasswordCheckBusy, hash_password, password_needs_rehash
+from .tokens import bearer_token, verify_token
+
+bp = Blueprint('auth', __name__)
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    # Identidade em cache: sem SELECT na maioria das requisições autenticadas
+    return load_identity(db.session, int(user_id))
+
+@login_manager.request_loader
+def load_user_from_token(request):
+    # Clientes de API: Authorization: Bearer <token>. A assinatura é verificada
+    # sem banco; o usuário vem do cache de identidades
+    user_id = verify_token(bearer_token(request.headers.get('Authorization')))
+    if user_id is None:
+        return None
+    return load_identity(db.session, user_id)
+
+# Handler para retornar JSON em APIs quando não autenticado
+@login_manager.unauthorized_handler
+def unauthorized_handler():
+    # Se a requisição é para uma API, retorna JSON 401
+    if request.path.startswith('/api/'):
+        return jsonify({'error': 'Authentication required'}), 401
+    # Caso contrário, redireciona para login (comportamento padrão)
+    return redirect(url_for('auth.login'))
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if current_user.is_authenticated:
+        return redirect(url_for('main.dashboard'))
+    form = LoginForm()
+    if form.validate_on_submit():
+        user = User.query.filter_by(username=form.username.data).first()
+        try:
+            valid = user is not None and user.check_password(form.password.data)
+        except PasswordCheckBusy:
+            flash('Too many login attempts right now, please try again', 'error')
+            return render_template('login.html', form=form), 503
+        if not valid:
+            flash('Invalid username or password', 'error')
+            return redirect(url_for('auth.login'))
+        if password_needs_rehash(user.password_hash):
+            user.set_password(form.password.data)
+            db.session.commit()
+        login_user(user, remember=form.remember.data)
+        next_page = request.args.get('next')
+        return redirect(next_page or url_for('main.dashboard'))
+    return render_template('login.html', form=form)
+
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    if current_user.is_authenticated:
+        return redirect(url_for('main.dashboard'))
+    form = RegistrationForm()
+    if form.validate_on_submit():
+        user = User(
+            username=form.username.data,
+            email=form.email.data,
+            password_hash=hash_password(form.password.data)
+        )
+        db.session.add(user)
+        db.session.commit()
+        flash('Congratulations, you are now a registered user!', 'success')
+        return redirect(url_for('auth.login'))
+    return render_template('register.html', form=form)
+
+@bp.route('/logout')
+def logout():
+    logout_user()
+    return redirect(url_for('main.index'))
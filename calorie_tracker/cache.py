@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+
+class LRUCache:
+    """Cache em memória do processo, com expiração (TTL) e descarte do item menos usado."""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[1] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (ttl or self.ttl)
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        """Remove as chaves que começam com `prefix`."""
+        with self._lock:
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {'backend': 'memory', 'hits': self.hits, 'misses': self.misses,
+                'size': len(self._data), 'maxsize': self.maxsize}
+
+class RedisCache:
+    """Mesma interface de LRUCache sobre um servidor compatível com Redis (valores em JSON)."""
+
+    def __init__(self, url, ttl=300, prefix='calories:'):
+        import redis  # dependência opcional
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl or self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def delete_prefix(self, prefix):
+        for key in self.client.scan_iter(match=self.prefix + prefix + '*'):
+            self.client.delete(key)
+
+    def clear(self):
+        self.delete_prefix('')
+
+    def stats(self):
+        return {'backend': 'redis', 'hits': self.hits, 'misses': self.misses,
+                'size': sum(1 for _ in self.client.scan_iter(match=self.prefix + '*'))}
+
+def get_cache():
+    """Retorna o cache configurado em CACHE_BACKEND, criado no primeiro uso."""
+    cache = current_app.extensions.get('nutrition_cache')
+    if cache is None:
+        config = current_app.config
+        if config['CACHE_BACKEND'] == 'redis':
+            cache = RedisCache(config['CACHE_URL'], ttl=config['CACHE_DEFAULT_TTL'])
+        else:
+            cache = LRUCache(maxsize=config['CACHE_MAX_ENTRIES'], ttl=config['CACHE_DEFAULT_TTL'])
+        current_app.extensions['nutrition_cache'] = cache
+    return cache
+
+def cache_is_shared(config=None):
+    """O cache é o mesmo para todos os processos do app: Redis, ou memória com um só processo."""
+    config = config or current_app.config
+    return config['CACHE_BACKEND'] != 'memory' or config['WEB_CONCURRENCY'] <= 1
+
+def init_cache(app):
+    """Avisa, ao subir, quando o cache em memória não é compartilhado pelos processos."""
+    if not cache_is_shared(app.config):
+        app.logger.warning(
+            "CACHE_BACKEND='memory' with WEB_CONCURRENCY=%s: dashboard totals are not cached "
+            "and API responses carry no ETag; set CACHE_BACKEND='redis' to enable them",
+            app.config['WEB_CONCURRENCY'])
+
+def _totals_cache_key(user_id, day, version):
+    return f'totals:{user_id}:{day.isoformat()}:{version}'
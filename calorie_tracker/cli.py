@@ -0,0 +1,194 @@
+import os
+import re
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import delete
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from .extensions import db
+from .food_import import FOOD_IMPORT_FORMATS, iter_food_rows, import_food_rows
+from .models import User
+from .summaries import rebuild_daily_summaries, find_summary_mismatches
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Cria as tabelas que ainda não existem (bancos novos; para os existentes use `db upgrade`)."""
+    db.create_all()
+    click.echo('Banco de dados inicializado.')
+
+@click.command('rebuild-summaries')
+@click.option('--check', is_flag=True, help='Apenas verifica a consistência, sem reescrever.')
+@with_appcontext
+def rebuild_summaries_command(check):
+    """Recalcula DailySummary a partir de FoodEntry (backfill e verificação)."""
+    if check:
+        mismatches = find_summary_mismatches()
+        for user_id, day in mismatches:
+            click.echo(f'Inconsistente: user_id={user_id} date={day}')
+        click.echo(f'{len(mismatches)} resumo(s) inconsistente(s).')
+        if mismatches:
+            raise SystemExit(1)
+        return
+    total = rebuild_daily_summaries()
+    click.echo(f'{total} resumo(s) diário(s) recalculado(s).')
+
+@click.command('import-foods')
+@click.argument('source', type=click.File('rb'))
+@click.option('--format', 'fmt', type=click.Choice(FOOD_IMPORT_FORMATS),
+              help='Formato do arquivo (padrão: pela extensão).')
+@click.option('--chunk-size', type=int, default=None, help='Linhas por transação.')
+@with_appcontext
+def import_foods_command(source, fmt, chunk_size):
+    """Importa alimentos públicos de um arquivo CSV ou JSONL ("-" para stdin)."""
+    fmt = fmt or ('jsonl' if source.name.endswith(('.jsonl', '.ndjson')) else 'csv')
+
+    def report(stats):
+        click.echo(f"... {stats['read']} lidas, {stats['inserted']} inseridas, "
+                   f"{stats['duplicates']} duplicadas, {stats['invalid']} inválidas")
+
+    stats = import_food_rows(iter_food_rows(source, fmt), chunk_size=chunk_size, progress=report)
+    for error in stats['errors']:
+        click.echo(f"Linha {error['line']}: {error['error']}", err=True)
+    click.echo(f"{stats['inserted']} alimento(s) importado(s).")
+
+# Benchmark de login e ajuste do custo do hash
+BENCH_LOGIN_USERNAME = '__bench_login__'
+BENCH_LOGIN_PASSWORD = 'bench-login-password'
+HASH_COST_CANDIDATES = {
+    'pbkdf2': (50000, 100000, 200000, 300000, 400000, 600000, 800000, 1000000, 1500000, 2000000),
+    'scrypt': (4096, 8192, 16384, 32768, 65536, 131072),
+}
+
+def _hash_method_for_cost(algorithm, cost):
+    if algorithm == 'scrypt':
+        return f'scrypt:{cost}:8:1'
+    return f'pbkdf2:sha256:{cost}'
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def _time_hash_check(method, samples):
+    """Latências (ms) de check_password_hash com um hash gerado por `method`."""
+    pwhash = generate_password_hash(BENCH_LOGIN_PASSWORD, method=method)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        check_password_hash(pwhash, BENCH_LOGIN_PASSWORD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def _time_login_requests(user, method, samples):
+    """Latências (ms) de POST /login para `user` com a senha em hash `method`."""
+    app = current_app._get_current_object()
+    previous = app.config['PASSWORD_HASH_METHOD'], app.config.get('WTF_CSRF_ENABLED', True)
+    # Mesma política do hash do usuário: o login não dispara o rehash
+    app.config['PASSWORD_HASH_METHOD'] = method
+    app.config['WTF_CSRF_ENABLED'] = False
+    user.password_hash = generate_password_hash(BENCH_LOGIN_PASSWORD, method=method)
+    db.session.commit()
+    data = {'username': BENCH_LOGIN_USERNAME, 'password': BENCH_LOGIN_PASSWORD}
+    timings = []
+    # Todas as requisições vêm do mesmo IP: sem o limitador, o login daria 429
+    limiter = app.extensions.pop('rate_limiter', None)
+    try:
+        # A primeira requisição (descartada) aquece o cache de _hash_method_prefix
+        for i in range(samples + 1):
+            # Cliente e contexto novos: cada requisição faz o login completo
+            with app.app_context():
+                client = app.test_client()
+                start = time.perf_counter()
+                response = client.post('/login', data=data)
+                elapsed = (time.perf_counter() - start) * 1000
+            if response.status_code != 302:
+                raise click.ClickException(f'POST /login returned {response.status_code}')
+            if i:
+                timings.append(elapsed)
+    finally:
+        app.config['PASSWORD_HASH_METHOD'], app.config['WTF_CSRF_ENABLED'] = previous
+        if limiter is not None:
+            app.extensions['rate_limiter'] = limiter
+    return timings
+
+def _write_instance_setting(name, value):
+    """Grava (ou substitui) `name = value` em instance/config.py."""
+    os.makedirs(current_app.instance_path, exist_ok=True)
+    path = os.path.join(current_app.instance_path, 'config.py')
+    lines = []
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as config_file:
+            lines = [line for line in config_file.read().splitlines()
+                     if not re.match(rf'{name}\s*=', line)]
+    lines.append(f'{name} = {value!r}')
+    with open(path, 'w', encoding='utf-8') as config_file:
+        config_file.write('\n'.join(lines) + '\n')
+    return path
+
+@click.command('bench-login')
+@click.option('--target-ms', type=float, default=250.0, show_default=True,
+              help='Latência p99 máxima aceitável para POST /login.')
+@click.option('--samples', type=int, default=30, show_default=True, help='Medições por custo.')
+@click.option('--algorithm', type=click.Choice(sorted(HASH_COST_CANDIDATES)),
+              help='Algoritmo a ajustar (padrão: o de PASSWORD_HASH_METHOD).')
+@click.option('--costs', help='Custos candidatos separados por vírgula (iterações ou N do scrypt).')
+@click.option('--write', is_flag=True, help='Grava o custo recomendado em instance/config.py.')
+@with_appcontext
+def bench_login_command(target_ms, samples, algorithm, costs, write):
+    """Mede o login nesta máquina e recomenda o maior custo de hash dentro da meta."""
+    current = current_app.config['PASSWORD_HASH_METHOD']
+    algorithm = algorithm or current.split(':', 1)[0]
+    if algorithm not in HASH_COST_CANDIDATES:
+        raise click.BadParameter(f'unsupported algorithm: {algorithm}', param_hint='--algorithm')
+    if costs:
+        candidates = sorted(int(cost) for cost in costs.split(','))
+    else:
+        candidates = HASH_COST_CANDIDATES[algorithm]
+
+    db.session.execute(delete(User).where(User.username == BENCH_LOGIN_USERNAME))
+    user = User(username=BENCH_LOGIN_USERNAME, email='bench-login@localhost')
+    db.session.add(user)
+    try:
+        # Custo da requisição sem o hash (consulta, sessão, redirect)
+        overhead = _percentile(_time_login_requests(user, 'pbkdf2:sha256:1', samples), 99)
+        click.echo(f'Sobrecarga da requisição (p99): {overhead:.1f} ms')
+
+        recommended = None
+        for cost in candidates:
+            method = _hash_method_for_cost(algorithm, cost)
+            timings = _time_hash_check(method, samples)
+            hash_p99 = _percentile(timings, 99)
+            fits = hash_p99 + overhead <= target_ms
+            click.echo(f'{method:>24}  hash p50 {_percentile(timings, 50):8.1f} ms'
+                       f'  p99 {hash_p99:8.1f} ms  {"ok" if fits else "acima da meta"}')
+            if not fits:
+                break
+            recommended = method
+
+        for label, method in (('atual', current), ('recomendado', recommended)):
+            if method is None or (label == 'recomendado' and method == current):
+                continue
+            timings = _time_login_requests(user, method, samples)
+            click.echo(f'Login {label} ({method}): p50 {_percentile(timings, 50):.1f} ms, '
+                       f'p99 {_percentile(timings, 99):.1f} ms, '
+                       f'{1000 / (sum(timings) / len(timings)):.1f} logins/s por worker')
+    finally:
+        db.session.delete(user)
+        db.session.commit()
+
+    if recommended is None:
+        click.echo(f'Nenhum custo candidato cabe em {target_ms:.0f} ms.', err=True)
+        raise SystemExit(1)
+    click.echo(f'Recomendado: PASSWORD_HASH_METHOD = {recommended!r}')
+    if write:
+        path = _write_instance_setting('PASSWORD_HASH_METHOD', recommended)
+        click.echo(f'Gravado em {path}.')
+
+def register_commands(app):
+    for command in (init_db_command, rebuild_summaries_command, import_foods_command,
+                    bench_login_command):
+        app.cli.add_command(command)
@@ -0,0 +1,63 @@
+"""Compressão (brotli/gzip) das respostas acima de COMPRESS_MIN_SIZE bytes."""
+import gzip
+
+from flask import request
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli  # dependência opcional
+except ImportError:
+    brotli = None
+
+# Sem text/html: as páginas levam o token CSRF junto de texto enviado pelo
+# cliente (ex.: o username repetido no formulário), o cenário do ataque BREACH
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/plain', 'text/csv',
+                          'text/css', 'application/javascript'}
+
+# Codificações suportadas, da preferida para a menos preferida
+ENCODERS = {
+    'br': lambda data, config: brotli.compress(data, quality=config['COMPRESS_BROTLI_QUALITY']),
+    'gzip': lambda data, config: gzip.compress(data, compresslevel=config['COMPRESS_GZIP_LEVEL']),
+}
+
+def _available_encodings():
+    return [name for name in ENCODERS if name != 'br' or brotli is not None]
+
+def compress_body(data, accept_encoding, config):
+    """Retorna (corpo, codificação) conforme o Accept-Encoding; (data, None) se não comprimir."""
+    minimum = config['COMPRESS_MIN_SIZE']
+    if not minimum or len(data) < minimum:
+        return data, None
+    encoding = parse_accept_header(accept_encoding).best_match(_available_encodings())
+    if encoding is None:
+        return data, None
+    return ENCODERS[encoding](data, config), encoding
+
+def weak_etag(etag):
+    """ETag de um corpo comprimido: outra representação, o ETag forte vira fraco (como no nginx)."""
+    return etag if etag.startswith('W/') else f'W/{etag}'
+
+def init_compression(app):
+    """Comprime as respostas de texto/JSON do app conforme o Accept-Encoding do cliente."""
+    if not app.config['COMPRESS_MIN_SIZE']:
+        return
+
+    @app.after_request
+    def _compress_response(response):
+        # Streaming (exportação), respostas vazias e já codificadas passam direto
+        if (response.direct_passthrough or response.is_streamed or response.status_code in (204, 304)
+                or response.status_code < 200 or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        data = response.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+        response.vary.add('Accept-Encoding')
+        body, encoding = compress_body(data, request.headers.get('Accept-Encoding'), app.config)
+        if encoding is None:
+            return response
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        if 'ETag' in response.headers:
+            response.headers['ETag'] = weak_etag(response.headers['ETag'])
+        return response
@@ -0,0 +1,121 @@
+import os
+
+from dotenv import load_dotenv
+
+# Variáveis de um .env na raiz do projeto (as já definidas no ambiente prevalecem)
+load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
+
+
+def _env_list(name):
+    return [value.strip() for value in os.environ.get(name, '').split(',') if value.strip()]
+
+def _env_bool(name, default):
+    return os.environ.get(name, str(int(default))).lower() in ('1', 'true', 'yes', 'on')
+
+
+class Config:
+    """Configuração padrão; instance/config.py e create_app(config) sobrescrevem."""
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-here')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///calories.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Pool de conexões (PostgreSQL/MySQL; ignorado no SQLite).
+    # Por processo: com o gunicorn, o total é workers x (pool_size + max_overflow)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    # Renova conexões mais velhas que isso (segundos), antes que o servidor as derrube
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    # Testa a conexão ao tirá-la do pool (descarta conexões mortas após um failover)
+    DB_POOL_PRE_PING = _env_bool('DB_POOL_PRE_PING', True)
+    # Réplicas de leitura: binds de SQLALCHEMY_BINDS usados pelas views somente
+    # leitura. DATABASE_REPLICA_URLS (URLs separadas por vírgula) preenche os dois
+    SQLALCHEMY_BINDS = {f'replica_{i}': url for i, url in enumerate(_env_list('DATABASE_REPLICA_URLS'))}
+    READ_REPLICA_BINDS = tuple(SQLALCHEMY_BINDS)
+    # Depois de uma escrita, o mesmo usuário lê do primário por este tempo (segundos)
+    READ_YOUR_WRITES_SECONDS = 5
+    # SQLite: WAL deixa leitores e um escritor trabalharem ao mesmo tempo; com
+    # synchronous=NORMAL o commit não espera o fsync do WAL. None desativa o pragma.
+    SQLITE_JOURNAL_MODE = 'wal'
+    SQLITE_SYNCHRONOUS = 'normal'
+    # Espera (ms) por um lock antes de falhar com "database is locked"
+    SQLITE_BUSY_TIMEOUT = 5000
+    SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+    # Negativo: tamanho em KiB (64 MiB por conexão)
+    SQLITE_CACHE_SIZE = -64000
+    # Paginação de /api/food
+    FOOD_PAGE_DEFAULT_LIMIT = 100
+    FOOD_PAGE_MAX_LIMIT = 1000
+    FOOD_SEARCH_MAX_LIMIT = 100
+    # Matches da busca ordenados pelo bm25: todos, se forem até este número;
+    # acima dele (prefixos curtos e comuns), só os primeiros do índice
+    FOOD_SEARCH_RANK_CANDIDATES = 1000
+    ENTRY_BATCH_MAX_SIZE = 500
+    # Importação de catálogo (CSV/JSONL)
+    FOOD_IMPORT_CHUNK_SIZE = 1000
+    # Tamanho máximo (bytes) de um arquivo enviado a POST /api/food/import
+    FOOD_IMPORT_MAX_BYTES = 10 * 1024 * 1024
+    # Linhas buscadas por vez na exportação do diário
+    EXPORT_YIELD_PER = 1000
+    # Histórico: intervalo máximo e tempo de cache (segundos) das respostas
+    HISTORY_MAX_DAYS = 3 * 366
+    HISTORY_CACHE_MAX_AGE = 60
+    HISTORY_CACHE_MAX_AGE_PAST = 3600
+    # Serialização JSON: 'orjson' (se instalado) ou 'default' (módulo json)
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson')
+    # Compressão das respostas a partir deste tamanho (bytes; 0 desativa);
+    # brotli é usado se o pacote estiver instalado e o cliente aceitar
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_GZIP_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 5
+    # Processos que servem o app (o gunicorn.conf.py define e o uvicorn lê
+    # WEB_CONCURRENCY). Com mais de um, o cache 'memory' não é compartilhado
+    # e os totais do dashboard não são guardados nele
+    WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+    # Cache dos totais do dashboard: 'memory' (LRU em processo) ou 'redis'
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_URL = os.environ.get('CACHE_URL', 'redis://localhost:6379/0')
+    CACHE_DEFAULT_TTL = 300
+    CACHE_MAX_ENTRIES = 10000
+    # Identidades autenticadas em cache no processo (segundos; 0 desativa)
+    AUTH_CACHE_TTL = 60
+    AUTH_CACHE_MAX_ENTRIES = 10000
+    # Validade (segundos) dos tokens de API emitidos por POST /api/token
+    API_TOKEN_MAX_AGE = int(os.environ.get('API_TOKEN_MAX_AGE', 3600))
+    # Sessão: 'cookie' (assinada, no navegador) ou 'cache' (no servidor, num
+    # armazenamento próprio do tipo de CACHE_BACKEND; o cookie leva só o id)
+    SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'cookie')
+    SESSION_MAX_ENTRIES = 100000
+    # /metrics/*: desativados por padrão (expõem uso do cache e tempos por endpoint)
+    METRICS_ENABLED = _env_bool('METRICS_ENABLED', False)
+    # Instrumentação: cabeçalho Server-Timing e estatísticas por endpoint em
+    # /metrics/requests. Requisições acima de SLOW_REQUEST_MS (0 desativa) vão
+    # para o log 'calorie_tracker.slow_requests' com até SLOW_REQUEST_MAX_STATEMENTS SQL
+    REQUEST_TIMING_ENABLED = _env_bool('REQUEST_TIMING_ENABLED', True)
+    # Tempo no banco e nº de queries no Server-Timing (sempre com o app em debug);
+    # sem isso o cabeçalho, visível a qualquer cliente, traz só o tempo total
+    SERVER_TIMING_DETAIL = _env_bool('SERVER_TIMING_DETAIL', False)
+    SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 500))
+    SLOW_REQUEST_MAX_STATEMENTS = 50
+    # Limite de requisições (token bucket) por usuário autenticado ou, sem login, por IP.
+    # Chave: endpoint, opcionalmente precedido dos métodos ('POST auth.login',
+    # 'GET,POST api.api_food'); valor: 'N/second|minute|hour|day'
+    RATE_LIMIT_ENABLED = _env_bool('RATE_LIMIT_ENABLED', True)
+    RATE_LIMITS = {
+        'POST auth.login': '10/minute',
+        'POST auth.register': '5/minute',
+        'POST api.api_token': '10/minute',
+        'POST api.add_entry': '120/minute',
+        'POST api.add_entries_batch': '30/minute',
+        'POST api.api_food_import': '10/hour',
+    }
+    # Baldes: 'memory' (por processo) ou 'redis' (compartilhados entre os workers)
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_URL = os.environ.get('RATE_LIMIT_URL', CACHE_URL)
+    RATE_LIMIT_MAX_KEYS = 100000
+    # Hash de senhas: método/custo no formato do Werkzeug (ex.: 'scrypt:32768:8:1',
+    # 'pbkdf2:sha256:600000'). Hashes antigos são refeitos no próximo login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    PASSWORD_SALT_LENGTH = 16
+    # Verificações simultâneas de senha e espera máxima (segundos) por uma vaga
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))
+    PASSWORD_HASH_QUEUE_TIMEOUT = 5
@@ -0,0 +1,71 @@
+from functools import partial
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from .extensions import db
+
+# Opções do pool de conexões: (argumento de create_engine, chave de configuração)
+POOL_OPTIONS = (
+    ('pool_size', 'DB_POOL_SIZE'),
+    ('max_overflow', 'DB_MAX_OVERFLOW'),
+    ('pool_timeout', 'DB_POOL_TIMEOUT'),
+    ('pool_recycle', 'DB_POOL_RECYCLE'),
+    ('pool_pre_ping', 'DB_POOL_PRE_PING'),
+)
+
+# Pragmas aplicados a cada nova conexão SQLite: (pragma, chave de configuração)
+SQLITE_PRAGMAS = (
+    ('journal_mode', 'SQLITE_JOURNAL_MODE'),
+    ('synchronous', 'SQLITE_SYNCHRONOUS'),
+    ('busy_timeout', 'SQLITE_BUSY_TIMEOUT'),
+    ('mmap_size', 'SQLITE_MMAP_SIZE'),
+    ('cache_size', 'SQLITE_CACHE_SIZE'),
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas:
+            cursor.execute(f'PRAGMA {name} = {value}')
+    finally:
+        cursor.close()
+
+def normalize_database_uri(uri):
+    """Aceita o esquema `postgres://` (Heroku, Render etc.), que o SQLAlchemy 2 recusa."""
+    if uri.startswith('postgres://'):
+        return 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+def configure_engine_options(app):
+    """Monta SQLALCHEMY_ENGINE_OPTIONS a partir das chaves DB_POOL_* (antes de db.init_app).
+
+    Opções passadas explicitamente em SQLALCHEMY_ENGINE_OPTIONS têm prioridade.
+    """
+    uri = normalize_database_uri(app.config['SQLALCHEMY_DATABASE_URI'])
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    app.config['SQLALCHEMY_BINDS'] = {
+        key: normalize_database_uri(value) if isinstance(value, str) else value
+        for key, value in (app.config.get('SQLALCHEMY_BINDS') or {}).items()
+    }
+    options = {}
+    # SQLite é um arquivo local: não há conexão de rede a testar ou renovar, e
+    # o banco em memória usa StaticPool, que não aceita estas opções
+    if make_url(uri).get_backend_name() != 'sqlite':
+        options = {option: app.config[key] for option, key in POOL_OPTIONS
+                   if app.config.get(key) is not None}
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {**options, **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})}
+
+def listen_sqlite_pragmas(engine, config):
+    """Aplica os pragmas SQLITE_* a cada nova conexão do engine, se for SQLite."""
+    pragmas = [(name, config[key]) for name, key in SQLITE_PRAGMAS if config.get(key) is not None]
+    if engine.dialect.name == 'sqlite' and pragmas:
+        event.listen(engine, 'connect', partial(_set_sqlite_pragmas, pragmas=pragmas))
+
+def init_engines(app):
+    """Registra os ajustes por conexão nos engines do app (chamado em create_app)."""
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        listen_sqlite_pragmas(engine, app.config)
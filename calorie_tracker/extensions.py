@@ -0,0 +1,16 @@
+from flask_sqlalchemy import SQLAlchemy
+from flask_migrate import Migrate
+from flask_login import LoginManager
+
+from .replicas import RoutingSession
+
+
+def _include_in_migrations(obj, name, type_, reflected, compare_to):
+    # Tabelas do índice FTS5 são mantidas por DDL próprio, fora do autogenerate
+    return not (type_ == 'table' and name.startswith('food_item_fts'))
+
+# Extensões sem app; ligadas a cada aplicação em create_app()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+migrate = Migrate(db=db, include_object=_include_in_migrations)
+login_manager = LoginManager()
+login_manager.login_view = 'auth.login'
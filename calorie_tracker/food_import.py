@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+
+from flask import current_app
+from sqlalchemy import select, insert
+
+from .extensions import db
+from .models import FoodItem
+
+# Importação em massa do catálogo de alimentos
+FOOD_IMPORT_FORMATS = ('csv', 'jsonl')
+FOOD_IMPORT_MAX_ERRORS = 20
+
+def iter_food_rows(stream, fmt):
+    """Lê um arquivo binário CSV ou JSONL linha a linha, sem carregá-lo inteiro."""
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        for row in csv.DictReader(text_stream):
+            yield row
+    else:
+        for line in text_stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield row if isinstance(row, dict) else {'__invalid__': 'Invalid JSON line'}
+
+def _normalize_food_row(raw):
+    """Converte uma linha importada nos campos de FoodItem; lança ValueError se inválida."""
+    if '__invalid__' in raw:
+        raise ValueError(raw['__invalid__'])
+    name = (raw.get('name') or '').strip()
+    if not name:
+        raise ValueError('name is required')
+    if len(name) > 100:
+        raise ValueError('name is longer than 100 characters')
+    try:
+        row = {'name': name, 'calories': int(float(raw.get('calories')))}
+        for nutrient in ('protein', 'carbs', 'fat'):
+            value = raw.get(nutrient)
+            row[nutrient] = float(value) if value not in (None, '') else 0.0
+    except (TypeError, ValueError):
+        raise ValueError('calories, protein, carbs and fat must be numbers')
+    if row['calories'] < 0 or min(row['protein'], row['carbs'], row['fat']) < 0:
+        raise ValueError('nutrient values must not be negative')
+    return row
+
+def _import_food_chunk(chunk, stats, user_id, is_public):
+    # Deduplica por nome dentro do lote e contra o que já existe no banco
+    unique = {}
+    for row in chunk:
+        if row['name'] in unique:
+            stats['duplicates'] += 1
+        else:
+            unique[row['name']] = row
+    scope = FoodItem.is_public == True
+    if user_id is not None:
+        scope = scope | (FoodItem.user_id == user_id)
+    existing = set(db.session.scalars(
+        select(FoodItem.name).where(FoodItem.name.in_(list(unique)), scope)
+    ))
+    rows = [dict(row, is_public=is_public, user_id=user_id)
+            for name, row in unique.items() if name not in existing]
+    stats['duplicates'] += len(unique) - len(rows)
+    if rows:
+        # executemany em uma transação por lote
+        db.session.execute(insert(FoodItem), rows)
+    db.session.commit()
+    stats['inserted'] += len(rows)
+
+def import_food_rows(rows, user_id=None, is_public=True, chunk_size=None, progress=None):
+    """Valida, deduplica e insere alimentos em lotes; a memória usada não depende do tamanho da entrada."""
+    chunk_size = chunk_size or current_app.config['FOOD_IMPORT_CHUNK_SIZE']
+    stats = {'read': 0, 'inserted': 0, 'duplicates': 0, 'invalid': 0, 'errors': []}
+    chunk = []
+    for line_number, raw in enumerate(rows, start=1):
+        stats['read'] += 1
+        try:
+            chunk.append(_normalize_food_row(raw))
+        except ValueError as e:
+            stats['invalid'] += 1
+            if len(stats['errors']) < FOOD_IMPORT_MAX_ERRORS:
+                stats['errors'].append({'line': line_number, 'error': str(e)})
+        if len(chunk) >= chunk_size:
+            _import_food_chunk(chunk, stats, user_id, is_public)
+            chunk = []
+            if progress:
+                progress(stats)
+    if chunk:
+        _import_food_chunk(chunk, stats, user_id, is_public)
+    if progress:
+        progress(stats)
+    return stats
@@ -0,0 +1,31 @@
+from flask import Blueprint, current_app, jsonify
+from sqlalchemy import text
+
+from .extensions import db
+
+bp = Blueprint('health', __name__)
+
+
+def mark_draining(app):
+    """Marca o processo como em desligamento: /readyz passa a responder 503."""
+    app.extensions['draining'] = True
+
+@bp.route('/healthz')
+def healthz():
+    # Liveness: só indica que o processo atende; não depende do banco para que
+    # uma queda do banco não faça o orquestrador reiniciar todos os workers
+    return jsonify({'status': 'ok'})
+
+@bp.route('/readyz')
+def readyz():
+    # Readiness: pode receber tráfego? Falha durante o desligamento e quando o
+    # banco não responde a um SELECT 1 (conexão reaproveitada do pool)
+    if current_app.extensions.get('draining'):
+        return jsonify({'status': 'draining'}), 503
+    try:
+        with db.engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+    except Exception as e:
+        current_app.logger.warning('readyz: database check failed: %s', e)
+        return jsonify({'status': 'unavailable', 'database': 'error'}), 503
+    return jsonify({'status': 'ok', 'database': 'ok'})
@@ -0,0 +1,74 @@
+"""Cache em processo das identidades autenticadas (id, username, daily_calorie_goal).
+
+O user_loader do Flask-Login roda em toda requisição autenticada. Com a
+identidade em cache, o usuário é reanexado à sessão do SQLAlchemy sem SELECT
+(merge com load=False); as demais colunas são carregadas só se usadas.
+Qualquer commit que altere ou remova o usuário descarta a identidade deste
+processo; nos demais processos ela expira em AUTH_CACHE_TTL segundos.
+"""
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+
+from .cache import LRUCache
+from .extensions import db
+from .models import User
+
+IDENTITY_FIELDS = ('id', 'username', 'daily_calorie_goal')
+
+
+def _identity_cache():
+    """Cache de identidades do app, criado no primeiro uso; None se desativado."""
+    if not current_app.config['AUTH_CACHE_TTL']:
+        return None
+    cache = current_app.extensions.get('identity_cache')
+    if cache is None:
+        cache = LRUCache(maxsize=current_app.config['AUTH_CACHE_MAX_ENTRIES'],
+                         ttl=current_app.config['AUTH_CACHE_TTL'])
+        current_app.extensions['identity_cache'] = cache
+    return cache
+
+def cached_identity(user_id):
+    cache = _identity_cache()
+    return cache.get(user_id) if cache is not None else None
+
+def remember_identity(user):
+    cache = _identity_cache()
+    if cache is not None:
+        cache.set(user.id, {field: getattr(user, field) for field in IDENTITY_FIELDS})
+
+def detached_user(identity):
+    """User com as colunas da identidade, pronto para session.merge(..., load=False)."""
+    user = User(**identity)
+    make_transient_to_detached(user)
+    return user
+
+def load_identity(session, user_id):
+    """Usuário `user_id` a partir do cache ou do banco (sessão síncrona); None se não existe."""
+    identity = cached_identity(user_id)
+    if identity is not None:
+        return session.merge(detached_user(identity), load=False)
+    user = session.get(User, user_id)
+    if user is not None:
+        remember_identity(user)
+    return user
+
+def _track_user_changes(session, flush_context, instances):
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            session.info.setdefault('changed_users', set()).add(obj.id)
+
+def _forget_changed_identities(session):
+    changed = session.info.pop('changed_users', None)
+    cache = _identity_cache() if changed else None
+    if cache is not None:
+        for user_id in changed:
+            cache.delete(user_id)
+
+def listen_identity_hooks(target):
+    """Descarta do cache a identidade dos usuários alterados pela sessão (ou classe de sessão)."""
+    event.listen(target, 'before_flush', _track_user_changes)
+    event.listen(target, 'after_commit', _forget_changed_identities)
+    event.listen(target, 'after_rollback', _forget_changed_identities)
+
+listen_identity_hooks(db.session)
@@ -0,0 +1,143 @@
+"""Instrumentação por requisição: tempo total, número de queries e tempo no banco.
+
+Os eventos before/after_cursor_execute dos engines somam as queries na
+requisição em andamento (um ContextVar, que vale também na camada ASGI).
+Cada resposta ganha um cabeçalho Server-Timing (app; db só com
+SERVER_TIMING_DETAIL ou em debug), cada endpoint acumula estatísticas no
+processo (GET /metrics/requests, com METRICS_ENABLED) e as requisições
+acima de SLOW_REQUEST_MS vão, em JSON e com os SQL (sem os parâmetros), para
+o log 'calorie_tracker.slow_requests'.
+"""
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from flask import current_app, request
+from sqlalchemy import event
+
+from .extensions import db
+
+slow_request_log = logging.getLogger('calorie_tracker.slow_requests')
+
+_current_timing = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    """Início, queries e tempo no banco da requisição em andamento."""
+    __slots__ = ('start', 'queries', 'db_time', 'statements', 'max_statements')
+
+    def __init__(self, max_statements):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = []
+        self.max_statements = max_statements
+
+    def record_query(self, statement, elapsed):
+        self.queries += 1
+        self.db_time += elapsed
+        if len(self.statements) < self.max_statements:
+            self.statements.append((statement, elapsed))
+
+class EndpointStats:
+    """Requisições, tempo total/máximo, queries e tempo no banco por endpoint (no processo)."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, elapsed, timing):
+        with self._lock:
+            item = self._data.get(endpoint)
+            if item is None:
+                item = self._data[endpoint] = [0, 0.0, 0.0, 0, 0.0]
+            item[0] += 1
+            item[1] += elapsed
+            item[2] = max(item[2], elapsed)
+            item[3] += timing.queries
+            item[4] += timing.db_time
+
+    def snapshot(self):
+        with self._lock:
+            data = {endpoint: list(item) for endpoint, item in self._data.items()}
+        return {endpoint: {'requests': count, 'avg_ms': round(total / count * 1000, 2),
+                           'max_ms': round(slowest * 1000, 2), 'avg_queries': round(queries / count, 2),
+                           'avg_db_ms': round(db_time / count * 1000, 2)}
+                for endpoint, (count, total, slowest, queries, db_time) in sorted(data.items())}
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_timing.get() is not None:
+        conn.info['query_start'] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info.pop('query_start', None)
+    timing = _current_timing.get()
+    if timing is not None and start is not None:
+        timing.record_query(statement, time.perf_counter() - start)
+
+def listen_query_timing(engine):
+    """Soma as queries do engine na requisição em andamento."""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+def begin_request_timing(app):
+    """Começa a medir a requisição; retorna o token para end_request_timing (None se desativado)."""
+    if 'request_stats' not in app.extensions:
+        return None
+    return _current_timing.set(RequestTiming(app.config['SLOW_REQUEST_MAX_STATEMENTS']))
+
+def end_request_timing(token):
+    _current_timing.reset(token)
+
+def record_request(app, endpoint, method, path, status):
+    """Registra a requisição medida e retorna o valor do cabeçalho Server-Timing."""
+    timing = _current_timing.get()
+    elapsed = time.perf_counter() - timing.start
+    app.extensions['request_stats'].record(endpoint or '<unmatched>', elapsed, timing)
+    threshold = app.config['SLOW_REQUEST_MS']
+    if threshold and elapsed * 1000 >= threshold:
+        slow_request_log.warning(json.dumps({
+            'event': 'slow_request', 'method': method, 'path': path, 'endpoint': endpoint,
+            'status': status, 'duration_ms': round(elapsed * 1000, 2),
+            'db_ms': round(timing.db_time * 1000, 2), 'queries': timing.queries,
+            'statements': [{'sql': statement, 'duration_ms': round(duration * 1000, 2)}
+                           for statement, duration in timing.statements],
+            'statements_omitted': timing.queries - len(timing.statements),
+        }, ensure_ascii=False))
+    server_timing = f'app;dur={elapsed * 1000:.2f}'
+    if app.config['SERVER_TIMING_DETAIL'] or app.debug:
+        server_timing += f', db;dur={timing.db_time * 1000:.2f};desc="{timing.queries} queries"'
+    return server_timing
+
+def endpoint_stats(app):
+    stats = app.extensions.get('request_stats')
+    return stats.snapshot() if stats is not None else {}
+
+def _start_timing():
+    begin_request_timing(current_app)
+
+def _finish_timing(response):
+    # Respostas em streaming (exportação) são medidas até o início do envio
+    if _current_timing.get() is not None:
+        response.headers['Server-Timing'] = record_request(
+            current_app, request.endpoint, request.method, request.path, response.status_code)
+    return response
+
+def _clear_timing(exc):
+    # Queries fora de uma requisição (CLI, threads do pool) não são medidas
+    _current_timing.set(None)
+
+def init_instrumentation(app):
+    """Mede as requisições do app (antes dos demais hooks, para o tempo incluí-los)."""
+    if not app.config['REQUEST_TIMING_ENABLED']:
+        return
+    app.extensions['request_stats'] = EndpointStats()
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        listen_query_timing(engine)
+    app.before_request(_start_timing)
+    app.after_request(_finish_timing)
+    app.teardown_request(_clear_timing)
@@ -0,0 +1,46 @@
+"""Serialização JSON do app: provedor padrão do Flask ou orjson (JSON_PROVIDER)."""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson  # dependência opcional
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Mesmo JSON do provedor padrão (chaves ordenadas, datas em HTTP date), gerado pelo orjson.
+
+    A saída é sempre compacta, também em modo debug. Chamadas com opções do
+    módulo json (ex.: indent) seguem para o provedor padrão.
+    """
+
+    def _option(self):
+        # Datas passam pelo default do Flask (http_date), como no provedor padrão
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        return (option | orjson.OPT_SORT_KEYS) if self.sort_keys else option
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._option()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        data = orjson.dumps(obj, default=self.default, option=self._option())
+        return self._app.response_class(data, mimetype=self.mimetype)
+
+JSON_PROVIDERS = {'default': DefaultJSONProvider, 'orjson': OrjsonProvider}
+
+def init_json_provider(app):
+    """Instala o provedor de JSON_PROVIDER (o padrão do Flask se o orjson não estiver instalado)."""
+    name = app.config['JSON_PROVIDER']
+    if name not in JSON_PROVIDERS:
+        raise RuntimeError(f"JSON_PROVIDER must be one of: {', '.join(JSON_PROVIDERS)}")
+    if name == 'orjson' and orjson is None:
+        name = 'default'
+    app.json = JSON_PROVIDERS[name](app)
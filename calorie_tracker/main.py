@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from flask import Blueprint, abort, current_app, render_template, redirect, url_for, jsonify
+from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload
+
+from .cache import get_cache
+from .instrumentation import endpoint_stats
+from .models import FoodEntry
+from .replicas import read_only
+from .summaries import get_nutrition_totals
+
+bp = Blueprint('main', __name__)
+
+
+@bp.route('/')
+def index():
+    if current_user.is_authenticated:
+        return redirect(url_for('main.dashboard'))
+    return render_template('index.html')
+
+@bp.route('/dashboard')
+@read_only
+@login_required
+def dashboard():
+    today = datetime.utcnow().date()
+    # Carrega as entradas já com o food_item (JOIN) para evitar um SELECT por linha
+    entries = FoodEntry.query.options(
+        joinedload(FoodEntry.food_item)
+    ).filter_by(user_id=current_user.id, date=today).all()
+
+    # Totais do dia: do cache ou do resumo materializado (DailySummary, busca por chave primária)
+    totals = get_nutrition_totals(current_user.id, today)
+
+    return render_template('dashboard.html', 
+                         entries=entries, 
+                         total_calories=round(totals['calories'], 1),
+                         total_protein=round(totals['protein'], 1),
+                         total_carbs=round(totals['carbs'], 1),
+                         total_fat=round(totals['fat'], 1))
+
+def _require_metrics():
+    # Só com METRICS_ENABLED: os dados não são de nenhum usuário e custam ao servidor
+    if not current_app.config['METRICS_ENABLED']:
+        abort(404)
+
+@bp.route('/metrics/cache')
+def cache_metrics():
+    # Contadores de acerto/falha do cache para monitoramento
+    _require_metrics()
+    return jsonify(get_cache().stats())
+
+@bp.route('/metrics/requests')
+def request_metrics():
+    # Tempo, queries e tempo no banco por endpoint, neste processo
+    _require_metrics()
+    return jsonify(endpoint_stats(current_app))
@@ -0,0 +1,106 @@
+from datetime import datetime
+
+from flask_login import UserMixin
+from sqlalchemy import event, DDL
+
+from .cache import get_cache
+from .extensions import db
+from .security import hash_password, verify_password
+
+
+class User(UserMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    # Hashes scrypt passam de 128 caracteres
+    password_hash = db.Column(db.String(255))
+    daily_calorie_goal = db.Column(db.Integer, default=2000)
+    entries = db.relationship('FoodEntry', backref='user', lazy=True)
+
+    def set_password(self, password):
+        self.password_hash = hash_password(password)
+
+    def check_password(self, password):
+        return verify_password(self.password_hash, password)
+
+    def get_calories_today(self):
+        from .summaries import get_nutrition_totals
+        today = datetime.utcnow().date()
+        return get_nutrition_totals(self.id, today)['calories']
+
+    def get_remaining_calories(self):
+        return max(0, self.daily_calorie_goal - self.get_calories_today())
+
+    def __repr__(self):
+        return f'<User {self.username}>'
+
+class FoodItem(db.Model):
+    # api_food() filtra por "is_public OR user_id"
+    __table_args__ = (
+        db.Index('ix_food_item_is_public_user_id', 'is_public', 'user_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, index=True)
+    calories = db.Column(db.Integer, nullable=False)
+    protein = db.Column(db.Float, default=0)
+    carbs = db.Column(db.Float, default=0)
+    fat = db.Column(db.Float, default=0)
+    is_public = db.Column(db.Boolean, default=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+
+    def __repr__(self):
+        return f'<FoodItem {self.name}>'
+
+# Índice de busca textual (SQLite FTS5) sincronizado com food_item por triggers.
+# remove_diacritics faz "maca" encontrar "Maçã"; prefix acelera buscas por prefixo.
+FOOD_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS food_item_fts USING fts5("
+    "name, content='food_item', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS food_item_fts_ai AFTER INSERT ON food_item BEGIN "
+    "INSERT INTO food_item_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS food_item_fts_ad AFTER DELETE ON food_item BEGIN "
+    "INSERT INTO food_item_fts(food_item_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS food_item_fts_au AFTER UPDATE OF name ON food_item BEGIN "
+    "INSERT INTO food_item_fts(food_item_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+    "INSERT INTO food_item_fts(rowid, name) VALUES (new.id, new.name); END",
+    "INSERT INTO food_item_fts(food_item_fts) VALUES ('rebuild')",
+)
+
+for statement in FOOD_SEARCH_DDL:
+    event.listen(FoodItem.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(FoodItem.__table__, 'before_drop',
+             DDL('DROP TABLE IF EXISTS food_item_fts').execute_if(dialect='sqlite'))
+
+class FoodEntry(db.Model):
+    # dashboard() e get_calories_today() filtram por usuário e data
+    __table_args__ = (
+        db.Index('ix_food_entry_user_id_date', 'user_id', 'date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, nullable=False, default=datetime.utcnow)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    food_item_id = db.Column(db.Integer, db.ForeignKey('food_item.id'), nullable=False)
+    quantity = db.Column(db.Float, default=1.0)
+    food_item = db.relationship('FoodItem')
+
+    def __repr__(self):
+        return f'<FoodEntry {self.user.username} - {self.food_item.name} - {self.date} - {self.quantity} serving(s)>'
+
+class DailySummary(db.Model):
+    """Totais nutricionais por usuário e dia, mantidos a cada escrita em FoodEntry."""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    calories = db.Column(db.Float, nullable=False, default=0)
+    protein = db.Column(db.Float, nullable=False, default=0)
+    carbs = db.Column(db.Float, nullable=False, default=0)
+    fat = db.Column(db.Float, nullable=False, default=0)
+    entry_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DailySummary {self.user_id} - {self.date} - {self.calories} kcal>'
+
+# Recriar a tabela (ex.: drop_all/create_all) invalida todos os totais em cache
+event.listen(DailySummary.__table__, 'after_drop', lambda *args, **kwargs: get_cache().clear())
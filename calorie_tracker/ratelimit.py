@@ -0,0 +1,172 @@
+"""Limite de requisições por usuário ou IP (token bucket) nas rotas de RATE_LIMITS.
+
+Cada regra dá a cada cliente (o usuário autenticado ou, sem login, o IP) um
+balde de N fichas que se repõe a N/período fichas por segundo; sem ficha, a
+requisição recebe 429 com Retry-After. RATE_LIMIT_BACKEND='memory' guarda os
+baldes no processo (cada worker tem os seus); 'redis' os divide entre todos.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, jsonify, request
+from flask_login import current_user
+from werkzeug.exceptions import TooManyRequests
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Tira uma ficha do balde KEYS[1] no relógio do servidor Redis (o mesmo para todos os workers)
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+def parse_rate(spec):
+    """'10/minute' -> (10, 10/60): capacidade do balde e fichas repostas por segundo."""
+    try:
+        count, period = spec.split('/')
+        count = int(count)
+        seconds = PERIODS[period.strip()]
+    except (ValueError, KeyError):
+        raise RuntimeError(f"Invalid rate limit {spec!r}, expected 'N/{'|'.join(PERIODS)}'") from None
+    if count < 1:
+        raise RuntimeError(f"Invalid rate limit {spec!r}, expected at least 1 request")
+    return count, count / seconds
+
+
+class MemoryBucketStore:
+    """Baldes no processo; além de `max_keys`, descarta o usado há mais tempo (que volta cheio)."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate):
+        """Tira uma ficha do balde `key`; retorna 0 se havia ficha, senão os segundos até a próxima."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+class RedisBucketStore:
+    """Mesma interface de MemoryBucketStore sobre um servidor compatível com Redis (script Lua atômico)."""
+
+    def __init__(self, url, prefix='calories:ratelimit:', client=None):
+        if client is None:
+            import redis  # dependência opcional
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self._take = client.register_script(_TAKE_SCRIPT)
+
+    def take(self, key, capacity, rate):
+        return float(self._take(keys=[self.prefix + key], args=[capacity, rate]))
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+BUCKET_STORES = {
+    'memory': lambda config: MemoryBucketStore(max_keys=config['RATE_LIMIT_MAX_KEYS']),
+    'redis': lambda config: RedisBucketStore(config['RATE_LIMIT_URL']),
+}
+
+
+class RateLimiter:
+    """Regras de RATE_LIMITS ('[MÉTODOS ]endpoint' -> 'N/período') sobre um armazenamento de baldes."""
+
+    def __init__(self, store, limits):
+        self.store = store
+        # (método, endpoint) -> (nome da regra, capacidade, fichas/s); método None vale para todos
+        self._rules = {}
+        for name, spec in limits.items():
+            methods, _, endpoint = name.rpartition(' ')
+            capacity, rate = parse_rate(spec)
+            for method in (methods.upper().split(',') if methods else [None]):
+                self._rules[(method, endpoint)] = (name, capacity, rate)
+
+    def rule(self, endpoint, method):
+        return self._rules.get((method, endpoint)) or self._rules.get((None, endpoint))
+
+    def take(self, rule, client):
+        """Gasta uma ficha de `client` na regra `rule`; retorna os segundos de espera (0: liberado)."""
+        name, capacity, rate = rule
+        return self.store.take(f'{name}|{client}', capacity, rate)
+
+    def wait(self, endpoint, method, client):
+        rule = self.rule(endpoint, method)
+        return self.take(rule, client) if rule is not None else 0
+
+def retry_after(wait):
+    """Valor do cabeçalho Retry-After (segundos inteiros, no mínimo 1)."""
+    return max(1, math.ceil(wait))
+
+def user_client(user_id):
+    return f'user:{user_id}'
+
+def _client_key():
+    # Usuário autenticado (sessão ou token) ou, sem login, o IP. Atrás de um
+    # proxy reverso, remote_addr só é o do cliente com o ProxyFix do Werkzeug
+    if current_user.is_authenticated:
+        return user_client(current_user.id)
+    return f'ip:{request.remote_addr}'
+
+def _check_rate_limit():
+    limiter = current_app.extensions.get('rate_limiter')
+    # Sem limitador: retirado pelo bench-login durante as medições
+    if limiter is None:
+        return None
+    rule = limiter.rule(request.endpoint, request.method)
+    if rule is None:
+        return None
+    wait = limiter.take(rule, _client_key())
+    if not wait:
+        return None
+    if request.path.startswith('/api/'):
+        response = jsonify({'error': 'Too many requests'})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(retry_after(wait))
+        return response
+    raise TooManyRequests(retry_after=retry_after(wait))
+
+def init_rate_limits(app):
+    """Limita as rotas de RATE_LIMITS com os baldes de RATE_LIMIT_BACKEND."""
+    config = app.config
+    if not config['RATE_LIMIT_ENABLED'] or not config['RATE_LIMITS']:
+        return
+    backend = config['RATE_LIMIT_BACKEND']
+    if backend not in BUCKET_STORES:
+        raise RuntimeError(f"RATE_LIMIT_BACKEND must be one of: {', '.join(BUCKET_STORES)}")
+    app.extensions['rate_limiter'] = RateLimiter(BUCKET_STORES[backend](config), config['RATE_LIMITS'])
+    app.before_request(_check_rate_limit)
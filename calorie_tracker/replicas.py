@@ -0,0 +1,101 @@
+"""Roteamento de leituras para réplicas.
+
+As réplicas são binds de SQLALCHEMY_BINDS listados em READ_REPLICA_BINDS. Só
+as requisições GET/HEAD de views marcadas com @read_only leem delas; escritas,
+flushes e sessões com alterações pendentes usam sempre o primário. Depois de
+uma escrita, o mesmo cliente volta a ler do primário por READ_YOUR_WRITES_SECONDS,
+para não ver dados atrasados pela replicação. A marca é por usuário, no cache
+compartilhado (vale para cookie e token Bearer); sem login, no cookie de sessão.
+"""
+import random
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request, session
+from flask_login import current_user
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+from .cache import get_cache
+
+# Chave da sessão Flask com o instante até o qual o cliente anônimo lê do primário
+PRIMARY_UNTIL_KEY = '_db_primary_until'
+
+
+def read_only(view):
+    """Marca a view como somente leitura: em GET/HEAD pode ler de uma réplica."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method in ('GET', 'HEAD'):
+            g.db_read_only = True
+        return view(*args, **kwargs)
+    return wrapper
+
+def _replica_engine():
+    """Engine de réplica da requisição atual, ou None se a leitura vai ao primário."""
+    if not has_request_context() or not g.get('db_read_only') or g.get('db_use_primary'):
+        return None
+    if 'db_replica' not in g:
+        # Uma réplica por requisição: leituras da mesma página veem o mesmo estado
+        keys = current_app.config['READ_REPLICA_BINDS']
+        engines = current_app.extensions['sqlalchemy'].engines
+        g.db_replica = engines[random.choice(keys)] if keys else None
+    return g.db_replica
+
+def reading_from_replica():
+    """Indica se as leituras desta requisição vão para uma réplica (possivelmente atrasada)."""
+    return _replica_engine() is not None
+
+class RoutingSession(Session):
+    """Sessão do Flask-SQLAlchemy que envia leituras de views @read_only a uma réplica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and not isinstance(clause, UpdateBase)
+                and self._is_clean()):
+            engine = _replica_engine()
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _note_write(session, flush_context):
+    if has_request_context():
+        g.db_wrote = True
+
+def _primary_key(user_id):
+    return f'primary:{user_id}'
+
+def _use_primary_after_write():
+    if current_user.is_authenticated:
+        recent_write = get_cache().get(_primary_key(current_user.id)) is not None
+    else:
+        recent_write = session.get(PRIMARY_UNTIL_KEY, 0) > time.time()
+    if recent_write:
+        g.db_use_primary = True
+
+def _remember_write(response):
+    if g.get('db_wrote'):
+        seconds = current_app.config['READ_YOUR_WRITES_SECONDS']
+        # Por usuário: clientes com token Bearer não têm sessão, e outros
+        # dispositivos do mesmo usuário também passam a ver a escrita
+        if current_user.is_authenticated:
+            get_cache().set(_primary_key(current_user.id), True, ttl=seconds)
+        else:
+            session[PRIMARY_UNTIL_KEY] = time.time() + seconds
+    return response
+
+def init_replicas(app):
+    """Ativa a aderência ao primário após escritas (só quando há réplicas configuradas)."""
+    unknown = set(app.config['READ_REPLICA_BINDS']) - set(app.config.get('SQLALCHEMY_BINDS') or {})
+    if unknown:
+        raise RuntimeError(f"READ_REPLICA_BINDS not in SQLALCHEMY_BINDS: {', '.join(sorted(unknown))}")
+    db = app.extensions['sqlalchemy']
+    for key in app.config['READ_REPLICA_BINDS']:
+        # Réplicas não têm modelos próprios: sem o MetaData vazio do bind,
+        # create_all()/drop_all() não tentam criar o schema nelas (nem em outros apps)
+        if key in db.metadatas and not db.metadatas[key].tables:
+            del db.metadatas[key]
+    if app.config['READ_REPLICA_BINDS']:
+        app.before_request(_use_primary_after_write)
+        app.after_request(_remember_write)
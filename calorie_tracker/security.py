@@ -0,0 +1,53 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class PasswordCheckBusy(Exception):
+    """Todas as vagas de verificação de senha estão ocupadas."""
+
+def hash_password(password):
+    return generate_password_hash(password, method=current_app.config['PASSWORD_HASH_METHOD'],
+                                  salt_length=current_app.config['PASSWORD_SALT_LENGTH'])
+
+@lru_cache(maxsize=8)
+def _hash_method_prefix(method):
+    # Normaliza o método ('pbkdf2' -> 'pbkdf2:sha256:600000') gerando um hash de referência
+    return generate_password_hash('', method=method, salt_length=1).split('$', 1)[0]
+
+def password_needs_rehash(pwhash):
+    """Indica se o hash foi gerado com método ou custo diferente da política atual."""
+    return pwhash.split('$', 1)[0] != _hash_method_prefix(current_app.config['PASSWORD_HASH_METHOD'])
+
+_password_pool_lock = threading.Lock()
+
+def _password_pool():
+    pool = current_app.extensions.get('password_pool')
+    if pool is None:
+        # Sob o lock, para que logins simultâneos não criem pools (e semáforos) separados
+        with _password_pool_lock:
+            pool = current_app.extensions.get('password_pool')
+            if pool is None:
+                workers = current_app.config['PASSWORD_HASH_WORKERS']
+                # Limita também a fila: no máximo `workers` verificações aguardando
+                pool = (ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password'),
+                        threading.BoundedSemaphore(workers * 2))
+                current_app.extensions['password_pool'] = pool
+    return pool
+
+def verify_password(pwhash, password):
+    """Confere a senha em um pool limitado de threads.
+
+    Levanta PasswordCheckBusy se não houver vaga em PASSWORD_HASH_QUEUE_TIMEOUT
+    segundos, para que uma rajada de logins não ocupe todos os workers.
+    """
+    executor, slots = _password_pool()
+    if not slots.acquire(timeout=current_app.config['PASSWORD_HASH_QUEUE_TIMEOUT']):
+        raise PasswordCheckBusy()
+    try:
+        return executor.submit(check_password_hash, pwhash, password).result()
+    finally:
+        slots.release()
@@ -0,0 +1,117 @@
+"""Sessões guardadas no servidor (SESSION_BACKEND='cache').
+
+Os dados da sessão ficam num armazenamento próprio, do tipo de CACHE_BACKEND
+(memória ou Redis, com outro prefixo), e o cookie leva só um id aleatório
+assinado, de tamanho fixo. Separadas do cache dos totais, as sessões não
+disputam espaço no LRU nem são apagadas quando ele é limpo. Com vários
+processos é preciso CACHE_BACKEND='redis': em memória cada processo teria
+suas sessões.
+"""
+import secrets
+
+from flask.sessions import SecureCookieSession, SecureCookieSessionInterface
+from itsdangerous import BadSignature
+
+from .cache import LRUCache, RedisCache, cache_is_shared
+
+SESSION_BACKENDS = ('cookie', 'cache')
+
+
+def get_session_store(app):
+    """Retorna o armazenamento das sessões do app, criado no primeiro uso."""
+    store = app.extensions.get('session_store')
+    if store is None:
+        config = app.config
+        ttl = int(app.permanent_session_lifetime.total_seconds())
+        if config['CACHE_BACKEND'] == 'redis':
+            store = RedisCache(config['CACHE_URL'], ttl=ttl, prefix='calories-session:')
+        else:
+            store = LRUCache(maxsize=config['SESSION_MAX_ENTRIES'], ttl=ttl)
+        app.extensions['session_store'] = store
+    return store
+
+class ServerSession(SecureCookieSession):
+    def __init__(self, initial=None, sid=None):
+        super().__init__(initial)
+        self.sid = sid or secrets.token_urlsafe(32)
+        # Usuário ao abrir a sessão: login/logout trocam o id (contra fixação de sessão)
+        self.initial_user_id = dict.get(self, '_user_id')
+
+class CacheSessionInterface(SecureCookieSessionInterface):
+    """Sessão no armazenamento de get_session_store(); o cookie assinado contém só o id da sessão."""
+    salt = 'cache-session'
+    session_class = ServerSession
+
+    def load(self, app, cookie):
+        """Retorna (sid, dados) do cookie `cookie`; (None, {}) se inválido ou expirado."""
+        max_age = int(app.permanent_session_lifetime.total_seconds())
+        try:
+            sid = self.get_signing_serializer(app).loads(cookie, max_age=max_age)
+        except BadSignature:
+            return None, {}
+        raw = get_session_store(app).get(sid)
+        if raw is None:
+            return None, {}
+        return sid, self.serializer.loads(raw)
+
+    def open_session(self, app, request):
+        if self.get_signing_serializer(app) is None:
+            return None
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if not cookie:
+            return self.session_class()
+        sid, data = self.load(app, cookie)
+        return self.session_class(data, sid=sid)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        cookie_options = {'domain': self.get_cookie_domain(app), 'path': self.get_cookie_path(app),
+                          'secure': self.get_cookie_secure(app), 'samesite': self.get_cookie_samesite(app),
+                          'httponly': self.get_cookie_httponly(app)}
+        store = get_session_store(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session:
+            if session.modified:
+                store.delete(session.sid)
+                response.delete_cookie(name, **cookie_options)
+                response.vary.add('Cookie')
+            return
+
+        if dict.get(session, '_user_id') != session.initial_user_id:
+            store.delete(session.sid)
+            session.sid = secrets.token_urlsafe(32)
+            session.initial_user_id = dict.get(session, '_user_id')
+            session.modified = True
+
+        if not self.should_set_cookie(app, session):
+            return
+
+        ttl = int(app.permanent_session_lifetime.total_seconds())
+        store.set(session.sid, self.serializer.dumps(dict(session)), ttl=ttl)
+        response.set_cookie(name, self.get_signing_serializer(app).dumps(session.sid),
+                            expires=self.get_expiration_time(app, session), **cookie_options)
+        response.vary.add('Cookie')
+
+def session_data(app, cookie):
+    """Dados da sessão do cookie, fora de uma requisição Flask (camada ASGI)."""
+    interface = app.session_interface
+    if isinstance(interface, CacheSessionInterface):
+        return interface.load(app, cookie)[1]
+    max_age = int(app.permanent_session_lifetime.total_seconds())
+    try:
+        return interface.get_signing_serializer(app).loads(cookie, max_age=max_age)
+    except BadSignature:
+        return {}
+
+def init_sessions(app):
+    """Instala o armazenamento de sessão de SESSION_BACKEND."""
+    backend = app.config['SESSION_BACKEND']
+    if backend not in SESSION_BACKENDS:
+        raise RuntimeError(f"SESSION_BACKEND must be one of: {', '.join(SESSION_BACKENDS)}")
+    if backend == 'cache':
+        if not cache_is_shared(app.config):
+            raise RuntimeError("SESSION_BACKEND='cache' with several processes requires CACHE_BACKEND='redis'")
+        app.session_interface = CacheSessionInterface()
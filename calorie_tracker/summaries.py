@@ -0,0 +1,280 @@
+from datetime import datetime
+
+from sqlalchemy import func, event, select, delete, insert, and_, or_, case
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import attributes
+
+from .cache import cache_is_shared, get_cache, _totals_cache_key
+from .extensions import db
+from .models import FoodItem, FoodEntry, DailySummary
+from .replicas import reading_from_replica
+from .versions import bump_version, get_version, _summary_version_key
+
+NUTRIENTS = ('calories', 'protein', 'carbs', 'fat')
+
+def totals_key(user_id, day):
+    """Chave dos totais do dia no cache, com a versão atual do resumo.
+
+    A versão é lida antes do resumo e trocada após cada commit que o altera:
+    um total lido antes de uma escrita e gravado depois dela fica numa chave
+    que ninguém mais consulta, em vez de sobrescrever a invalidação.
+    """
+    return _totals_cache_key(user_id, day, get_version(_summary_version_key(user_id, day)))
+
+def get_nutrition_totals(user_id, day):
+    """Retorna os totais do dia: do cache ou de DailySummary (busca por chave primária)."""
+    # Cache de um só processo ficaria desatualizado após escritas em outro worker
+    if not cache_is_shared():
+        return _summary_totals(db.session.get(DailySummary, (user_id, day)))
+    cache = get_cache()
+    key = totals_key(user_id, day)
+    totals = cache.get(key)
+    if totals is None:
+        totals = _summary_totals(db.session.get(DailySummary, (user_id, day)))
+        # Uma réplica atrasada poderia repor no cache um total já invalidado
+        if not reading_from_replica():
+            cache.set(key, totals)
+    return totals
+
+def _summary_totals(summary):
+    if summary is None:
+        return {nutrient: 0 for nutrient in NUTRIENTS}
+    return {nutrient: getattr(summary, nutrient) for nutrient in NUTRIENTS}
+
+def _mark_summary_changed(session, key):
+    # Chaves (user_id, date) alteradas; o cache é invalidado após o commit
+    session.info.setdefault('changed_summaries', set()).add(key)
+
+def _summary_aggregate_query():
+    """SELECT user_id, date, SUM(nutriente * quantity)..., COUNT(*) agrupado por dia."""
+    return select(
+        FoodEntry.user_id,
+        FoodEntry.date,
+        *[func.coalesce(func.sum(getattr(FoodItem, nutrient) * FoodEntry.quantity), 0).label(nutrient)
+          for nutrient in NUTRIENTS],
+        func.count(FoodEntry.id).label('entry_count')
+    ).join(FoodEntry.food_item).group_by(FoodEntry.user_id, FoodEntry.date)
+
+def _apply_summary_delta(session, deltas, user_id, day, food_item_id, quantity, sign):
+    """Acumula em `deltas` a variação de uma entrada no resumo do seu dia."""
+    food_item = session.get(FoodItem, food_item_id)
+    if food_item is None or user_id is None or day is None:
+        return
+    key = (user_id, day)
+    delta = deltas.setdefault(key, dict.fromkeys((*NUTRIENTS, 'entry_count'), 0))
+    for nutrient in NUTRIENTS:
+        delta[nutrient] += sign * (getattr(food_item, nutrient) or 0) * (quantity or 0)
+    delta['entry_count'] += sign
+    _mark_summary_changed(session, key)
+
+# INSERT ... ON CONFLICT DO UPDATE de cada dialeto suportado
+SUMMARY_UPSERTS = {'sqlite': sqlite_insert, 'postgresql': postgresql_insert}
+
+def _upsert_summary_deltas(session, deltas):
+    """Soma os deltas aos resumos no próprio banco, um upsert por dia.
+
+    O incremento é feito pelo banco (calories = calories + delta), então
+    transações concorrentes do mesmo usuário não perdem atualizações nem
+    colidem ao criar o resumo de um dia novo.
+    """
+    if not deltas:
+        return
+    table = DailySummary.__table__
+    upsert = SUMMARY_UPSERTS[session.get_bind(mapper=DailySummary.__mapper__).dialect.name]
+    for (user_id, day), delta in deltas.items():
+        count = delta['entry_count']
+        # Dia sem entradas fica zerado (evita resíduos de ponto flutuante)
+        emptied = table.c.entry_count + count <= 0
+        statement = upsert(table).values(
+            user_id=user_id, date=day, entry_count=max(count, 0),
+            **{nutrient: delta[nutrient] if count > 0 else 0 for nutrient in NUTRIENTS}
+        )
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.date],
+            set_={
+                'entry_count': case((emptied, 0), else_=table.c.entry_count + count),
+                **{nutrient: case((emptied, 0), else_=table.c[nutrient] + delta[nutrient])
+                   for nutrient in NUTRIENTS}
+            }
+        ))
+        # Um resumo já carregado nesta sessão ficou desatualizado
+        summary = session.identity_map.get(session.identity_key(DailySummary, (user_id, day)))
+        if summary is not None:
+            session.expire(summary)
+
+def _entry_values(entry, committed=False):
+    """Retorna (user_id, date, food_item_id, quantity) atuais ou anteriores à alteração."""
+    values = []
+    for name in ('user_id', 'date', 'food_item_id', 'quantity'):
+        history = attributes.get_history(entry, name)
+        if committed and history.deleted:
+            values.append(history.deleted[0])
+        else:
+            values.append(getattr(entry, name))
+    return values
+
+# Histórico ativo: alterar um atributo expirado (ex.: logo após um commit)
+# carrega antes o valor gravado, que o delta da edição precisa subtrair
+for _attribute in (FoodEntry.user_id, FoodEntry.date, FoodEntry.food_item_id, FoodEntry.quantity):
+    event.listen(_attribute, 'set', lambda target, value, oldvalue, initiator: None,
+                 active_history=True)
+
+def _maintain_daily_summaries(session, flush_context, instances):
+    # Atualiza DailySummary na mesma transação de qualquer escrita em FoodEntry
+    deltas = {}
+    with session.no_autoflush:
+        for obj in list(session.new):
+            if isinstance(obj, FoodEntry):
+                if obj.date is None:
+                    obj.date = datetime.utcnow().date()
+                if obj.user_id is None and obj.user is not None:
+                    obj.user_id = obj.user.id
+                if obj.quantity is None:
+                    obj.quantity = 1.0
+                _apply_summary_delta(session, deltas, *_entry_values(obj), 1)
+        for obj in list(session.deleted):
+            if isinstance(obj, FoodEntry):
+                _apply_summary_delta(session, deltas, *_entry_values(obj, committed=True), -1)
+        for obj in list(session.dirty):
+            if isinstance(obj, FoodEntry) and session.is_modified(obj):
+                _apply_summary_delta(session, deltas, *_entry_values(obj, committed=True), -1)
+                _apply_summary_delta(session, deltas, *_entry_values(obj), 1)
+        _upsert_summary_deltas(session, deltas)
+
+def _resync_daily_summaries(session, keys):
+    """Recalcula os resumos dos pares (user_id, date) informados a partir de FoodEntry.
+
+    O recálculo é feito pelo banco: um INSERT ... SELECT ... ON CONFLICT DO
+    UPDATE grava os totais atuais dos dias com entradas e um UPDATE zera os
+    que ficaram vazios. Nenhum valor passa pelo Python, então uma escrita
+    concorrente no mesmo dia não é sobrescrita com totais antigos.
+    """
+    if not keys:
+        return
+    table = DailySummary.__table__
+    # Pela conexão: as instruções citam FoodEntry e não devem voltar a este hook
+    connection = session.connection(bind_arguments={'mapper': DailySummary.__mapper__})
+    upsert = SUMMARY_UPSERTS[connection.dialect.name]
+    in_keys = or_(*[and_(FoodEntry.user_id == user_id, FoodEntry.date == day) for user_id, day in keys])
+    statement = upsert(table).from_select(
+        ['user_id', 'date', *NUTRIENTS, 'entry_count'], _summary_aggregate_query().where(in_keys)
+    )
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.date],
+        set_={column: statement.excluded[column] for column in (*NUTRIENTS, 'entry_count')}
+    ))
+    has_entries = select(FoodEntry.id).where(
+        FoodEntry.user_id == table.c.user_id, FoodEntry.date == table.c.date
+    ).exists()
+    connection.execute(
+        table.update()
+        .where(or_(*[and_(table.c.user_id == user_id, table.c.date == day) for user_id, day in keys]),
+               ~has_entries)
+        .values(entry_count=0, **dict.fromkeys(NUTRIENTS, 0))
+    )
+    for key in keys:
+        # Um resumo já carregado nesta sessão ficou desatualizado
+        summary = session.identity_map.get(session.identity_key(DailySummary, key))
+        if summary is not None:
+            session.expire(summary)
+        _mark_summary_changed(session, key)
+
+def _invalidate_changed_totals(session):
+    # Write-through: troca a versão dos dias alterados na transação (também no
+    # rollback, caso algum total pendente tenha sido lido e guardado). Os totais
+    # guardados com a versão anterior deixam de ser lidos, e o ETag das
+    # respostas que dependem do dia muda
+    changed = session.info.pop('changed_summaries', None)
+    if changed:
+        for user_id, day in changed:
+            bump_version(_summary_version_key(user_id, day))
+
+def _maintain_daily_summaries_on_bulk(orm_execute_state):
+    # Operações em lote (insert em massa, query.delete()/update()) não passam
+    # pelo flush; aplica os mesmos ajustes nos dias afetados
+    if not (orm_execute_state.is_insert or orm_execute_state.is_delete or orm_execute_state.is_update):
+        return None
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not FoodEntry:
+        return None
+
+    session = orm_execute_state.session
+    if orm_execute_state.is_insert:
+        result = orm_execute_state.invoke_statement()
+        rows = orm_execute_state.parameters
+        if isinstance(rows, dict):
+            rows = [rows]
+        deltas = {}
+        with session.no_autoflush:
+            for row in rows or []:
+                _apply_summary_delta(session, deltas, row.get('user_id'), row.get('date'),
+                                     row.get('food_item_id'), row.get('quantity', 1.0), 1)
+            _upsert_summary_deltas(session, deltas)
+        return result
+
+    affected = select(FoodEntry.user_id, FoodEntry.date).distinct()
+    whereclause = orm_execute_state.statement.whereclause
+    if whereclause is not None:
+        affected = affected.where(whereclause)
+    keys = set(session.execute(affected).all())
+    if orm_execute_state.is_update:
+        # Um UPDATE pode mudar o dia ou o usuário: os dias novos vêm pelos ids
+        entry_ids = select(FoodEntry.id)
+        if whereclause is not None:
+            entry_ids = entry_ids.where(whereclause)
+        entry_ids = session.scalars(entry_ids).all()
+
+    result = orm_execute_state.invoke_statement()
+
+    if orm_execute_state.is_update and entry_ids:
+        keys.update(session.execute(
+            select(FoodEntry.user_id, FoodEntry.date).distinct().where(FoodEntry.id.in_(entry_ids))
+        ).all())
+    with session.no_autoflush:
+        _resync_daily_summaries(session, keys)
+    return result
+
+def listen_summary_hooks(target):
+    """Mantém DailySummary e o cache de totais nas escritas feitas pela sessão (ou classe de sessão)."""
+    event.listen(target, 'before_flush', _maintain_daily_summaries)
+    event.listen(target, 'after_commit', _invalidate_changed_totals)
+    event.listen(target, 'after_rollback', _invalidate_changed_totals)
+    event.listen(target, 'do_orm_execute', _maintain_daily_summaries_on_bulk)
+
+listen_summary_hooks(db.session)
+
+def rebuild_daily_summaries():
+    """Recria toda a tabela DailySummary a partir de FoodEntry com um INSERT ... SELECT."""
+    aggregate = _summary_aggregate_query()
+    db.session.execute(delete(DailySummary))
+    db.session.execute(
+        insert(DailySummary).from_select(
+            ['user_id', 'date', *NUTRIENTS, 'entry_count'], aggregate
+        )
+    )
+    db.session.commit()
+    # Só os totais e as versões dos resumos: sessões e versões do catálogo continuam valendo
+    cache = get_cache()
+    cache.delete_prefix('totals:')
+    cache.delete_prefix('summary:')
+    return db.session.scalar(select(func.count()).select_from(DailySummary))
+
+def find_summary_mismatches(tolerance=1e-6):
+    """Lista os pares (user_id, date) cujo resumo difere do recalculado a partir de FoodEntry."""
+    aggregate = _summary_aggregate_query().subquery()
+    differs = or_(
+        DailySummary.user_id.is_(None),
+        DailySummary.entry_count != aggregate.c.entry_count,
+        *[func.abs(getattr(DailySummary, nutrient) - aggregate.c[nutrient]) > tolerance
+          for nutrient in NUTRIENTS]
+    )
+    missing_or_wrong = select(aggregate.c.user_id, aggregate.c.date).outerjoin(
+        DailySummary,
+        and_(DailySummary.user_id == aggregate.c.user_id, DailySummary.date == aggregate.c.date)
+    ).where(differs)
+    orphaned = select(DailySummary.user_id, DailySummary.date).outerjoin(
+        aggregate,
+        and_(DailySummary.user_id == aggregate.c.user_id, DailySummary.date == aggregate.c.date)
+    ).where(aggregate.c.user_id.is_(None), DailySummary.entry_count != 0)
+    return db.session.execute(missing_or_wrong.union_all(orphaned)).all()
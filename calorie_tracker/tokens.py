@@ -0,0 +1,38 @@
+"""Tokens de API (Authorization: Bearer) assinados com HMAC e com validade.
+
+O token leva só o id do usuário e o instante de emissão; a verificação é a
+da assinatura e da idade (API_TOKEN_MAX_AGE), sem consultar o banco nem
+calcular o hash da senha. Tokens não são revogáveis: a validade é curta.
+"""
+import hashlib
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+TOKEN_SALT = 'api-token'
+
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.secret_key, salt=TOKEN_SALT,
+                                  signer_kwargs={'digest_method': hashlib.sha256})
+
+def issue_token(user):
+    return _serializer().dumps({'uid': user.id})
+
+def verify_token(token):
+    """Id do usuário de um token válido e dentro da validade; None caso contrário."""
+    if not token:
+        return None
+    try:
+        data = _serializer().loads(token, max_age=current_app.config['API_TOKEN_MAX_AGE'])
+    except BadSignature:
+        return None
+    user_id = data.get('uid') if isinstance(data, dict) else None
+    return user_id if isinstance(user_id, int) else None
+
+def bearer_token(authorization):
+    """Token do cabeçalho `Authorization: Bearer <token>`, ou None."""
+    scheme, _, token = (authorization or '').partition(' ')
+    if scheme.lower() != 'bearer':
+        return None
+    return token.strip() or None
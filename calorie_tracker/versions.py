@@ -0,0 +1,108 @@
+"""Versões do catálogo e dos resumos diários, usadas nos ETags da API.
+
+Cada versão é um token aleatório guardado no cache (memória ou Redis) e
+trocado após o commit de qualquer escrita que altere o dado. Um token que
+expirou ou foi descartado é recriado com outro valor: o cliente recebe uma
+resposta completa, nunca um 304 indevido. Com o cache em memória e vários
+processos, cada um teria as próprias versões: a API então não envia ETags
+(cache_is_shared()).
+"""
+import uuid
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import attributes
+
+from .cache import get_cache
+from .extensions import db
+from .models import FoodItem
+
+
+def _catalog_version_key(user_id=None):
+    # Sem usuário: alimentos públicos; com usuário: os alimentos privados dele
+    return 'catalog:public' if user_id is None else f'catalog:{user_id}'
+
+def _summary_version_key(user_id, day):
+    return f'summary:{user_id}:{day.isoformat()}'
+
+def get_version(key):
+    """Versão atual de `key`; cria uma nova se ainda não existir."""
+    cache = get_cache()
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(key, version)
+    return version
+
+def bump_version(key):
+    get_cache().set(key, uuid.uuid4().hex)
+
+def catalog_versions(user_id):
+    """Versões que determinam o catálogo visível ao usuário (públicos + próprios)."""
+    return get_version(_catalog_version_key()), get_version(_catalog_version_key(user_id))
+
+def _catalog_keys(is_public, user_id):
+    keys = set()
+    # is_public None: o default da coluna (público) ainda não foi aplicado
+    if is_public or is_public is None:
+        keys.add(_catalog_version_key())
+    if user_id is not None:
+        keys.add(_catalog_version_key(user_id))
+    return keys
+
+def _committed_value(obj, name):
+    history = attributes.get_history(obj, name)
+    return history.deleted[0] if history.deleted else getattr(obj, name)
+
+def _mark_catalog_changed(session, keys):
+    session.info.setdefault('changed_catalogs', set()).update(keys)
+
+def _track_catalog_changes(session, flush_context, instances):
+    # Catálogos afetados pelos FoodItem gravados; as versões mudam após o commit
+    with session.no_autoflush:
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            if isinstance(obj, FoodItem):
+                # Estado novo e anterior: um alimento que muda de dono ou deixa
+                # de ser público também sai do catálogo em que estava
+                _mark_catalog_changed(session, _catalog_keys(obj.is_public, obj.user_id)
+                                      | _catalog_keys(_committed_value(obj, 'is_public'),
+                                                      _committed_value(obj, 'user_id')))
+
+def _track_catalog_bulk(orm_execute_state):
+    # INSERT em lote (importação) e query.update()/delete() não passam pelo flush
+    if not (orm_execute_state.is_insert or orm_execute_state.is_delete or orm_execute_state.is_update):
+        return None
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not FoodItem:
+        return None
+
+    session = orm_execute_state.session
+    if orm_execute_state.is_insert:
+        rows = orm_execute_state.parameters
+        for row in [rows] if isinstance(rows, dict) else rows or []:
+            _mark_catalog_changed(session, _catalog_keys(row.get('is_public', True), row.get('user_id')))
+        return None
+
+    affected = select(FoodItem.is_public, FoodItem.user_id).distinct()
+    whereclause = orm_execute_state.statement.whereclause
+    if whereclause is not None:
+        affected = affected.where(whereclause)
+    for is_public, user_id in session.execute(affected).all():
+        _mark_catalog_changed(session, _catalog_keys(is_public, user_id))
+    # Um UPDATE pode tornar o alimento público
+    if orm_execute_state.is_update:
+        _mark_catalog_changed(session, {_catalog_version_key()})
+    return None
+
+def _bump_changed_catalogs(session):
+    # Também no rollback: uma troca a mais só custa uma resposta completa
+    for key in session.info.pop('changed_catalogs', ()):
+        bump_version(key)
+
+def listen_version_hooks(target):
+    """Troca as versões do catálogo nas escritas de FoodItem feitas pela sessão (ou classe de sessão)."""
+    event.listen(target, 'before_flush', _track_catalog_changes)
+    event.listen(target, 'do_orm_execute', _track_catalog_bulk)
+    event.listen(target, 'after_commit', _bump_changed_catalogs)
+    event.listen(target, 'after_rollback', _bump_changed_catalogs)
+
+listen_version_hooks(db.session)
@@ -3,15 +3,17 @@ import tempfile
 import pytest
 from flask import Flask
 
-from app import app, db
+from calorie_tracker import create_app, db
 
 @pytest.fixture
 def test_app():
     """Create and configure a new app instance for each test."""
     # Configura o app para testes
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    app.config['WTF_CSRF_ENABLED'] = False
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'WTF_CSRF_ENABLED': False,
+    })
     
     # Cria o banco de dados e carrega os dados de teste
     with app.app_context():
@@ -21,7 +21,7 @@ def run_tests_and_collect_results():
         "tests/integration/",
         "tests/tdd_example/",
         "-v",
-        "--cov=app",
+        "--cov=calorie_tracker",
         "--cov-report=json:tests/reports/coverage.json",
         "--cov-report=html:tests/reports/coverage",
         "--cov-report=term-missing",
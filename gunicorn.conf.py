@@ -0,0 +1,66 @@
+"""
+Configuração de produção do gunicorn (carregada automaticamente do diretório atual).
+
+Execute: gunicorn app:app
+
+Os valores derivam do número de CPUs e podem ser ajustados por variáveis de
+ambiente: PORT/BIND, WEB_CONCURRENCY (processos), GUNICORN_THREADS,
+GUNICORN_TIMEOUT e GUNICORN_GRACEFUL_TIMEOUT.
+"""
+import multiprocessing
+import os
+import signal
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+# Processos: 2 x CPUs + 1 (recomendação do gunicorn para carga com I/O)
+workers = int(os.environ.get('WEB_CONCURRENCY', cpu_count * 2 + 1))
+# Threads por processo: requisições esperando o banco não bloqueiam o worker
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# Importa o app uma vez no master; os workers herdam a memória por fork
+preload_app = True
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+# No SIGTERM os workers param de aceitar conexões e têm este prazo para
+# terminar as requisições em andamento
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+# Recicla os workers periodicamente (com jitter para não reiniciarem juntos)
+max_requests = 10000
+max_requests_jitter = 1000
+
+accesslog = '-'
+errorlog = '-'
+
+# Cada processo já tem seu pool de threads; divide as CPUs entre os processos
+# para que o pool de verificação de senhas não multiplique as threads por worker
+os.environ.setdefault('PASSWORD_HASH_WORKERS', str(max(1, cpu_count // workers)))
+# O app precisa saber se há vários processos (cache em memória não compartilhado)
+os.environ.setdefault('WEB_CONCURRENCY', str(workers))
+
+
+def post_fork(server, worker):
+    # Conexões abertas no master (preload) não podem ser compartilhadas entre
+    # processos: descarta o pool herdado de cada engine (primário e réplicas
+    # de SQLALCHEMY_BINDS) sem fechar os sockets do pai
+    from app import app
+    from calorie_tracker import db
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # Ao receber SIGTERM o /readyz passa a responder 503 enquanto o worker drena
+    from app import app
+    from calorie_tracker.health import mark_draining
+    handle_exit = signal.getsignal(signal.SIGTERM)
+
+    def handle_term(signum, frame):
+        mark_draining(app)
+        handle_exit(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_term)
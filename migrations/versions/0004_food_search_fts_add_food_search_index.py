@@ -0,0 +1,50 @@
+"""add food search index
+
+Revision ID: 0004_food_search_fts
+Revises: 0003_daily_summary
+Create Date: 2026-10-18 18:40:12.512093
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_food_search_fts'
+down_revision = '0003_daily_summary'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Índice FTS5 existe apenas no SQLite; outros bancos usam a busca por LIKE
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS food_item_fts USING fts5("
+        "name, content='food_item', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS food_item_fts_ai AFTER INSERT ON food_item BEGIN "
+        "INSERT INTO food_item_fts(rowid, name) VALUES (new.id, new.name); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS food_item_fts_ad AFTER DELETE ON food_item BEGIN "
+        "INSERT INTO food_item_fts(food_item_fts, rowid, name) VALUES ('delete', old.id, old.name); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS food_item_fts_au AFTER UPDATE OF name ON food_item BEGIN "
+        "INSERT INTO food_item_fts(food_item_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+        "INSERT INTO food_item_fts(rowid, name) VALUES (new.id, new.name); END"
+    )
+    # Indexa os alimentos já existentes
+    op.execute("INSERT INTO food_item_fts(food_item_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS food_item_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS food_item_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS food_item_fts_ai")
+    op.execute("DROP TABLE IF EXISTS food_item_fts")
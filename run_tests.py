@@ -44,7 +44,7 @@ def run_tests():
         "tests/integration/",
         "tests/tdd_example/",
         "-v",
-        "--cov=app",
+        "--cov=calorie_tracker",
         "--cov-report=term-missing",
         "--cov-report=html:tests/reports/coverage",
         f"--html=tests/reports/test_report_{timestamp}.html",
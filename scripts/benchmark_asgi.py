@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Teste de carga: API síncrona (gunicorn, gthread) x camada ASGI (uvicorn).
+
+Sobe cada servidor em um banco SQLite temporário com o mesmo número de
+processos e dispara requisições autenticadas com N clientes simultâneos
+(padrão 500), medindo requisições/s, p50 e p99 de cada endpoint. O cookie de
+sessão é assinado com a SECRET_KEY do app, como o do login.
+
+Execute: python scripts/benchmark_asgi.py [--clients 500] [--requests 5000] [--workers 2]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from calorie_tracker import create_app, db  # noqa: E402
+from calorie_tracker.models import User, FoodItem  # noqa: E402
+
+SERVERS = {
+    'wsgi': lambda port, workers: ['gunicorn', 'app:app', '--bind', f'127.0.0.1:{port}',
+                                   '--workers', str(workers), '--threads', '8',
+                                   '--worker-class', 'gthread', '--log-level', 'warning',
+                                   '--access-logfile', os.devnull],
+    'asgi': lambda port, workers: ['uvicorn', 'asgi:app', '--port', str(port),
+                                   '--workers', str(workers), '--log-level', 'warning',
+                                   '--no-access-log'],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def setup_database(db_path):
+    """Cria o schema, um usuário e um catálogo; retorna (cookie de sessão, id de um alimento)."""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+    with app.app_context():
+        db.create_all()
+        user = User(username='loadtest', email='loadtest@example.com', password_hash='-')
+        db.session.add(user)
+        db.session.add_all([FoodItem(name=f'Alimento {i}', calories=50 + i, protein=1, carbs=10, fat=1)
+                            for i in range(200)])
+        db.session.commit()
+        food_id = FoodItem.query.first().id
+        serializer = app.session_interface.get_signing_serializer(app)
+        cookie = {app.config['SESSION_COOKIE_NAME']: serializer.dumps({'_user_id': str(user.id), '_fresh': True})}
+        db.engine.dispose()
+    return cookie, food_id
+
+async def wait_ready(base_url, timeout=30):
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get('/healthz')).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f'servidor não respondeu em {base_url}')
+
+async def load(base_url, cookie, request_factory, clients, total):
+    """Dispara `total` requisições com `clients` conexões simultâneas; retorna (latências, erros, segundos)."""
+    latencies, errors = [], Counter()
+    remaining = iter(range(total))
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, cookies=cookie, limits=limits, timeout=60) as client:
+        async def worker():
+            for _ in remaining:
+                method, path, body = request_factory()
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body)
+                    error = f'HTTP {response.status_code}' if response.status_code >= 400 else None
+                except httpx.HTTPError as e:
+                    error = type(e).__name__
+                if error:
+                    errors[error] += 1
+                else:
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+def run_server(kind, workers, env, cookie, scenarios, clients, total):
+    port = free_port()
+    process = subprocess.Popen(SERVERS[kind](port, workers), cwd=ROOT, env=env)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        asyncio.run(wait_ready(base_url))
+        results = {}
+        for name, factory in scenarios.items():
+            asyncio.run(load(base_url, cookie, factory, min(clients, 50), min(total, 500)))  # aquecimento
+            results[name] = asyncio.run(load(base_url, cookie, factory, clients, total))
+        return results
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=500, help='Clientes simultâneos')
+    parser.add_argument('--requests', type=int, default=5000, help='Requisições por cenário')
+    parser.add_argument('--workers', type=int, default=2, help='Processos de cada servidor')
+    parser.add_argument('--servers', nargs='+', default=list(SERVERS), choices=list(SERVERS))
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    try:
+        cookie, food_id = setup_database(db_path)
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}')
+        scenarios = {
+            'GET /api/food': lambda: ('GET', '/api/food?limit=20', None),
+            'POST /api/entry': lambda: ('POST', '/api/entry', {'food_item_id': food_id, 'quantity': 1}),
+        }
+        print(f"🔥 Carga: {args.clients} clientes, {args.requests} requisições por cenário, "
+              f"{args.workers} processo(s) por servidor")
+        print(f"{'servidor':>8} {'cenário':>16} {'req/s':>8} {'p50 (ms)':>10} {'p99 (ms)':>10} {'erros':>6}")
+        for kind in args.servers:
+            results = run_server(kind, args.workers, env, cookie, scenarios, args.clients, args.requests)
+            for name, (latencies, errors, elapsed) in results.items():
+                p99 = statistics.quantiles(latencies, n=100)[-1] if len(latencies) >= 2 else float('nan')
+                median = statistics.median(latencies) if latencies else float('nan')
+                print(f"{kind:>8} {name:>16} {len(latencies) / elapsed:>8.0f} {median:>10.1f} "
+                      f"{p99:>10.1f} {sum(errors.values()):>6}  {dict(errors) or ''}")
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+
+if __name__ == '__main__':
+    main()
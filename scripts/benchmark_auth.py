@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark do custo de autenticação por requisição (user_loader + sessão).
+
+Mede a latência de uma rota @login_required vazia, descontado o custo de uma
+rota pública vazia, sem e com o cache de identidades (AUTH_CACHE_TTL) e com
+cada armazenamento de sessão (cookie assinado x cache). Mostra também o
+tamanho do cookie de sessão em cada caso.
+
+Execute: python scripts/benchmark_auth.py [--requests 2000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Usa um banco temporário para não afetar o calories.db de desenvolvimento
+db_fd, db_path = tempfile.mkstemp(suffix='.db')
+os.close(db_fd)
+os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.sessions import SecureCookieSessionInterface
+from flask_login import login_required
+from app import app, db, User
+from calorie_tracker.sessions import CacheSessionInterface
+
+
+@app.route('/__bench/public')
+def bench_public():
+    return ''
+
+@app.route('/__bench/private')
+@login_required
+def bench_private():
+    return ''
+
+
+def timed_requests(client, url, count):
+    """Mediana em µs de `count` GETs em `url`."""
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - start) * 1e6)
+        assert response.status_code == 200, response.status_code
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='Requisições por cenário')
+    args = parser.parse_args()
+
+    app.config['TESTING'] = True
+    scenarios = {
+        'sem cache, cookie': (0, SecureCookieSessionInterface()),
+        'cache, cookie': (60, SecureCookieSessionInterface()),
+        'cache, sessão no cache': (60, CacheSessionInterface()),
+    }
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            user = User(username='bench', email='bench@example.com', password_hash='-')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+
+        print(f"🔐 Custo de autenticação por requisição (mediana de {args.requests})")
+        print(f"{'cenário':>24} {'privada (µs)':>13} {'auth (µs)':>10} {'cookie (bytes)':>15}")
+        for name, (ttl, interface) in scenarios.items():
+            app.config['AUTH_CACHE_TTL'] = ttl
+            app.session_interface = interface
+            app.extensions.pop('identity_cache', None)
+            # Contexto próprio por cenário, como em produção (g novo a cada requisição)
+            with app.app_context():
+                client = app.test_client()
+                with client.session_transaction() as session:
+                    session['_user_id'] = str(user_id)
+                    session['_fresh'] = True
+                cookie = client.get_cookie(app.config['SESSION_COOKIE_NAME']).value
+
+                timed_requests(client, '/__bench/private', 50)  # aquecimento
+                public = timed_requests(client, '/__bench/public', args.requests)
+                private = timed_requests(client, '/__bench/private', args.requests)
+            print(f"{name:>24} {private:>13.0f} {private - public:>10.0f} {len(cookie):>15}")
+
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de throughput: POST /api/entry (uma entrada) x POST /api/entries/batch.
+
+Registra o mesmo número de entradas pelos dois caminhos em um banco SQLite
+temporário e compara entradas/segundo.
+
+Execute: python scripts/benchmark_batch_entries.py [--batch-size 100] [--rounds 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Usa um banco temporário para não afetar o calories.db de desenvolvimento
+db_fd, db_path = tempfile.mkstemp(suffix='.db')
+os.close(db_fd)
+os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db, User, FoodItem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch-size', type=int, default=100, help='Entradas por lote')
+    parser.add_argument('--rounds', type=int, default=20, help='Lotes por caminho')
+    args = parser.parse_args()
+
+    app.config['TESTING'] = True
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            user = User(username='bench', email='bench@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.add_all([
+                FoodItem(name=f'Alimento {i}', calories=100 + i, protein=1, carbs=1, fat=1)
+                for i in range(20)
+            ])
+            db.session.commit()
+            food_ids = [f.id for f in FoodItem.query.all()]
+
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = str(user.id)
+                session['_fresh'] = True
+
+            payload = [
+                {'food_item_id': food_ids[i % len(food_ids)], 'quantity': 1 + (i % 3)}
+                for i in range(args.batch_size)
+            ]
+            total = args.batch_size * args.rounds
+
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                for item in payload:
+                    assert client.post('/api/entry', json=item).status_code == 201
+            single_rate = total / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                assert client.post('/api/entries/batch', json=payload).status_code == 201
+            batch_rate = total / (time.perf_counter() - start)
+
+            print(f"📦 {args.rounds} x {args.batch_size} entradas por caminho")
+            print(f"   /api/entry:         {single_rate:10.0f} entradas/s")
+            print(f"   /api/entries/batch: {batch_rate:10.0f} entradas/s")
+            print(f"   Ganho: {batch_rate / single_rate:.1f}x")
+
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
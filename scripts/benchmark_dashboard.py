@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark da latência do dashboard conforme a tabela food_entry cresce.
+
+Popula um banco SQLite temporário com milhões de entradas distribuídas entre
+vários usuários e datas e mede o tempo de GET /dashboard para um usuário com
+um número fixo de entradas no dia. Com os índices compostos a latência deve
+ficar estável; com --no-index é possível comparar com o full table scan.
+
+Execute: python scripts/benchmark_dashboard.py [--sizes 10000 100000 1000000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Usa um banco temporário para não afetar o calories.db de desenvolvimento
+db_fd, db_path = tempfile.mkstemp(suffix='.db')
+os.close(db_fd)
+os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app import app, db, User, FoodItem, FoodEntry
+
+CHUNK_SIZE = 50000
+USERS = 1000
+FOODS = 200
+DAYS = 365 * 3
+ENTRIES_TODAY = 10
+
+
+def setup_base_data():
+    """Cria usuários, alimentos e as entradas de hoje do usuário medido."""
+    db.session.execute(User.__table__.insert(), [
+        {'username': f'user{i}', 'email': f'user{i}@example.com',
+         'password_hash': 'x', 'daily_calorie_goal': 2000}
+        for i in range(USERS)
+    ])
+    db.session.execute(FoodItem.__table__.insert(), [
+        {'name': f'Alimento {i}', 'calories': 50 + i, 'protein': 1.0,
+         'carbs': 10.0, 'fat': 0.5, 'is_public': True}
+        for i in range(FOODS)
+    ])
+    today = datetime.utcnow().date()
+    db.session.execute(FoodEntry.__table__.insert(), [
+        {'user_id': 1, 'food_item_id': (i % FOODS) + 1, 'quantity': 1.0, 'date': today}
+        for i in range(ENTRIES_TODAY)
+    ])
+    db.session.commit()
+
+
+def grow_entries(current, target):
+    """Insere entradas históricas aleatórias até a tabela atingir `target` linhas."""
+    today = datetime.utcnow().date()
+    rng = random.Random(current)
+    while current < target:
+        count = min(CHUNK_SIZE, target - current)
+        db.session.execute(FoodEntry.__table__.insert(), [
+            {
+                # Usuário 1 só recebe entradas passadas para manter o dia de hoje fixo
+                'user_id': rng.randint(2, USERS),
+                'food_item_id': rng.randint(1, FOODS),
+                'quantity': 1.0,
+                'date': today - timedelta(days=rng.randint(0, DAYS))
+            }
+            for _ in range(count)
+        ])
+        db.session.commit()
+        current += count
+        print(f"   ... {current} entradas", end='\r')
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+    return current
+
+
+def measure_dashboard(client, requests):
+    """Retorna as latências (ms) de `requests` chamadas a GET /dashboard."""
+    client.get('/dashboard')  # aquecimento
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get('/dashboard')
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='Tamanhos da tabela food_entry a medir')
+    parser.add_argument('--requests', type=int, default=50,
+                        help='Requisições por tamanho')
+    parser.add_argument('--no-index', action='store_true',
+                        help='Remove os índices compostos para comparação')
+    args = parser.parse_args()
+
+    app.config['TESTING'] = True
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            if args.no_index:
+                db.session.execute(text('DROP INDEX ix_food_entry_user_id_date'))
+                db.session.execute(text('DROP INDEX ix_food_item_is_public_user_id'))
+            setup_base_data()
+
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = '1'
+                session['_fresh'] = True
+
+            print(f"📊 Benchmark do dashboard ({'sem' if args.no_index else 'com'} índices)")
+            print(f"{'entradas':>12} {'mediana (ms)':>14} {'p95 (ms)':>10}")
+            current = ENTRIES_TODAY
+            for size in sorted(args.sizes):
+                current = grow_entries(current, size)
+                timings = measure_dashboard(client, args.requests)
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                print(f"{current:>12} {statistics.median(timings):>14.2f} {p95:>10.2f}")
+
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark de GET /api/history para uma série diária de um ano.
+
+Popula um banco SQLite temporário com vários anos de histórico para muitos
+usuários e mede a latência da série diária, semanal e mensal de um usuário.
+
+Execute: python scripts/benchmark_history.py [--users 200] [--entries-per-day 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Usa um banco temporário para não afetar o calories.db de desenvolvimento
+db_fd, db_path = tempfile.mkstemp(suffix='.db')
+os.close(db_fd)
+os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app import app, db, User, FoodItem, FoodEntry
+from calorie_tracker.summaries import rebuild_daily_summaries
+
+DAYS = 3 * 365
+FOODS = 100
+
+
+def populate(users, entries_per_day):
+    """Insere `entries_per_day` entradas por dia, por usuário, nos últimos três anos."""
+    db.session.execute(User.__table__.insert(), [
+        {'username': f'user{i}', 'email': f'user{i}@example.com',
+         'password_hash': 'x', 'daily_calorie_goal': 2000}
+        for i in range(users)
+    ])
+    db.session.execute(FoodItem.__table__.insert(), [
+        {'name': f'Alimento {i}', 'calories': 50 + i, 'protein': 1.0,
+         'carbs': 10.0, 'fat': 0.5, 'is_public': True}
+        for i in range(FOODS)
+    ])
+    today = datetime.utcnow().date()
+    rng = random.Random(7)
+    for user_id in range(1, users + 1):
+        db.session.execute(FoodEntry.__table__.insert(), [
+            {'user_id': user_id, 'food_item_id': rng.randint(1, FOODS),
+             'quantity': 1.0, 'date': today - timedelta(days=day)}
+            for day in range(DAYS) for _ in range(entries_per_day)
+        ])
+        print(f"   ... {user_id} usuários", end='\r')
+    db.session.commit()
+    print()
+    # As entradas foram inseridas direto na tabela; recalcula os resumos
+    rebuild_daily_summaries()
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=200, help='Usuários no banco')
+    parser.add_argument('--entries-per-day', type=int, default=5, help='Entradas por dia e usuário')
+    parser.add_argument('--requests', type=int, default=30, help='Requisições por agrupamento')
+    args = parser.parse_args()
+
+    app.config['TESTING'] = True
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            populate(args.users, args.entries_per_day)
+
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = '1'
+                session['_fresh'] = True
+
+            today = datetime.utcnow().date()
+            start_date = today - timedelta(days=364)
+            print(f"📈 Histórico de um ano ({args.users * args.entries_per_day * DAYS} entradas no banco)")
+            print(f"{'bucket':>8} {'pontos':>7} {'mediana (ms)':>14} {'p95 (ms)':>10}")
+            for bucket in ('day', 'week', 'month'):
+                url = f'/api/history?from={start_date}&to={today}&bucket={bucket}'
+                points = len(client.get(url).get_json()['series'])  # aquecimento
+                timings = []
+                for _ in range(args.requests):
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    assert response.status_code == 200
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                print(f"{bucket:>8} {points:>7} {statistics.median(timings):>14.2f} {p95:>10.2f}")
+
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
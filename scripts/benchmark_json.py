@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark da serialização de GET /api/food com 100 mil alimentos.
+
+Carrega as linhas de FoodItem de um banco SQLite temporário como api_food()
+as monta (lista de dicts) e mede o tempo de serialização de cada provedor
+JSON (json do Flask x orjson) e o tempo/tamanho de cada compressão.
+
+Execute: python scripts/benchmark_json.py [--rows 100000] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Usa um banco temporário para não afetar o calories.db de desenvolvimento
+db_fd, db_path = tempfile.mkstemp(suffix='.db')
+os.close(db_fd)
+os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+from app import app, db, FoodItem
+from calorie_tracker.api import FOOD_FIELDS, _food_page, _food_page_query
+from calorie_tracker.compression import ENCODERS, _available_encodings
+from calorie_tracker.json_provider import OrjsonProvider, orjson
+
+
+def measure(function, repeat):
+    """Mediana em ms de `repeat` execuções; retorna (ms, resultado da última)."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000, help='Alimentos serializados')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetições de cada medição')
+    args = parser.parse_args()
+
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            db.session.execute(FoodItem.__table__.insert(), [
+                {'name': f'Alimento {i}', 'calories': 50 + i % 500, 'protein': i % 30 / 3,
+                 'carbs': i % 70 / 7, 'fat': i % 20 / 4, 'is_public': True}
+                for i in range(args.rows)
+            ])
+            db.session.commit()
+
+            # Mesma montagem de api_food(): linhas -> lista de dicts
+            rows = db.session.execute(_food_page_query(None, args.rows, 0, FOOD_FIELDS)).all()
+            items, _ = _food_page(rows, args.rows, FOOD_FIELDS, None)
+
+            providers = {'json': DefaultJSONProvider(app)}
+            if orjson is not None:
+                providers['orjson'] = OrjsonProvider(app)
+
+            print(f"🧾 Serialização de {len(items)} alimentos (mediana de {args.repeat} execuções)")
+            print(f"{'etapa':>18} {'tempo (ms)':>11} {'bytes':>12}")
+            body = None
+            for name, provider in providers.items():
+                elapsed, body = measure(lambda: provider.response(items).get_data(), args.repeat)
+                print(f"{name:>18} {elapsed:>11.1f} {len(body):>12}")
+
+            # Compressão do último corpo (o do provedor mais rápido disponível)
+            for encoding in _available_encodings():
+                elapsed, compressed = measure(lambda: ENCODERS[encoding](body, app.config), args.repeat)
+                print(f"{encoding:>18} {elapsed:>11.1f} {len(compressed):>12}")
+
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
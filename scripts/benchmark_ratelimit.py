@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark do custo do limite de requisições (token bucket) por requisição.
+
+Mede a latência de uma rota vazia (que lê current_user, como as rotas
+limitadas) sem o limitador, com o limitador numa rota sem regra e numa rota
+com regra, para cliente anônimo (balde por IP) e autenticado (por usuário).
+Mede também o custo isolado do hook e de tirar uma ficha do balde em memória.
+
+Execute: python scripts/benchmark_ratelimit.py [--requests 2000] [--rounds 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Usa um banco temporário para não afetar o calories.db de desenvolvimento
+db_fd, db_path = tempfile.mkstemp(suffix='.db')
+os.close(db_fd)
+os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_login import current_user
+from calorie_tracker import create_app, db
+from calorie_tracker.models import User
+from calorie_tracker.ratelimit import MemoryBucketStore, parse_rate
+
+# Limite alto o bastante para nenhuma requisição do benchmark ser recusada
+BENCH_LIMITS = {'bench_limited': '1000000/second'}
+
+
+def bench_view():
+    return str(current_user.is_authenticated)
+
+def bench_app(enabled):
+    app = create_app({'TESTING': True, 'RATE_LIMIT_ENABLED': enabled, 'RATE_LIMITS': BENCH_LIMITS})
+    app.add_url_rule('/__bench/open', 'bench_open', bench_view)
+    app.add_url_rule('/__bench/limited', 'bench_limited', bench_view)
+    return app
+
+def timed_requests(client, url, count):
+    """Mediana em µs de `count` GETs em `url`."""
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - start) * 1e6)
+        assert response.status_code == 200, response.status_code
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='Requisições por cenário')
+    parser.add_argument('--rounds', type=int, default=5, help='Rodadas intercaladas dos cenários')
+    args = parser.parse_args()
+
+    scenarios = {
+        'sem limitador, anônimo': (False, '/__bench/limited', False),
+        'rota sem regra': (True, '/__bench/open', False),
+        'balde por IP': (True, '/__bench/limited', False),
+        'sem limitador, usuário': (False, '/__bench/limited', True),
+        'balde por usuário': (True, '/__bench/limited', True),
+    }
+    try:
+        app = bench_app(False)
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            user = User(username='bench', email='bench@example.com', password_hash='-')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+            db.session.remove()
+            db.engine.dispose()
+
+        # Cenários intercalados em rodadas (melhor mediana de cada): a deriva da
+        # máquina ao longo da execução não entra na diferença entre eles
+        clients = {}
+        for name, (enabled, url, logged_in) in scenarios.items():
+            app = bench_app(enabled)
+            client = app.test_client()
+            if logged_in:
+                with client.session_transaction() as session:
+                    session['_user_id'] = str(user_id)
+                    session['_fresh'] = True
+            clients[name] = (app, client)
+        results = dict.fromkeys(scenarios, float('inf'))
+        for _ in range(args.rounds):
+            for name, (enabled, url, logged_in) in scenarios.items():
+                app, client = clients[name]
+                with app.app_context():
+                    timed_requests(client, url, 20)  # aquecimento
+                    elapsed = timed_requests(client, url, args.requests // args.rounds)
+                    db.session.remove()
+                results[name] = min(results[name], elapsed)
+
+        print(f"🚦 Custo do limite de requisições (melhor de {args.rounds} medianas, "
+              f"{args.requests} requisições por cenário)")
+        print(f"{'cenário':>24} {'rota (µs)':>10} {'limite (µs)':>12}")
+        baseline = {}
+        for name, (enabled, url, logged_in) in scenarios.items():
+            if not enabled:
+                baseline[logged_in] = results[name]
+            print(f"{name:>24} {results[name]:>10.1f} {results[name] - baseline[logged_in]:>12.1f}")
+        for app, _ in clients.values():
+            with app.app_context():
+                db.engine.dispose()
+
+        # Custo isolado, sem o ruído do cliente de testes: o hook before_request
+        # numa requisição anônima (current_user já carregado, como nas views) e
+        # uma ficha tirada direto do balde em memória
+        count = 200_000
+        app = clients['balde por IP'][0]
+        hook = app.before_request_funcs[None][-1]
+        with app.test_request_context('/__bench/limited'):
+            current_user.is_authenticated
+            start = time.perf_counter()
+            for _ in range(count):
+                hook()
+            print(f"\n{'hook before_request':>24} {(time.perf_counter() - start) / count * 1e6:>10.2f} µs")
+        store = MemoryBucketStore()
+        capacity, rate = parse_rate(BENCH_LIMITS['bench_limited'])
+        start = time.perf_counter()
+        for i in range(count):
+            store.take(f'bench_limited|ip:10.0.{i % 256}.{i % 100}', capacity, rate)
+        print(f"{'MemoryBucketStore.take':>24} {(time.perf_counter() - start) / count * 1e6:>10.2f} µs")
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca textual GET /api/food/search sobre um catálogo grande.
+
+Popula um banco SQLite temporário com um catálogo sintético de alimentos
+(nomes em português, com acentos) e mede a latência de buscas típicas.
+
+Execute: python scripts/benchmark_search.py [--items 500000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Usa um banco temporário para não afetar o calories.db de desenvolvimento
+db_fd, db_path = tempfile.mkstemp(suffix='.db')
+os.close(db_fd)
+os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app import app, db, User, FoodItem
+
+CHUNK_SIZE = 50000
+BASES = ['Maçã', 'Feijão', 'Arroz', 'Frango', 'Pão', 'Iogurte', 'Ovo', 'Banana',
+         'Peito de Peru', 'Salada', 'Queijo', 'Leite', 'Carne', 'Peixe', 'Batata',
+         'Mandioca', 'Açaí', 'Limão', 'Cenoura', 'Abóbora', 'Tomate', 'Café']
+VARIANTS = ['Preto', 'Branco', 'Integral', 'Grelhado', 'Cozido', 'Assado', 'Frito',
+            'Natural', 'Light', 'Orgânico', 'Desnatado', 'Caseiro', 'Temperado',
+            'Vermelho', 'Verde', 'Doce', 'Salgado', 'Congelado']
+QUERIES = ['maca', 'feij pre', 'frango grel', 'acai', 'pao integ', 'abobora cozido',
+           'queijo', 'cafe', 'limao verde', 'mandioca frito']
+
+
+def populate(items):
+    """Insere `items` alimentos públicos e alguns privados de outros usuários."""
+    db.session.execute(User.__table__.insert(), [
+        {'username': f'user{i}', 'email': f'user{i}@example.com',
+         'password_hash': 'x', 'daily_calorie_goal': 2000}
+        for i in range(100)
+    ])
+    rng = random.Random(42)
+    inserted = 0
+    while inserted < items:
+        count = min(CHUNK_SIZE, items - inserted)
+        rows = []
+        for i in range(count):
+            is_public = rng.random() < 0.8
+            rows.append({
+                'name': f'{rng.choice(BASES)} {rng.choice(VARIANTS)} {inserted + i}',
+                'calories': rng.randint(10, 500),
+                'protein': 1.0, 'carbs': 1.0, 'fat': 1.0,
+                'is_public': is_public,
+                'user_id': None if is_public else rng.randint(1, 100)
+            })
+        db.session.execute(FoodItem.__table__.insert(), rows)
+        db.session.commit()
+        inserted += count
+        print(f"   ... {inserted} alimentos", end='\r')
+    db.session.execute(text("INSERT INTO food_item_fts(food_item_fts) VALUES ('optimize')"))
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=500000, help='Tamanho do catálogo')
+    parser.add_argument('--requests', type=int, default=20, help='Requisições por busca')
+    args = parser.parse_args()
+
+    app.config['TESTING'] = True
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            populate(args.items)
+
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = '1'
+                session['_fresh'] = True
+
+            print(f"🔎 Benchmark da busca ({args.items} alimentos)")
+            print(f"{'busca':>16} {'resultados':>11} {'mediana (ms)':>14} {'p95 (ms)':>10}")
+            for query in QUERIES:
+                url = f'/api/food/search?q={query}'
+                results = len(client.get(url).get_json())  # aquecimento
+                timings = []
+                for _ in range(args.requests):
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    assert response.status_code == 200
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                print(f"{query:>16} {results:>11} {statistics.median(timings):>14.2f} {p95:>10.2f}")
+
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concorrência no SQLite: escritores em /api/entry e leitores em /dashboard.
+
+Cada thread usa seu próprio cliente (e sua própria conexão do pool), como as
+threads de um worker do gunicorn. Mede vazão, latência e erros de lock com os
+pragmas de produção (WAL, busy_timeout, synchronous=NORMAL) e, com
+--no-pragmas, no modo padrão do SQLite (journal rollback, sem espera por lock).
+
+Execute: python scripts/benchmark_sqlite_concurrency.py [--writers 8] [--readers 8] [--requests 50] [--no-pragmas]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calorie_tracker import create_app, db  # noqa: E402
+from calorie_tracker.models import User, FoodItem  # noqa: E402
+from calorie_tracker.summaries import find_summary_mismatches  # noqa: E402
+
+NO_PRAGMAS = {'SQLITE_JOURNAL_MODE': None, 'SQLITE_SYNCHRONOUS': None, 'SQLITE_BUSY_TIMEOUT': None,
+              'SQLITE_MMAP_SIZE': None, 'SQLITE_CACHE_SIZE': None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--writers', type=int, default=8, help='Threads gravando entradas')
+    parser.add_argument('--readers', type=int, default=8, help='Threads lendo o dashboard')
+    parser.add_argument('--requests', type=int, default=50, help='Requisições por thread')
+    parser.add_argument('--no-pragmas', action='store_true', help='Desativa os pragmas de concorrência')
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    config = {'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'}
+    if args.no_pragmas:
+        config.update(NO_PRAGMAS)
+    app = create_app(config)
+
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com', password_hash='-')
+        food = FoodItem(name='Arroz', calories=130, protein=2.7, carbs=28, fat=0.3)
+        db.session.add_all([user, food])
+        db.session.commit()
+        user_id, food_id = user.id, food.id
+
+    latencies = {'write': [], 'read': []}
+    errors = []
+    lock = threading.Lock()
+
+    def worker(kind):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            try:
+                if kind == 'write':
+                    response = client.post('/api/entry', json={'food_item_id': food_id, 'quantity': 1})
+                    error = None if response.status_code == 201 else f'HTTP {response.status_code}'
+                else:
+                    response = client.get('/dashboard')
+                    error = None if response.status_code == 200 else f'HTTP {response.status_code}'
+            except Exception as e:
+                error = str(e)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if error is None:
+                    latencies[kind].append(elapsed)
+                else:
+                    errors.append(f'{kind}: {error}')
+
+    threads = ([threading.Thread(target=worker, args=('write',)) for _ in range(args.writers)]
+               + [threading.Thread(target=worker, args=('read',)) for _ in range(args.readers)])
+    try:
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        total = time.perf_counter() - start
+        with app.app_context():
+            mismatches = len(find_summary_mismatches())
+            db.engine.dispose()
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+    mode = 'padrão do SQLite' if args.no_pragmas else 'WAL + busy_timeout'
+    print(f"🗄️  Concorrência SQLite ({mode}): {args.writers} escritores, {args.readers} leitores, "
+          f"{args.requests} requisições cada")
+    print(f"{'operação':>10} {'ok':>6} {'mediana (ms)':>14} {'p95 (ms)':>10}")
+    for kind, label in (('write', 'escrita'), ('read', 'leitura')):
+        timings = latencies[kind]
+        if len(timings) >= 2:
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            print(f"{label:>10} {len(timings):>6} {statistics.median(timings):>14.2f} {p95:>10.2f}")
+        else:
+            print(f"{label:>10} {len(timings):>6} {'-':>14} {'-':>10}")
+    completed = sum(len(timings) for timings in latencies.values())
+    print(f"Vazão: {completed / total:.0f} req/s | erros: {len(errors)} | resumos inconsistentes: {mismatches}")
+    for error in sorted(set(errors))[:5]:
+        print(f"  {error}")
+
+
+if __name__ == '__main__':
+    main()
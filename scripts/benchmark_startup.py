@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark do tempo de inicialização: import a frio e primeira requisição.
+
+Cada medição roda em um processo Python novo (sem módulos em cache), contra um
+banco SQLite temporário já com o schema criado, e mede:
+  - bibliotecas: import de Flask, SQLAlchemy, Alembic etc. (igual para qualquer layout);
+  - import: o restante de `import app` (criação do app, extensões, rotas e
+    qualquer acesso ao banco feito no import);
+  - primeira requisição: GET /login logo após o import (templates, sessão etc.).
+
+Execute: python scripts/benchmark_startup.py [--runs 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+import flask, flask_sqlalchemy, flask_migrate, flask_login, flask_wtf, wtforms
+libraries = time.perf_counter()
+import app as module
+imported = time.perf_counter()
+client = module.app.test_client()
+response = client.get('/login')
+assert response.status_code == 200, response.status_code
+done = time.perf_counter()
+print(json.dumps({'libraries': (libraries - start) * 1000, 'import': (imported - libraries) * 1000,
+                  'first_request': (done - imported) * 1000}))
+"""
+
+
+def run_child(env):
+    output = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, env=env,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20, help='Processos medidos')
+    args = parser.parse_args()
+
+    # Usa um banco temporário para não afetar o calories.db de desenvolvimento
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}')
+    try:
+        # Cria o schema antes das medições (equivale a `flask init-db`)
+        subprocess.run([sys.executable, '-c',
+                        'from app import app, db\nwith app.app_context(): db.create_all()'],
+                       cwd=ROOT, env=env, check=True)
+        run_child(env)  # aquecimento do cache de bytecode
+        samples = [run_child(env) for _ in range(args.runs)]
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
+
+    print(f"🚀 Inicialização ({args.runs} processos)")
+    print(f"{'etapa':>20} {'mediana (ms)':>14} {'p95 (ms)':>10}")
+    for key, label in (('libraries', 'bibliotecas'), ('import', 'import app'),
+                       ('first_request', 'primeira requisição')):
+        timings = [sample[key] for sample in samples]
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(f"{label:>20} {statistics.median(timings):>14.2f} {p95:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
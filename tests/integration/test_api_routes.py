@@ -1,6 +1,7 @@
 import json
 import pytest
-from app import db, User, FoodItem, FoodEntry
+from calorie_tracker import db
+from calorie_tracker.models import User, FoodItem, FoodEntry
 from datetime import datetime, timedelta
 
 def test_get_foods(test_client, auth_client):
@@ -16,6 +17,196 @@ def test_get_foods(test_client, auth_client):
     assert 'name' in data[0]
     assert 'calories' in data[0]
 
+def test_get_foods_keyset_pagination(test_client, auth_client, test_user):
+    """
+    Testa a paginação por cursor (limit/after) da rota GET /api/food
+    """
+    db.session.add_all([
+        FoodItem(name=f'Paginado {i}', calories=10 + i, is_public=True)
+        for i in range(5)
+    ])
+    db.session.commit()
+    expected_ids = [f.id for f in FoodItem.query.filter(
+        (FoodItem.is_public == True) | (FoodItem.user_id == test_user.id)
+    ).order_by(FoodItem.id).all()]
+
+    seen_ids = []
+    after = None
+    while True:
+        url = '/api/food?limit=2' + (f'&after={after}' if after else '')
+        response = auth_client.get(url)
+        assert response.status_code == 200
+        page = response.get_json()
+        assert len(page) <= 2
+        seen_ids.extend(item['id'] for item in page)
+        after = response.headers.get('X-Next-Cursor')
+        if after is None:
+            assert 'Link' not in response.headers
+            break
+        assert 'rel="next"' in response.headers['Link']
+        assert int(after) == page[-1]['id']
+
+    assert seen_ids == expected_ids
+
+def test_get_foods_fields_projection(test_client, auth_client):
+    """
+    Testa a seleção de campos (fields=) e a validação de parâmetros de GET /api/food
+    """
+    response = auth_client.get('/api/food?fields=id,name,calories&limit=1')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert set(data[0].keys()) == {'id', 'name', 'calories'}
+    assert 'fields=id,name,calories' in response.headers['Link']
+
+    response = auth_client.get('/api/food?fields=name,password_hash')
+    assert response.status_code == 400
+    assert 'password_hash' in response.get_json()['error']
+
+    assert auth_client.get('/api/food?limit=abc').status_code == 400
+    assert auth_client.get('/api/food?limit=0').status_code == 400
+
+def test_get_foods_conditional_get(test_client, auth_client, test_user, query_counter):
+    """
+    Testa o ETag de GET /api/food: 304 sem consultar o banco até o catálogo mudar
+    """
+    response = auth_client.get('/api/food?limit=5')
+    etag = response.headers['ETag']
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    assert auth_client.get('/api/food?limit=6').headers['ETag'] != etag
+
+    query_counter.clear()
+    response = auth_client.get('/api/food?limit=5', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    assert not [s for s in query_counter if 'food_item' in s]
+
+    # Um novo alimento (POST) troca a versão do catálogo
+    auth_client.post('/api/food', json={'name': 'Cuscuz', 'calories': 110})
+    response = auth_client.get('/api/food?limit=5', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    # ...assim como editar um alimento público fora da API
+    food = FoodItem.query.filter_by(name='Cuscuz').first()
+    food.calories = 112
+    db.session.commit()
+    assert auth_client.get('/api/food?limit=5', headers={'If-None-Match': etag}).status_code == 200
+
+def test_get_foods_compression(test_app, auth_client, test_user, monkeypatch):
+    """
+    Testa a compressão gzip de respostas grandes e o ETag fraco do corpo comprimido
+    """
+    import gzip
+
+    monkeypatch.setitem(test_app.config, 'COMPRESS_MIN_SIZE', 200)
+    plain = auth_client.get('/api/food?limit=100')
+    assert len(plain.data) >= 200
+    response = auth_client.get('/api/food?limit=100', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == plain.data
+    assert response.headers['ETag'] == f'W/{plain.headers["ETag"]}'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    # O ETag fraco também serve para o GET condicional
+    response = auth_client.get('/api/food?limit=100', headers={'Accept-Encoding': 'gzip',
+                                                               'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+    # Páginas HTML (com token CSRF) nunca são comprimidas
+    response = auth_client.get('/dashboard', headers={'Accept-Encoding': 'gzip'})
+    assert len(response.data) > 200
+    assert 'Content-Encoding' not in response.headers
+
+    # Respostas pequenas e a exportação em streaming não são comprimidas
+    response = auth_client.get('/api/food?limit=1', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    response = auth_client.get('/api/export?format=csv', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+def test_dashboard_today_conditional_get(test_client, auth_client, test_user):
+    """
+    Testa o ETag de GET /api/dashboard/today, trocado a cada entrada do dia
+    """
+    etag = auth_client.get('/api/dashboard/today').headers['ETag']
+    assert auth_client.get('/api/dashboard/today', headers={'If-None-Match': etag}).status_code == 304
+
+    food = FoodItem.query.first()
+    auth_client.post('/api/entry', json={'food_item_id': food.id, 'quantity': 1})
+    response = auth_client.get('/api/dashboard/today', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_no_etag_with_unshared_cache(auth_client, test_app, monkeypatch):
+    """
+    Testa que, com cache em memória e vários processos, a API não envia ETag nem responde 304
+    """
+    etag = auth_client.get('/api/dashboard/today').headers['ETag']
+    monkeypatch.setitem(test_app.config, 'WEB_CONCURRENCY', 2)
+
+    for path in ('/api/dashboard/today', '/api/food'):
+        response = auth_client.get(path, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers
+        assert response.headers['Cache-Control'] == 'private, no-cache'
+
+@pytest.mark.sqlite_only
+def test_search_foods(test_client, auth_client, test_user):
+    """
+    Testa a busca textual GET /api/food/search (prefixo, acentos e visibilidade)
+    """
+    other_user = User(username='searchother', email='searchother@example.com')
+    other_user.set_password('secret')
+    db.session.add(other_user)
+    db.session.flush()
+    db.session.add_all([
+        FoodItem(name='Feijão Preto Busca', calories=127, is_public=True),
+        FoodItem(name='Feijoada Privada', calories=300, is_public=False, user_id=test_user.id),
+        FoodItem(name='Feijão Secreto', calories=100, is_public=False, user_id=other_user.id)
+    ])
+    db.session.commit()
+
+    # Sem acento e por prefixo
+    response = auth_client.get('/api/food/search?q=maca')
+    assert response.status_code == 200
+    assert 'Maçã' in [item['name'] for item in response.get_json()]
+
+    response = auth_client.get('/api/food/search?q=feij')
+    names = [item['name'] for item in response.get_json()]
+    assert 'Feijão Preto Busca' in names
+    assert 'Feijoada Privada' in names
+    assert 'Feijão Secreto' not in names
+
+    response = auth_client.get('/api/food/search?q=FEIJAO pre')
+    assert [item['name'] for item in response.get_json()] == ['Feijão Preto Busca']
+
+    # Alterações de nome são refletidas no índice (triggers)
+    food = FoodItem.query.filter_by(name='Feijoada Privada').first()
+    food.name = 'Moqueca Privada'
+    db.session.commit()
+    response = auth_client.get('/api/food/search?q=moqueca')
+    assert [item['id'] for item in response.get_json()] == [food.id]
+    response = auth_client.get('/api/food/search?q=feijoada')
+    assert response.get_json() == []
+
+    assert auth_client.get('/api/food/search?q=').status_code == 400
+    assert auth_client.get('/api/food/search?q=*"').status_code == 400
+
+@pytest.mark.sqlite_only
+def test_search_ranks_all_matches(auth_client):
+    """
+    Testa que o melhor resultado (bm25) aparece mesmo depois de centenas de matches mais antigos
+    (abaixo de FOOD_SEARCH_RANK_CANDIDATES, todos os matches são ordenados)
+    """
+    db.session.execute(FoodItem.__table__.insert(), [
+        {'name': f'Macarrão com molho de tomate e maçã ralada {i}', 'calories': 200, 'is_public': True}
+        for i in range(300)
+    ])
+    db.session.add(FoodItem(name='Maçã Fuji', calories=52, is_public=True))
+    db.session.commit()
+
+    response = auth_client.get('/api/food/search?q=maçã&limit=5')
+    assert 'Maçã Fuji' in [item['name'] for item in response.get_json()]
+
 def test_add_food_entry(test_client, auth_client, test_user):
     """
     Testa a rota POST /api/entry
@@ -50,6 +241,32 @@ def test_add_food_entry(test_client, auth_client, test_user):
     assert entry.quantity == 2
     assert entry.date == datetime.utcnow().date()
 
+def test_add_entry_returns_dashboard_update(test_client, auth_client, test_user, query_counter):
+    """
+    Testa que POST /api/entry devolve a nova linha e os totais do dia,
+    iguais aos de GET /api/dashboard/today
+    """
+    food = FoodItem.query.filter_by(name='Frango Grelhado').first()
+    before = auth_client.get('/api/dashboard/today').get_json()
+
+    query_counter.clear()
+    response = auth_client.post('/api/entry', json={'food_item_id': food.id, 'quantity': 2})
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data['entry'] == {'id': data['id'], 'food_item_id': food.id, 'name': 'Frango Grelhado',
+                             'quantity': 2.0, 'calories': 330.0, 'protein': 62.0, 'carbs': 0.0, 'fat': 7.2}
+    assert data['totals']['calories'] == round(before['totals']['calories'] + 330, 1)
+    # Uma inserção na food_entry, sem reler as entradas do dia
+    assert len([s for s in query_counter if s.startswith('INSERT INTO food_entry')]) == 1
+    assert not [s for s in query_counter if s.startswith('SELECT') and 'FROM food_entry' in s]
+
+    after = auth_client.get('/api/dashboard/today').get_json()
+    assert after['entries'][-1] == data['entry']
+    for key in ('date', 'totals', 'goal', 'remaining'):
+        assert after[key] == data[key]
+    assert after['date'] == datetime.utcnow().date().isoformat()
+    assert after['remaining'] == round(max(0, test_user.daily_calorie_goal - after['totals']['calories']), 1)
+
 def test_add_food_entry_invalid_data(test_client, auth_client):
     """
     Testa a rota POST /api/entry com dados inválidos
@@ -81,6 +298,59 @@ def test_add_food_entry_invalid_data(test_client, auth_client):
     
     assert response.status_code in [400, 404, 500]  # Pode retornar diferentes códigos dependendo da validação
 
+def test_add_entries_batch(test_client, auth_client, test_user, query_counter):
+    """
+    Testa a rota POST /api/entries/batch com itens válidos e inválidos
+    """
+    other_user = User(username='batchother', email='batchother@example.com')
+    other_user.set_password('secret')
+    db.session.add(other_user)
+    db.session.flush()
+    private_food = FoodItem(name='Privado Lote', calories=10, is_public=False, user_id=other_user.id)
+    public_food = FoodItem(name='Público Lote', calories=100, protein=1, carbs=2, fat=3, is_public=True)
+    db.session.add_all([private_food, public_food])
+    db.session.commit()
+    public_id, private_id = public_food.id, private_food.id
+    today = datetime.utcnow().date()
+    calories_before = test_user.get_calories_today()
+
+    query_counter.clear()
+    response = auth_client.post('/api/entries/batch', json=[
+        {'food_item_id': public_id, 'quantity': 2},
+        {'food_item_id': public_id},
+        {'food_item_id': 99999},
+        {'food_item_id': private_id},
+        {'quantity': 1},
+        {'food_item_id': public_id, 'quantity': 0}
+    ])
+
+    assert response.status_code == 207
+    data = response.get_json()
+    assert data['created'] == 2
+    assert data['failed'] == 4
+    assert [r['status'] for r in data['results']] == [201, 201, 404, 403, 400, 400]
+
+    # Uma única query IN para os alimentos e um único INSERT em lote
+    food_selects = [s for s in query_counter if s.startswith('SELECT') and 'FROM food_item' in s]
+    entry_inserts = [s for s in query_counter if s.startswith('INSERT INTO food_entry')]
+    assert len(food_selects) == 1
+    assert len(entry_inserts) == 1
+
+    entry = db.session.get(FoodEntry, data['results'][0]['id'])
+    assert entry.user_id == test_user.id
+    assert entry.quantity == 2
+    assert entry.date == today
+    assert test_user.get_calories_today() == calories_before + 300
+
+    response = auth_client.post('/api/entries/batch', json={
+        'entries': [{'food_item_id': public_id, 'quantity': 1}]
+    })
+    assert response.status_code == 201
+
+    response = auth_client.post('/api/entries/batch', json=[{'food_item_id': 99999}])
+    assert response.status_code == 400
+    assert auth_client.post('/api/entries/batch', json=[]).status_code == 400
+
 def test_unauthorized_access(test_app):
     """
     Testa o acesso não autorizado às rotas da API
@@ -0,0 +1,132 @@
+import re
+import pytest
+from starlette.testclient import TestClient
+from calorie_tracker import db
+from calorie_tracker.asgi import create_asgi_app
+from calorie_tracker.models import FoodItem
+from calorie_tracker.summaries import find_summary_mismatches
+
+
+@pytest.fixture(scope='module')
+def asgi_app(test_app):
+    # Mesmo app Flask (e mesmo banco) dos testes síncronos, servido pela camada ASGI
+    return create_asgi_app(test_app)
+
+@pytest.fixture(scope='module')
+def asgi_client(asgi_app, test_app, test_user):
+    with TestClient(asgi_app) as client:
+        # Cookie de sessão igual ao que o login do Flask-Login grava
+        serializer = test_app.session_interface.get_signing_serializer(test_app)
+        client.cookies.set(test_app.config['SESSION_COOKIE_NAME'],
+                           serializer.dumps({'_user_id': str(test_user.id), '_fresh': True}))
+        yield client
+
+def test_asgi_requires_authentication(asgi_app):
+    """
+    Testa o 401 em JSON sem sessão, como o unauthorized_handler
+    """
+    anonymous = TestClient(asgi_app)
+    for method, path in (('GET', '/api/food'), ('POST', '/api/entry'), ('GET', '/api/dashboard/today')):
+        response = anonymous.request(method, path)
+        assert response.status_code == 401
+        assert response.json() == {'error': 'Authentication required'}
+
+def test_asgi_food_list_matches_sync(test_app, asgi_client, test_user, logged_client, monkeypatch):
+    """
+    Testa que GET /api/food tem o mesmo corpo e cabeçalhos de paginação da view síncrona
+    """
+    sync_client = logged_client(test_app, test_user.id)
+
+    for query in ('', '?limit=1', '?limit=1&fields=name,calories', '?limit=abc', '?fields=password_hash'):
+        with test_app.app_context():
+            expected = sync_client.get(f'/api/food{query}')
+        response = asgi_client.get(f'/api/food{query}')
+
+        assert response.status_code == expected.status_code
+        assert response.json() == expected.get_json()
+        for header in ('X-Next-Cursor', 'Link', 'ETag'):
+            assert response.headers.get(header) == expected.headers.get(header)
+
+    etag = asgi_client.get('/api/food').headers['ETag']
+    assert asgi_client.get('/api/food', headers={'If-None-Match': etag}).status_code == 304
+
+    # Cache em memória com vários processos: sem ETag, como na view síncrona
+    monkeypatch.setitem(test_app.config, 'WEB_CONCURRENCY', 2)
+    response = asgi_client.get('/api/food', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+
+def test_asgi_add_entry_updates_dashboard(test_app, asgi_client):
+    """
+    Testa POST /api/entry assíncrono: grava, mantém DailySummary e aparece no dashboard
+    """
+    with test_app.app_context():
+        food_id = FoodItem.query.filter_by(name='Frango Grelhado').first().id
+
+    before = asgi_client.get('/api/dashboard/today').json()
+    response = asgi_client.post('/api/entry', json={'food_item_id': food_id, 'quantity': 2})
+    assert response.status_code == 201
+    entry_id = response.json()['id']
+
+    after = asgi_client.get('/api/dashboard/today').json()
+    # A resposta do POST já traz a linha e os totais que o dashboard passa a mostrar
+    assert response.json()['entry'] == after['entries'][-1]
+    assert response.json()['totals'] == after['totals']
+    assert after['totals']['calories'] == round(before['totals']['calories'] + 330, 1)
+    assert after['entries'][-1] == {'id': entry_id, 'food_item_id': food_id, 'name': 'Frango Grelhado',
+                                    'quantity': 2.0, 'calories': 330.0, 'protein': 62.0,
+                                    'carbs': 0.0, 'fat': 7.2}
+    assert after['remaining'] == round(max(0, after['goal'] - after['totals']['calories']), 1)
+
+    assert asgi_client.post('/api/entry', json={'food_item_id': food_id, 'quantity': 0}).status_code == 400
+    assert asgi_client.post('/api/entry', json={'food_item_id': 999999}).status_code == 404
+    with test_app.app_context():
+        db.session.expire_all()
+        assert find_summary_mismatches() == []
+
+def test_asgi_create_food(asgi_client):
+    """
+    Testa POST /api/food assíncrono
+    """
+    response = asgi_client.post('/api/food', json={'name': 'Tapioca Async', 'calories': 130})
+    assert response.status_code == 201
+    assert response.json()['message'] == 'Food item added'
+
+    response = asgi_client.post('/api/food', json={'name': 'Sem calorias'})
+    assert response.status_code == 400
+    assert response.json() == {'error': 'Name and calories are required'}
+
+def test_asgi_falls_back_to_flask(asgi_client):
+    """
+    Testa que as demais rotas seguem para o app Flask
+    """
+    assert asgi_client.get('/healthz').json() == {'status': 'ok'}
+    assert asgi_client.get('/login').status_code == 200
+
+def test_asgi_bearer_token(asgi_app, test_app, test_user):
+    """
+    Testa que a camada ASGI aceita o token Bearer de POST /api/token
+    """
+    from calorie_tracker.tokens import issue_token
+
+    with test_app.app_context():
+        token = issue_token(test_user)
+    client = TestClient(asgi_app)
+    response = client.get('/api/dashboard/today', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    assert response.json()['goal'] == test_user.daily_calorie_goal
+    assert client.get('/api/dashboard/today', headers={'Authorization': 'Bearer x'}).status_code == 401
+
+def test_asgi_server_timing(asgi_client, test_app, monkeypatch):
+    """
+    Testa o Server-Timing e as estatísticas por endpoint na camada ASGI
+    """
+    assert re.fullmatch(r'app;dur=[\d.]+', asgi_client.get('/api/dashboard/today').headers['Server-Timing'])
+
+    monkeypatch.setitem(test_app.config, 'SERVER_TIMING_DETAIL', True)
+    response = asgi_client.get('/api/dashboard/today')
+
+    assert response.status_code == 200
+    assert re.fullmatch(r'app;dur=[\d.]+, db;dur=[\d.]+;desc="[1-9]\d* queries"',
+                        response.headers['Server-Timing'])
+    assert test_app.extensions['request_stats'].snapshot()['api.dashboard_today']['requests'] >= 1
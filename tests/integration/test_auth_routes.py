@@ -1,5 +1,9 @@
+import threading
 import pytest
-from app import User, db
+from werkzeug.security import generate_password_hash
+from calorie_tracker import create_app, db
+from calorie_tracker.models import User
+from calorie_tracker.security import password_needs_rehash, _password_pool
 
 def test_register_route(test_client):
     """
@@ -103,3 +107,204 @@ def test_logout_route(test_client, auth_client):
     response = auth_client.get('/dashboard', follow_redirects=False)
     # Deve redirecionar (302) ou mostrar mensagem de erro
     assert response.status_code in [302, 401, 403]
+
+def test_login_rehashes_outdated_password(test_app):
+    """
+    Testa que o login refaz hashes gerados com um custo diferente do configurado
+    """
+    user = User(username='legacyuser', email='legacy@example.com',
+                password_hash=generate_password_hash('legacy123', method='pbkdf2:sha256:2'))
+    db.session.add(user)
+    db.session.commit()
+    
+    # Contexto próprio: o g do contexto do módulo pode guardar o usuário de outro teste
+    with test_app.app_context():
+        client = test_app.test_client()
+        response = client.post('/login', data={'username': 'legacyuser', 'password': 'legacy123'})
+    assert response.status_code == 302
+    
+    db.session.refresh(user)
+    assert user.password_hash.startswith(test_app.config['PASSWORD_HASH_METHOD'] + '$')
+    assert not password_needs_rehash(user.password_hash)
+    assert user.check_password('legacy123') is True
+
+def test_login_busy_when_password_pool_full(test_app):
+    """
+    Testa que o login responde 503 quando não há vaga para verificar a senha
+    """
+    test_app.config['PASSWORD_HASH_QUEUE_TIMEOUT'] = 0.01
+    _, slots = _password_pool()
+    held = 0
+    while slots.acquire(blocking=False):
+        held += 1
+    try:
+        with test_app.app_context():
+            client = test_app.test_client()
+            response = client.post('/login', data={'username': 'testuser', 'password': 'test123'})
+        assert response.status_code == 503
+    finally:
+        for _ in range(held):
+            slots.release()
+        test_app.config['PASSWORD_HASH_QUEUE_TIMEOUT'] = 5
+
+def test_password_pool_created_once_under_concurrency(tmp_path):
+    """
+    Testa que chamadas simultâneas a _password_pool recebem o mesmo pool
+    """
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/pool.db',
+    })
+    barrier = threading.Barrier(8)
+    pools = []
+
+    def first_call():
+        with app.app_context():
+            barrier.wait()
+            pools.append(_password_pool())
+
+    threads = [threading.Thread(target=first_call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(pools) == 8
+    assert all(pool is pools[0] for pool in pools)
+
+def test_bench_login_command_writes_recommendation(test_app, tmp_path, monkeypatch):
+    """
+    Testa que o bench-login recomenda o maior custo dentro da meta e grava em instance/config.py
+    """
+    monkeypatch.setattr(test_app, 'instance_path', str(tmp_path))
+    runner = test_app.test_cli_runner()
+    result = runner.invoke(args=['bench-login', '--costs', '1,2', '--samples', '2',
+                                 '--target-ms', '10000', '--write'])
+    
+    assert result.exit_code == 0, result.output
+    assert "PASSWORD_HASH_METHOD = 'pbkdf2:sha256:2'" in result.output
+    assert (tmp_path / 'config.py').read_text() == "PASSWORD_HASH_METHOD = 'pbkdf2:sha256:2'\n"
+    # O usuário temporário do benchmark é removido e a política atual restaurada
+    assert User.query.filter_by(username='__bench_login__').first() is None
+    assert test_app.config['PASSWORD_HASH_METHOD'] == 'pbkdf2:sha256:1'
+
+def test_bench_login_command_with_rate_limits(tmp_path):
+    """
+    Testa que o bench-login não esbarra no limite de POST /login (todas as requisições do mesmo IP)
+    """
+    app = create_app({
+        'TESTING': True,
+        'WTF_CSRF_ENABLED': False,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/bench.db',
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1',
+        'RATE_LIMITS': {'POST auth.login': '2/minute'},
+    })
+    with app.app_context():
+        db.create_all()
+    try:
+        result = app.test_cli_runner().invoke(args=['bench-login', '--costs', '1,2', '--samples', '2',
+                                                    '--target-ms', '10000'])
+
+        assert result.exit_code == 0, result.output
+        assert 'rate_limiter' in app.extensions
+        assert app.test_client().post('/login', data={'username': 'x', 'password': 'y'}).status_code == 302
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+def test_load_user_uses_identity_cache(test_app, test_user, query_counter):
+    """
+    Testa que o user_loader reusa a identidade em cache e a descarta quando o usuário muda
+    """
+    with test_app.app_context():
+        client = test_app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(test_user.id)
+            session['_fresh'] = True
+        client.get('/api/dashboard/today')
+
+        query_counter.clear()
+        response = client.get('/api/dashboard/today')
+        assert response.status_code == 200
+        assert not [s for s in query_counter if 'FROM user' in s]
+
+        user = db.session.get(User, test_user.id)
+        goal = user.daily_calorie_goal
+        user.daily_calorie_goal = goal + 345
+        db.session.commit()
+        try:
+            assert client.get('/api/dashboard/today').get_json()['goal'] == goal + 345
+        finally:
+            user.daily_calorie_goal = goal
+            db.session.commit()
+
+def test_server_side_session(test_app, monkeypatch):
+    """
+    Testa as sessões no servidor (SESSION_BACKEND='cache'): cookie só com o id, trocado no login
+    """
+    from calorie_tracker.cache import get_cache
+    from calorie_tracker.sessions import CacheSessionInterface, get_session_store
+    from calorie_tracker.summaries import rebuild_daily_summaries
+
+    monkeypatch.setattr(test_app, 'session_interface', CacheSessionInterface())
+    cookie_name = test_app.config['SESSION_COOKIE_NAME']
+    with test_app.app_context():
+        client = test_app.test_client()
+        with client.session_transaction() as session:
+            session['lang'] = 'pt'
+        anonymous_sid = test_app.session_interface.load(test_app, client.get_cookie(cookie_name).value)[0]
+
+        response = client.post('/login', data={'username': 'testuser', 'password': 'test123'})
+        assert response.status_code == 302
+        cookie = client.get_cookie(cookie_name).value
+        sid, data = test_app.session_interface.load(test_app, cookie)
+        # Novo id no login; a sessão anônima é apagada
+        assert sid != anonymous_sid
+        assert get_session_store(test_app).get(anonymous_sid) is None
+        assert data['lang'] == 'pt' and data['_user_id']
+        assert len(cookie) < 120
+        assert client.get('/api/food').status_code == 200
+
+        # Limpar o cache dos totais (rebuild-summaries, drop_all) não desloga ninguém
+        rebuild_daily_summaries()
+        get_cache().clear()
+        assert client.get('/api/food').status_code == 200
+
+        client.get('/logout')
+        assert client.get('/api/food').status_code == 401
+
+def test_api_token(test_app, test_user, query_counter, monkeypatch):
+    """
+    Testa POST /api/token e o acesso à API com Authorization: Bearer, sem cookies
+    """
+    with test_app.app_context():
+        client = test_app.test_client()
+        assert client.post('/api/token', json={'username': 'testuser'}).status_code == 400
+        response = client.post('/api/token', json={'username': 'testuser', 'password': 'errada'})
+        assert response.status_code == 401
+
+        response = client.post('/api/token', json={'username': 'testuser', 'password': 'test123'})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['token_type'] == 'Bearer'
+        assert data['expires_in'] == test_app.config['API_TOKEN_MAX_AGE']
+
+    headers = {'Authorization': f"Bearer {data['access_token']}"}
+    with test_app.app_context():
+        client = test_app.test_client(use_cookies=False)
+        response = client.get('/api/food', headers=headers)
+        assert response.status_code == 200
+        assert 'Set-Cookie' not in response.headers
+
+    # Com a identidade em cache, validar o token não consulta o banco
+    query_counter.clear()
+    with test_app.app_context():
+        assert client.get('/api/food?limit=1', headers=headers).status_code == 200
+    assert not [s for s in query_counter if 'FROM user' in s]
+
+    with test_app.app_context():
+        tampered = {'Authorization': f"Bearer {data['access_token'][:-2]}xx"}
+        assert client.get('/api/food', headers=tampered).status_code == 401
+        assert client.get('/api/food', headers={'Authorization': 'Basic abc'}).status_code == 401
+        monkeypatch.setitem(test_app.config, 'API_TOKEN_MAX_AGE', -1)
+        assert client.get('/api/food', headers=headers).status_code == 401
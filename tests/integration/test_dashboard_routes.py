@@ -1,5 +1,9 @@
+import json
+import logging
+import re
 import pytest
-from app import FoodEntry, FoodItem, db
+from calorie_tracker import db
+from calorie_tracker.models import FoodEntry, FoodItem
 from datetime import datetime, timedelta
 
 def test_dashboard_route(auth_client, test_user, test_app):
@@ -154,3 +158,174 @@ def test_dashboard_calculations(auth_client, test_user, test_app):
     # Verifica a barra de progresso de calorias
     progress_percent = min(int((total_calories / test_user.daily_calorie_goal) * 100), 100)
     assert f'width: {progress_percent}%'.encode() in response.data
+
+def test_dashboard_query_count_is_constant(auth_client, test_user, test_app, query_counter):
+    """
+    Testa que o dashboard executa um número fixo de queries,
+    independente da quantidade de entradas do dia (sem N+1)
+    """
+    def count_dashboard_queries():
+        query_counter.clear()
+        response = auth_client.get('/dashboard')
+        assert response.status_code == 200
+        return [s for s in query_counter if 'food_entry' in s or 'daily_summary' in s]
+
+    with test_app.app_context():
+        food = FoodItem.query.first()
+        food_id = food.id
+        today = datetime.utcnow().date()
+        db.session.add_all([
+            FoodEntry(user_id=test_user.id, food_item_id=food_id, quantity=1, date=today)
+            for _ in range(2)
+        ])
+        db.session.commit()
+
+    few_entries = count_dashboard_queries()
+
+    with test_app.app_context():
+        db.session.add_all([
+            FoodEntry(user_id=test_user.id, food_item_id=food_id, quantity=1, date=today)
+            for _ in range(40)
+        ])
+        db.session.commit()
+
+    many_entries = count_dashboard_queries()
+
+    # Uma query para a lista de entradas (com JOIN) e uma para os totais
+    assert len(few_entries) <= 2
+    assert len(many_entries) == len(few_entries)
+    # Nenhum SELECT isolado em food_item (lazy load)
+    assert not [s for s in query_counter if 'food_entry' not in s and 'FROM food_item' in s]
+
+def test_dashboard_totals_cache(auth_client, test_user, test_app, query_counter, monkeypatch):
+    """
+    Testa que os totais do dashboard vêm do cache e são invalidados por add_entry()
+    """
+    import json
+    from calorie_tracker.cache import get_cache
+
+    cache = get_cache()
+    cache.clear()
+
+    auth_client.get('/dashboard')
+    hits = cache.stats()['hits']
+    query_counter.clear()
+    response = auth_client.get('/dashboard')
+    assert response.status_code == 200
+    # Segunda visita: versão do dia e totais lidos do cache, sem consultar daily_summary
+    assert cache.stats()['hits'] == hits + 2
+    assert not [s for s in query_counter if 'daily_summary' in s]
+
+    with test_app.app_context():
+        food = FoodItem.query.first()
+        food_id, food_calories = food.id, food.calories
+    calories_before = test_user.get_calories_today()
+
+    misses = cache.stats()['misses']
+    response = auth_client.post(
+        '/api/entry',
+        data=json.dumps({'food_item_id': food_id, 'quantity': 1}),
+        content_type='application/json'
+    )
+    assert response.status_code == 201
+
+    # A escrita invalida a chave; a própria resposta já traz o novo total
+    assert cache.stats()['misses'] == misses + 1
+    assert response.get_json()['totals']['calories'] == round(calories_before + food_calories, 1)
+    # ...e a próxima leitura vem do cache
+    hits = cache.stats()['hits']
+    assert test_user.get_calories_today() == calories_before + food_calories
+    assert cache.stats()['hits'] == hits + 2
+
+    # /metrics/cache só responde com METRICS_ENABLED
+    assert auth_client.get('/metrics/cache').status_code == 404
+    monkeypatch.setitem(test_app.config, 'METRICS_ENABLED', True)
+    stats = auth_client.get('/metrics/cache').get_json()
+    assert stats['backend'] == 'memory'
+    assert stats['hits'] >= 1
+
+def test_stale_totals_set_after_invalidation(auth_client, test_user, test_app):
+    """
+    Testa que um total lido antes de uma escrita e gravado no cache depois dela não é servido
+    """
+    from calorie_tracker.cache import get_cache
+    from calorie_tracker.summaries import get_nutrition_totals, totals_key
+
+    with test_app.app_context():
+        today = datetime.utcnow().date()
+        food = FoodItem.query.first()
+        # Leitor lento: pega a chave e lê o resumo antes da escrita...
+        stale_key = totals_key(test_user.id, today)
+        stale = get_nutrition_totals(test_user.id, today)
+        db.session.add(FoodEntry(user_id=test_user.id, food_item_id=food.id, quantity=1, date=today))
+        db.session.commit()
+        # ...e grava no cache depois do commit
+        get_cache().set(stale_key, stale)
+
+        totals = get_nutrition_totals(test_user.id, today)
+        assert totals['calories'] == stale['calories'] + food.calories
+
+def test_dashboard_totals_not_cached_across_workers(auth_client, test_app, monkeypatch, query_counter):
+    """
+    Testa que, com vários processos e cache em memória, os totais são sempre lidos de daily_summary
+    """
+    from calorie_tracker.cache import get_cache
+
+    monkeypatch.setitem(test_app.config, 'WEB_CONCURRENCY', 2)
+    cache = get_cache()
+    cache.clear()
+
+    for _ in range(2):
+        query_counter.clear()
+        assert auth_client.get('/dashboard').status_code == 200
+        assert [s for s in query_counter if 'daily_summary' in s]
+    assert cache.stats()['size'] == 0
+
+def test_server_timing_and_request_metrics(auth_client, test_app, query_counter, monkeypatch):
+    """
+    Testa o cabeçalho Server-Timing (tempo total, tempo no banco e nº de queries) e /metrics/requests
+    """
+    # Por padrão, só o tempo total e nenhuma estatística
+    response = auth_client.get('/dashboard')
+    assert re.fullmatch(r'app;dur=[\d.]+', response.headers['Server-Timing'])
+    assert auth_client.get('/metrics/requests').status_code == 404
+
+    monkeypatch.setitem(test_app.config, 'SERVER_TIMING_DETAIL', True)
+    monkeypatch.setitem(test_app.config, 'METRICS_ENABLED', True)
+    query_counter.clear()
+    response = auth_client.get('/dashboard')
+    queries = len(query_counter)
+
+    assert response.status_code == 200
+    match = re.fullmatch(r'app;dur=([\d.]+), db;dur=([\d.]+);desc="(\d+) queries"',
+                         response.headers['Server-Timing'])
+    assert match is not None
+    assert float(match[1]) >= float(match[2])
+    assert int(match[3]) == queries > 0
+
+    stats = auth_client.get('/metrics/requests').get_json()
+    assert stats['main.dashboard']['requests'] >= 1
+    assert stats['main.dashboard']['max_ms'] >= stats['main.dashboard']['avg_ms'] > 0
+    assert stats['main.dashboard']['avg_queries'] > 0
+
+def test_slow_request_log(auth_client, test_app, monkeypatch, caplog):
+    """
+    Testa o log estruturado (JSON, com os SQL sem parâmetros) das requisições acima de SLOW_REQUEST_MS
+    """
+    monkeypatch.setitem(test_app.config, 'SLOW_REQUEST_MS', 0.001)
+    monkeypatch.setitem(test_app.config, 'SLOW_REQUEST_MAX_STATEMENTS', 1)
+
+    with caplog.at_level(logging.WARNING, logger='calorie_tracker.slow_requests'):
+        response = auth_client.get('/api/food?limit=1')
+    records = [json.loads(record.getMessage()) for record in caplog.records
+               if record.name == 'calorie_tracker.slow_requests']
+
+    assert response.status_code == 200
+    assert len(records) == 1
+    record = records[0]
+    assert record['endpoint'] == 'api.api_food'
+    assert (record['method'], record['path'], record['status']) == ('GET', '/api/food', 200)
+    assert record['duration_ms'] >= record['db_ms']
+    assert len(record['statements']) == 1
+    assert record['statements_omitted'] == record['queries'] - 1
+    assert 'SELECT' in record['statements'][0]['sql']
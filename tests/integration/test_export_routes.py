@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+import pytest
+from calorie_tracker import db
+from calorie_tracker.models import User, FoodItem, FoodEntry
+from datetime import datetime, timedelta
+
+@pytest.fixture(scope='module')
+def export_entries(test_app):
+    # Cria um histórico conhecido para o usuário de teste e um outro usuário
+    with test_app.app_context():
+        user = User.query.filter_by(username='testuser').first()
+        other = User(username='exportother', email='exportother@example.com')
+        other.set_password('secret')
+        food = FoodItem(name='Cuscuz Export', calories=112, protein=2.5, carbs=23, fat=0.5)
+        db.session.add_all([other, food])
+        db.session.flush()
+        base = datetime.utcnow().date() - timedelta(days=400)
+        db.session.add_all([
+            FoodEntry(user_id=user.id, food_item_id=food.id, quantity=2, date=base),
+            FoodEntry(user_id=user.id, food_item_id=food.id, quantity=1, date=base + timedelta(days=30)),
+            FoodEntry(user_id=other.id, food_item_id=food.id, quantity=5, date=base)
+        ])
+        db.session.commit()
+        return base
+
+def test_export_csv(auth_client, test_user, export_entries):
+    """
+    Testa a exportação completa do diário em CSV via streaming
+    """
+    response = auth_client.get('/api/export?format=csv')
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == 'text/csv'
+    assert 'attachment' in response.headers['Content-Disposition']
+
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    expected = FoodEntry.query.filter_by(user_id=test_user.id).count()
+    assert len(rows) == expected
+    assert rows[0]['date'] == export_entries.isoformat()
+    assert rows[0]['food'] == 'Cuscuz Export'
+    assert float(rows[0]['calories']) == 224
+    assert float(rows[0]['protein']) == 5
+    # Ordenado por data
+    assert [r['date'] for r in rows] == sorted(r['date'] for r in rows)
+
+def test_export_jsonl_date_range(auth_client, export_entries):
+    """
+    Testa a exportação JSONL filtrada por intervalo de datas
+    """
+    start = export_entries + timedelta(days=1)
+    end = export_entries + timedelta(days=60)
+    response = auth_client.get(f'/api/export?format=ndjson&from={start}&to={end}')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(rows) == 1
+    assert rows[0]['date'] == (export_entries + timedelta(days=30)).isoformat()
+    assert rows[0]['quantity'] == 1
+    assert rows[0]['calories'] == 112
+
+def test_export_invalid_params(auth_client):
+    """
+    Testa a validação dos parâmetros de /api/export
+    """
+    assert auth_client.get('/api/export?format=xml').status_code == 400
+    assert auth_client.get('/api/export?from=ontem').status_code == 400
+    assert auth_client.get('/api/export?from=2025-02-01&to=2025-01-01').status_code == 400
+
+def test_export_rounds_nutrients(test_app, auth_client, test_user):
+    """
+    Testa que os nutrientes exportados saem arredondados, sem ruído de float
+    """
+    day = datetime.utcnow().date() - timedelta(days=800)
+    with test_app.app_context():
+        food = FoodItem(name='Pipoca Export', calories=31, protein=0.1, carbs=6.2, fat=0.3)
+        db.session.add(food)
+        db.session.flush()
+        db.session.add(FoodEntry(user_id=test_user.id, food_item_id=food.id, quantity=3, date=day))
+        db.session.commit()
+
+    response = auth_client.get(f'/api/export?format=csv&from={day}&to={day}')
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0]['protein'] == '0.3'
+    assert rows[0]['fat'] == '0.9'
+
+    response = auth_client.get(f'/api/export?format=ndjson&from={day}&to={day}')
+    line = response.get_data(as_text=True).strip()
+    assert '0.30000000000000004' not in line
+    assert json.loads(line)['protein'] == 0.3
@@ -0,0 +1,103 @@
+import io
+import json
+from calorie_tracker.models import FoodItem
+
+CSV_DATA = (
+    'name,calories,protein,carbs,fat\n'
+    'Tapioca Importada,130,0.2,32,0\n'
+    'Cuscuz Importado,112,2.5,23,0.6\n'
+    'Tapioca Importada,130,0.2,32,0\n'
+    ',50,1,1,1\n'
+    'Mingau Importado,abc,1,1,1\n'
+    'Maçã,52,0.3,14,0.2\n'
+)
+
+def test_import_foods_csv_upload(test_client, auth_client, test_user):
+    """
+    Testa a importação de alimentos via upload CSV em POST /api/food/import
+    """
+    response = auth_client.post(
+        '/api/food/import',
+        data={'file': (io.BytesIO(CSV_DATA.encode('utf-8')), 'foods.csv')},
+        content_type='multipart/form-data'
+    )
+
+    assert response.status_code == 201
+    stats = response.get_json()
+    assert stats['read'] == 6
+    assert stats['inserted'] == 2
+    # Tapioca repetida no arquivo e Maçã já existente no banco
+    assert stats['duplicates'] == 2
+    assert stats['invalid'] == 2
+    assert [e['line'] for e in stats['errors']] == [4, 5]
+
+    food = FoodItem.query.filter_by(name='Cuscuz Importado').one()
+    assert food.calories == 112
+    assert food.protein == 2.5
+    # Pela API, só no catálogo privado do usuário
+    assert food.user_id == test_user.id
+    assert food.is_public is False
+    assert FoodItem.query.filter_by(name='Tapioca Importada').count() == 1
+
+def test_import_foods_jsonl_body(test_client, auth_client):
+    """
+    Testa a importação JSONL enviada no corpo da requisição, em vários lotes
+    """
+    lines = [json.dumps({'name': f'Lote JSONL {i}', 'calories': i}) for i in range(25)]
+    lines.insert(3, '{not json')
+    response = auth_client.post(
+        '/api/food/import?format=jsonl',
+        data='\n'.join(lines).encode('utf-8'),
+        content_type='application/x-ndjson'
+    )
+
+    assert response.status_code == 201
+    stats = response.get_json()
+    assert stats['inserted'] == 25
+    assert stats['invalid'] == 1
+    assert FoodItem.query.filter(FoodItem.name.like('Lote JSONL %'), FoodItem.is_public == False).count() == 25
+
+    # Reimportar o mesmo arquivo não cria duplicatas
+    response = auth_client.post(
+        '/api/food/import?format=jsonl',
+        data='\n'.join(lines).encode('utf-8'),
+        content_type='application/x-ndjson'
+    )
+    assert response.status_code == 200
+    assert response.get_json()['duplicates'] == 25
+
+    assert auth_client.post('/api/food/import?format=xml', data=b'').status_code == 400
+
+def test_import_foods_limits(test_client, auth_client, test_app, monkeypatch):
+    """
+    Testa as recusas de POST /api/food/import: publicação no catálogo público e arquivo grande demais
+    """
+    body = CSV_DATA.encode('utf-8')
+    response = auth_client.post('/api/food/import?is_public=true', data=body, content_type='text/csv')
+    assert response.status_code == 403
+
+    monkeypatch.setitem(test_app.config, 'FOOD_IMPORT_MAX_BYTES', len(body) - 1)
+    response = auth_client.post('/api/food/import', data=body, content_type='text/csv')
+    assert response.status_code == 413
+    assert response.get_json() == {'error': 'File too large'}
+
+def test_import_foods_command(test_app, tmp_path):
+    """
+    Testa o comando flask import-foods com relatório de progresso
+    """
+    path = tmp_path / 'catalogo.jsonl'
+    path.write_text('\n'.join(
+        json.dumps({'name': f'Catálogo CLI {i}', 'calories': 10 * i, 'protein': 1})
+        for i in range(5)
+    ), encoding='utf-8')
+
+    runner = test_app.test_cli_runner()
+    result = runner.invoke(args=['import-foods', str(path), '--chunk-size', '2'])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.count('... ') == 3
+    assert '5 alimento(s) importado(s).' in result.output
+    with test_app.app_context():
+        foods = FoodItem.query.filter(FoodItem.name.like('Catálogo CLI %')).all()
+        assert len(foods) == 5
+        assert all(f.is_public and f.user_id is None for f in foods)
@@ -0,0 +1,97 @@
+import os
+import runpy
+from calorie_tracker import create_app
+from calorie_tracker.health import mark_draining
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_healthz(test_client):
+    """
+    Testa o liveness probe (sem autenticação e sem depender do banco)
+    """
+    response = test_client.get('/healthz')
+    
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'ok'}
+
+def test_readyz_checks_database(test_client):
+    """
+    Testa que o readiness probe consulta o banco
+    """
+    response = test_client.get('/readyz')
+    
+    assert response.status_code == 200
+    assert response.get_json()['database'] == 'ok'
+
+def test_readyz_database_unavailable(tmp_path):
+    """
+    Testa que o readiness probe responde 503 quando o banco não abre
+    """
+    app = create_app({'TESTING': True,
+                      'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/missing/dir/app.db'})
+    
+    response = app.test_client().get('/readyz')
+    
+    assert response.status_code == 503
+    assert response.get_json()['database'] == 'error'
+
+def test_readyz_draining(test_app):
+    """
+    Testa que o processo em desligamento deixa de ficar pronto
+    """
+    mark_draining(test_app)
+    try:
+        response = test_app.test_client().get('/readyz')
+        assert response.status_code == 503
+        assert response.get_json()['status'] == 'draining'
+    finally:
+        test_app.extensions.pop('draining')
+
+def test_gunicorn_config(monkeypatch):
+    """
+    Testa os valores derivados do ambiente na configuração do gunicorn
+    """
+    monkeypatch.setenv('WEB_CONCURRENCY', '3')
+    monkeypatch.setenv('GUNICORN_THREADS', '8')
+    monkeypatch.setenv('PORT', '9000')
+    # setenv + delenv: o monkeypatch restaura a variável que a configuração define
+    monkeypatch.setenv('PASSWORD_HASH_WORKERS', '')
+    monkeypatch.delenv('PASSWORD_HASH_WORKERS')
+    
+    config = runpy.run_path(os.path.join(ROOT, 'gunicorn.conf.py'))
+    
+    assert config['workers'] == 3
+    assert config['threads'] == 8
+    assert config['bind'] == '0.0.0.0:9000'
+    assert config['preload_app'] is True
+    assert config['graceful_timeout'] > 0
+    assert int(os.environ['PASSWORD_HASH_WORKERS']) >= 1
+    assert os.environ['WEB_CONCURRENCY'] == '3'
+
+def test_gunicorn_post_fork_disposes_every_engine(tmp_path, monkeypatch):
+    """
+    Testa que o post_fork descarta o pool herdado do primário e de cada réplica
+    """
+    import sys
+    import types
+    from sqlalchemy.engine import Engine
+    from calorie_tracker import db
+
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/primary.db',
+                      'SQLALCHEMY_BINDS': {'replica': f'sqlite:///{tmp_path}/replica.db'},
+                      'READ_REPLICA_BINDS': ('replica',)})
+    monkeypatch.setitem(sys.modules, 'app', types.SimpleNamespace(app=app))
+    for name in ('WEB_CONCURRENCY', 'PASSWORD_HASH_WORKERS'):
+        monkeypatch.setenv(name, '1')
+    disposed = []
+    monkeypatch.setattr(Engine, 'dispose', lambda engine, close=True: disposed.append((engine, close)))
+
+    config = runpy.run_path(os.path.join(ROOT, 'gunicorn.conf.py'))
+    config['post_fork'](None, None)
+
+    with app.app_context():
+        engines = set(db.engines.values())
+    assert len(engines) == 2
+    assert {engine for engine, _ in disposed} == engines
+    assert not any(close for _, close in disposed)
@@ -0,0 +1,72 @@
+import pytest
+from calorie_tracker import db
+from calorie_tracker.models import User, FoodItem, FoodEntry
+from datetime import date
+
+@pytest.fixture(scope='module')
+def history_entries(test_app):
+    # Entradas em datas fixas de 2020 para testar os agrupamentos
+    with test_app.app_context():
+        user = User.query.filter_by(username='testuser').first()
+        food = FoodItem(name='Histórico Teste', calories=100, protein=10, carbs=20, fat=1)
+        db.session.add(food)
+        db.session.flush()
+        db.session.add_all([
+            FoodEntry(user_id=user.id, food_item_id=food.id, quantity=1, date=date(2020, 1, 6)),   # segunda
+            FoodEntry(user_id=user.id, food_item_id=food.id, quantity=2, date=date(2020, 1, 6)),
+            FoodEntry(user_id=user.id, food_item_id=food.id, quantity=1, date=date(2020, 1, 12)),  # domingo
+            FoodEntry(user_id=user.id, food_item_id=food.id, quantity=1, date=date(2020, 1, 13)),  # segunda
+            FoodEntry(user_id=user.id, food_item_id=food.id, quantity=4, date=date(2020, 2, 3))
+        ])
+        db.session.commit()
+
+def test_history_daily(auth_client, history_entries):
+    """
+    Testa a série diária de /api/history
+    """
+    response = auth_client.get('/api/history?from=2020-01-01&to=2020-02-29')
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['bucket'] == 'day'
+    assert [p['period'] for p in data['series']] == ['2020-01-06', '2020-01-12', '2020-01-13', '2020-02-03']
+    first = data['series'][0]
+    assert first['calories'] == 300
+    assert first['protein'] == 30
+    assert first['carbs'] == 60
+    assert first['fat'] == 3
+    assert first['entries'] == 2
+    # Intervalo totalmente no passado pode ser guardado por mais tempo
+    assert 'private' in response.headers['Cache-Control']
+    assert 'max-age=3600' in response.headers['Cache-Control']
+
+def test_history_weekly_and_monthly(auth_client, history_entries):
+    """
+    Testa os agrupamentos semanal (a partir de segunda-feira) e mensal
+    """
+    response = auth_client.get('/api/history?from=2020-01-01&to=2020-02-29&bucket=week')
+    series = response.get_json()['series']
+    assert [(p['period'], p['calories'], p['entries']) for p in series] == [
+        ('2020-01-06', 400, 3),
+        ('2020-01-13', 100, 1),
+        ('2020-02-03', 400, 1)
+    ]
+
+    response = auth_client.get('/api/history?from=2020-01-01&to=2020-02-29&bucket=month')
+    series = response.get_json()['series']
+    assert [(p['period'], p['calories']) for p in series] == [('2020-01-01', 500), ('2020-02-01', 400)]
+
+def test_history_defaults_and_validation(auth_client):
+    """
+    Testa o intervalo padrão (últimos 30 dias) e a validação de parâmetros
+    """
+    response = auth_client.get('/api/history')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert (date.fromisoformat(data['to']) - date.fromisoformat(data['from'])).days == 29
+    assert 'max-age=60' in response.headers['Cache-Control']
+
+    assert auth_client.get('/api/history?bucket=year').status_code == 400
+    assert auth_client.get('/api/history?from=2020-13-01').status_code == 400
+    assert auth_client.get('/api/history?from=2020-02-01&to=2020-01-01').status_code == 400
+    assert auth_client.get('/api/history?from=2000-01-01&to=2020-01-01').status_code == 400
@@ -0,0 +1,77 @@
+import pytest
+from starlette.testclient import TestClient
+from calorie_tracker import create_app, db
+from calorie_tracker.asgi import create_asgi_app
+from calorie_tracker.models import User, FoodItem
+
+
+@pytest.fixture
+def limited_app(tmp_path):
+    # App próprio por teste: os baldes ficam no processo e começam cheios
+    app = create_app({
+        'TESTING': True,
+        'WTF_CSRF_ENABLED': False,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/limits.db',
+        'RATE_LIMITS': {'POST auth.login': '2/minute', 'POST api.add_entry': '2/minute'},
+    })
+    with app.app_context():
+        db.create_all()
+        users = [User(username=f'limited{i}', email=f'limited{i}@example.com', password_hash='-')
+                 for i in range(2)]
+        food = FoodItem(name='Pão', calories=250)
+        db.session.add_all([*users, food])
+        db.session.commit()
+        app.config['TEST_USER_IDS'] = [user.id for user in users]
+        app.config['TEST_FOOD_ID'] = food.id
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+def test_login_rate_limited_by_ip(limited_app):
+    """
+    Testa o 429 com Retry-After após o limite de POST /login do mesmo IP (GET não é limitado)
+    """
+    client = limited_app.test_client()
+    credentials = {'username': 'nobody', 'password': 'wrong'}
+
+    for _ in range(2):
+        assert client.post('/login', data=credentials).status_code == 302
+    response = client.post('/login', data=credentials)
+
+    assert response.status_code == 429
+    assert 1 <= int(response.headers['Retry-After']) <= 30
+    assert client.get('/login').status_code == 200
+    other_ip = client.post('/login', data=credentials, environ_base={'REMOTE_ADDR': '10.0.0.2'})
+    assert other_ip.status_code == 302
+
+def test_add_entry_rate_limited_per_user(limited_app, logged_client):
+    """
+    Testa que o limite de POST /api/entry é por usuário (JSON 429) e vale também na camada ASGI
+    """
+    first_id, second_id = limited_app.config['TEST_USER_IDS']
+    payload = {'food_item_id': limited_app.config['TEST_FOOD_ID'], 'quantity': 1}
+    first = logged_client(limited_app, first_id)
+
+    assert first.post('/api/entry', json=payload).status_code == 201
+    assert first.post('/api/entry', json=payload).status_code == 201
+    response = first.post('/api/entry', json=payload)
+    assert response.status_code == 429
+    assert response.get_json() == {'error': 'Too many requests'}
+    assert int(response.headers['Retry-After']) >= 1
+
+    # Outro usuário, mesmo IP: balde próprio
+    second = logged_client(limited_app, second_id)
+    assert second.post('/api/entry', json=payload).status_code == 201
+
+    # A camada ASGI usa os mesmos baldes
+    serializer = limited_app.session_interface.get_signing_serializer(limited_app)
+    with TestClient(create_asgi_app(limited_app)) as asgi_client:
+        for user_id, expected in ((first_id, 429), (second_id, 201)):
+            asgi_client.cookies.set(limited_app.config['SESSION_COOKIE_NAME'],
+                                    serializer.dumps({'_user_id': str(user_id), '_fresh': True}))
+            response = asgi_client.post('/api/entry', json=payload)
+            assert response.status_code == expected
+    assert 'Retry-After' not in response.headers
@@ -0,0 +1,103 @@
+import shutil
+import pytest
+from calorie_tracker import create_app, db
+from calorie_tracker.models import User, FoodItem
+from calorie_tracker.cache import get_cache
+from calorie_tracker.tokens import issue_token
+
+
+@pytest.fixture(scope='module')
+def replica_app(tmp_path_factory):
+    # Dois arquivos SQLite: a "réplica" é uma cópia do primário que não recebe
+    # as escritas seguintes, então o resultado de cada leitura mostra a origem
+    base = tmp_path_factory.mktemp('replicas')
+    primary_path, replica_path = base / 'primary.db', base / 'replica.db'
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{primary_path}',
+        'SQLALCHEMY_BINDS': {'replica': f'sqlite:///{replica_path}'},
+        'READ_REPLICA_BINDS': ('replica',),
+    })
+    with app.app_context():
+        db.create_all()
+        user = User(username='replicauser', email='replica@example.com', password_hash='-')
+        other = User(username='replicaother', email='replicaother@example.com', password_hash='-')
+        db.session.add_all([user, other, FoodItem(name='Arroz Replicado', calories=130)])
+        db.session.commit()
+        app.config['TEST_USER_ID'] = user.id
+        app.config['TEST_OTHER_USER_ID'] = other.id
+        # Fecha as conexões para o WAL ser incorporado ao arquivo antes da cópia
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+        shutil.copy(primary_path, replica_path)
+
+        db.session.add(FoodItem(name='Feijão Só no Primário', calories=127))
+        db.session.commit()
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+@pytest.fixture
+def replica_client(replica_app, logged_client):
+    return logged_client(replica_app, replica_app.config['TEST_USER_ID'])
+
+def _food_names(client, headers=None):
+    response = client.get('/api/food', headers=headers)
+    assert response.status_code == 200
+    return {item['name'] for item in response.get_json()}
+
+def test_read_only_views_use_replica(replica_client):
+    """
+    Testa que GET em view somente leitura consulta a réplica
+    """
+    names = _food_names(replica_client)
+
+    assert 'Arroz Replicado' in names
+    assert 'Feijão Só no Primário' not in names
+
+def test_writes_go_to_primary_and_stick(replica_app, replica_client, logged_client):
+    """
+    Testa que a escrita vai ao primário e que o cliente lê do primário logo depois
+    """
+    response = replica_client.post('/api/food', json={'name': 'Lentilha Nova', 'calories': 116})
+    assert response.status_code == 201
+
+    # Leitura logo após a escrita: janela de read-your-writes
+    names = _food_names(replica_client)
+    assert {'Lentilha Nova', 'Feijão Só no Primário'} <= names
+
+    # Outro usuário, sem escrita recente, continua na réplica
+    other = logged_client(replica_app, replica_app.config['TEST_OTHER_USER_ID'])
+    assert 'Lentilha Nova' not in _food_names(other)
+
+    # Janela expirada: volta para a réplica
+    with replica_app.app_context():
+        get_cache().clear()
+    assert 'Lentilha Nova' not in _food_names(replica_client)
+
+def test_token_client_reads_its_writes(replica_app):
+    """
+    Testa a janela de read-your-writes de um cliente com token Bearer (sem cookie de sessão)
+    """
+    with replica_app.app_context():
+        token = issue_token(db.session.get(User, replica_app.config['TEST_USER_ID']))
+    client = replica_app.test_client(use_cookies=False)
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.post('/api/food', json={'name': 'Grão-de-Bico Novo', 'calories': 164}, headers=headers)
+    assert response.status_code == 201
+    assert 'Set-Cookie' not in response.headers
+    assert 'Grão-de-Bico Novo' in _food_names(client, headers=headers)
+
+def test_unknown_replica_bind_rejected(tmp_path):
+    """
+    Testa que READ_REPLICA_BINDS só aceita binds definidos em SQLALCHEMY_BINDS
+    """
+    with pytest.raises(RuntimeError):
+        create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/app.db',
+                    'READ_REPLICA_BINDS': ('replica',)})
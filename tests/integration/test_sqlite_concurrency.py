@@ -0,0 +1,74 @@
+import pytest
+import threading
+import time
+from sqlalchemy import text
+from calorie_tracker import db
+from calorie_tracker.models import FoodItem
+from calorie_tracker.summaries import find_summary_mismatches
+
+WRITERS = 6
+READERS = 4
+REQUESTS_PER_THREAD = 25
+
+
+@pytest.mark.sqlite_only
+def test_sqlite_pragmas_applied(test_app):
+    """
+    Testa que cada conexão SQLite abre em WAL com busy_timeout configurado
+    """
+    with test_app.app_context():
+        with db.engine.connect() as connection:
+            assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+            assert connection.execute(text('PRAGMA busy_timeout')).scalar() == \
+                test_app.config['SQLITE_BUSY_TIMEOUT']
+            # NORMAL = 1
+            assert connection.execute(text('PRAGMA synchronous')).scalar() == 1
+
+def test_concurrent_writers_and_dashboard_readers(test_app, test_user, logged_client):
+    """
+    Testa escritores e leitores simultâneos: nenhum "database is locked" e
+    resumos diários consistentes com as entradas gravadas
+    """
+    with test_app.app_context():
+        food_id = FoodItem.query.filter_by(name='Maçã').first().id
+
+    errors = []
+    counts = {'write': 0, 'read': 0}
+    lock = threading.Lock()
+
+    def writer():
+        client = logged_client(test_app, test_user.id)
+        for _ in range(REQUESTS_PER_THREAD):
+            response = client.post('/api/entry', json={'food_item_id': food_id, 'quantity': 1})
+            with lock:
+                if response.status_code == 201:
+                    counts['write'] += 1
+                else:
+                    errors.append(('write', response.status_code, response.get_data(as_text=True)))
+
+    def reader():
+        client = logged_client(test_app, test_user.id)
+        for _ in range(REQUESTS_PER_THREAD):
+            response = client.get('/dashboard')
+            with lock:
+                if response.status_code == 200:
+                    counts['read'] += 1
+                else:
+                    errors.append(('read', response.status_code, response.get_data(as_text=True)))
+
+    threads = ([threading.Thread(target=writer) for _ in range(WRITERS)]
+               + [threading.Thread(target=reader) for _ in range(READERS)])
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{counts['write']} escritas e {counts['read']} leituras em {elapsed:.2f}s "
+          f"({(counts['write'] + counts['read']) / elapsed:.0f} req/s)")
+    assert errors == []
+    assert counts == {'write': WRITERS * REQUESTS_PER_THREAD, 'read': READERS * REQUESTS_PER_THREAD}
+    with test_app.app_context():
+        db.session.expire_all()
+        assert find_summary_mismatches() == []
@@ -0,0 +1,68 @@
+import os
+from flask import Flask
+from sqlalchemy import inspect
+from calorie_tracker import create_app, db
+from calorie_tracker.config import Config
+from calorie_tracker.database import configure_engine_options
+
+
+def test_create_app_does_not_touch_database(tmp_path):
+    """
+    Testa que criar o app não abre conexão nem cria o arquivo do banco
+    """
+    db_path = tmp_path / 'lazy.db'
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+    
+    assert not os.path.exists(db_path)
+    assert {'auth', 'main', 'api'} <= set(app.blueprints)
+    assert app.url_map.bind('').match('/api/food')[0] == 'api.api_food'
+
+def test_memory_cache_with_several_workers_warns(tmp_path, caplog):
+    """
+    Testa o aviso ao subir com cache em memória e vários processos (cache e ETags desligados)
+    """
+    config = {'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path}/warn.db'}
+    create_app(config)
+    assert 'CACHE_BACKEND' not in caplog.text
+
+    create_app({**config, 'WEB_CONCURRENCY': 3})
+    assert "CACHE_BACKEND='memory' with WEB_CONCURRENCY=3" in caplog.text
+
+def test_init_db_command_creates_schema(tmp_path):
+    """
+    Testa que o schema é criado pelo comando explícito `flask init-db`
+    """
+    db_path = tmp_path / 'init.db'
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+    
+    result = app.test_cli_runner().invoke(args=['init-db'])
+    
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        tables = set(inspect(db.engine).get_table_names())
+        db.engine.dispose()
+    assert {'user', 'food_item', 'food_entry', 'daily_summary'} <= tables
+
+def test_engine_pool_options_from_config():
+    """
+    Testa que as chaves DB_POOL_* viram opções do engine (exceto no SQLite)
+    """
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(SQLALCHEMY_DATABASE_URI='postgres://app:secret@db/calories',
+                      DB_POOL_SIZE=20, DB_MAX_OVERFLOW=0,
+                      SQLALCHEMY_ENGINE_OPTIONS={'pool_recycle': 60})
+    
+    configure_engine_options(app)
+    
+    assert app.config['SQLALCHEMY_DATABASE_URI'] == 'postgresql://app:secret@db/calories'
+    options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    assert options['pool_size'] == 20
+    assert options['max_overflow'] == 0
+    assert options['pool_pre_ping'] is True
+    # Opção explícita prevalece sobre DB_POOL_RECYCLE
+    assert options['pool_recycle'] == 60
+    
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite:///:memory:', SQLALCHEMY_ENGINE_OPTIONS={})
+    configure_engine_options(app)
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS'] == {}
@@ -0,0 +1,61 @@
+from calorie_tracker.cache import LRUCache
+
+def test_lru_cache_get_set_and_stats():
+    """
+    Testa leitura, escrita e contadores de acerto/falha do cache em memória
+    """
+    cache = LRUCache(maxsize=10, ttl=60)
+
+    assert cache.get('a') is None
+    cache.set('a', {'calories': 100})
+    assert cache.get('a') == {'calories': 100}
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['size'] == 1
+
+    cache.delete('a')
+    assert cache.get('a') is None
+
+def test_lru_cache_ttl(monkeypatch):
+    """
+    Testa a expiração dos itens pelo TTL
+    """
+    now = [1000.0]
+    monkeypatch.setattr('calorie_tracker.cache.time.monotonic', lambda: now[0])
+    cache = LRUCache(maxsize=10, ttl=30)
+
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=120)
+    now[0] += 31
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    assert cache.stats()['size'] == 1
+
+def test_lru_cache_eviction():
+    """
+    Testa o descarte do item usado há mais tempo quando o cache enche
+    """
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+def test_lru_cache_delete_prefix():
+    """
+    Testa a remoção só das chaves com o prefixo dado
+    """
+    cache = LRUCache(maxsize=10, ttl=60)
+    for key in ('totals:1:2024-01-01', 'totals:2:2024-01-01', 'catalog:public'):
+        cache.set(key, 1)
+    cache.delete_prefix('totals:')
+
+    assert cache.get('totals:1:2024-01-01') is None
+    assert cache.get('catalog:public') == 1
+    assert cache.stats()['size'] == 1
@@ -1,5 +1,6 @@
 import pytest
-from app import User, FoodItem, FoodEntry, db
+from calorie_tracker import db
+from calorie_tracker.models import User, FoodItem, FoodEntry
 from datetime import datetime, timedelta
 
 def test_new_user(test_client, new_user):
@@ -100,3 +101,124 @@ def test_user_remaining_calories(test_user, test_app):
         # Restaura o valor original
         test_user.daily_calorie_goal = original_goal
         db.session.commit()
+
+def test_composite_indexes(test_app):
+    """
+    Testa que os índices compostos usados pelas queries principais existem
+    """
+    from sqlalchemy import inspect
+
+    with test_app.app_context():
+        inspector = inspect(db.engine)
+        entry_indexes = {i['name']: i['column_names'] for i in inspector.get_indexes('food_entry')}
+        food_indexes = {i['name']: i['column_names'] for i in inspector.get_indexes('food_item')}
+
+        assert entry_indexes['ix_food_entry_user_id_date'] == ['user_id', 'date']
+        assert food_indexes['ix_food_item_is_public_user_id'] == ['is_public', 'user_id']
+
+def test_daily_summary_maintained_on_write(test_user, test_app):
+    """
+    Testa que DailySummary acompanha inserções, edições e remoções de FoodEntry
+    """
+    from calorie_tracker.models import DailySummary
+    from calorie_tracker.summaries import get_nutrition_totals
+
+    with test_app.app_context():
+        food = FoodItem(name='Resumo Teste', calories=100, protein=10, carbs=20, fat=5)
+        db.session.add(food)
+        db.session.commit()
+
+        day = datetime.utcnow().date() - timedelta(days=10)
+        entry = FoodEntry(user_id=test_user.id, food_item_id=food.id, quantity=2, date=day)
+        db.session.add(entry)
+        db.session.commit()
+
+        summary = db.session.get(DailySummary, (test_user.id, day))
+        assert summary.calories == 200
+        assert summary.protein == 20
+        assert summary.carbs == 40
+        assert summary.fat == 10
+        assert summary.entry_count == 1
+
+        entry.quantity = 3
+        db.session.commit()
+        assert get_nutrition_totals(test_user.id, day)['calories'] == 300
+
+        db.session.delete(entry)
+        db.session.commit()
+        summary = db.session.get(DailySummary, (test_user.id, day))
+        assert summary.entry_count == 0
+        assert summary.calories == 0
+
+def test_rebuild_summaries_command(test_user, test_app):
+    """
+    Testa o comando que recalcula e verifica os resumos diários
+    """
+    from calorie_tracker.models import DailySummary
+
+    with test_app.app_context():
+        runner = test_app.test_cli_runner()
+
+        # Corrompe um resumo para simular inconsistência
+        summary = DailySummary.query.filter(DailySummary.entry_count > 0).first()
+        key = (summary.user_id, summary.date)
+        expected_calories = summary.calories
+        summary.calories = -1
+        db.session.commit()
+
+        result = runner.invoke(args=['rebuild-summaries', '--check'])
+        assert result.exit_code == 1
+        assert '1 resumo(s) inconsistente(s)' in result.output
+
+        result = runner.invoke(args=['rebuild-summaries'])
+        assert result.exit_code == 0
+
+        db.session.expire_all()
+        assert db.session.get(DailySummary, key).calories == expected_calories
+        result = runner.invoke(args=['rebuild-summaries', '--check'])
+        assert result.exit_code == 0
+
+def test_daily_summary_multiple_entries_same_flush(test_user, test_app):
+    """
+    Testa várias entradas do mesmo dia novo gravadas em um único commit
+    """
+    from calorie_tracker.models import DailySummary
+
+    with test_app.app_context():
+        food = FoodItem.query.filter_by(name='Maçã').first()
+        day = datetime.utcnow().date() - timedelta(days=20)
+        db.session.add_all([
+            FoodEntry(user_id=test_user.id, food_item_id=food.id, quantity=1, date=day),
+            FoodEntry(user_id=test_user.id, food_item_id=food.id, quantity=2, date=day)
+        ])
+        db.session.commit()
+
+        summary = db.session.get(DailySummary, (test_user.id, day))
+        assert summary.entry_count == 2
+        assert summary.calories == food.calories * 3
+
+def test_daily_summary_bulk_update_and_delete(test_user, test_app):
+    """
+    Testa o recálculo no banco dos resumos após query.update() e query.delete() em FoodEntry
+    """
+    from calorie_tracker.models import DailySummary
+
+    with test_app.app_context():
+        food = FoodItem.query.filter_by(name='Maçã').first()
+        day, other_day = (datetime.utcnow().date() - timedelta(days=n) for n in (30, 31))
+        db.session.add_all([FoodEntry(user_id=test_user.id, food_item_id=food.id, quantity=q, date=day)
+                            for q in (1, 2)])
+        db.session.commit()
+        summary = db.session.get(DailySummary, (test_user.id, day))
+        assert summary.entry_count == 2
+
+        # Move uma entrada para outro dia (novo resumo) e dobra a quantidade da outra
+        FoodEntry.query.filter_by(user_id=test_user.id, date=day, quantity=2).update({'date': other_day})
+        FoodEntry.query.filter_by(user_id=test_user.id, date=day).update({'quantity': 3})
+        db.session.commit()
+        assert (summary.entry_count, summary.calories) == (1, food.calories * 3)
+        assert db.session.get(DailySummary, (test_user.id, other_day)).calories == food.calories * 2
+
+        FoodEntry.query.filter_by(user_id=test_user.id, date=day).delete()
+        db.session.commit()
+        assert (summary.entry_count, summary.calories) == (0, 0)
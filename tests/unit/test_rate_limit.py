@@ -0,0 +1,63 @@
+import pytest
+from calorie_tracker.ratelimit import MemoryBucketStore, RateLimiter, parse_rate, retry_after
+
+def test_parse_rate():
+    """
+    Testa a conversão de 'N/período' em capacidade e fichas por segundo
+    """
+    assert parse_rate('10/minute') == (10, 10 / 60)
+    assert parse_rate('5/second') == (5, 5)
+    for spec in ('10', '10/week', 'ten/minute', '0/minute'):
+        with pytest.raises(RuntimeError):
+            parse_rate(spec)
+
+def test_memory_bucket_burst_and_refill(monkeypatch):
+    """
+    Testa o token bucket: rajada até a capacidade, espera até a próxima ficha e reposição
+    """
+    now = [1000.0]
+    monkeypatch.setattr('calorie_tracker.ratelimit.time.monotonic', lambda: now[0])
+    store = MemoryBucketStore()
+    capacity, rate = parse_rate('3/minute')
+
+    assert [store.take('a', capacity, rate) for _ in range(3)] == [0, 0, 0]
+    assert store.take('a', capacity, rate) == pytest.approx(20)
+    assert store.take('b', capacity, rate) == 0
+
+    now[0] += 10
+    assert store.take('a', capacity, rate) == pytest.approx(10)
+    now[0] += 10
+    assert store.take('a', capacity, rate) == 0
+    # A reposição não passa da capacidade
+    now[0] += 3600
+    assert [store.take('a', capacity, rate) for _ in range(4)][-1] > 0
+    assert retry_after(0.2) == 1 and retry_after(19.5) == 20
+
+def test_memory_bucket_eviction():
+    """
+    Testa o descarte do balde usado há mais tempo além de max_keys
+    """
+    store = MemoryBucketStore(max_keys=2)
+    capacity, rate = parse_rate('1/hour')
+    store.take('a', capacity, rate)
+    store.take('b', capacity, rate)
+    store.take('c', capacity, rate)
+
+    # 'a' foi descartado e recomeça cheio; 'c' continua vazio
+    assert store.take('a', capacity, rate) == 0
+    assert store.take('c', capacity, rate) > 0
+
+def test_rate_limiter_rules():
+    """
+    Testa as regras por método e endpoint e os baldes separados por cliente
+    """
+    limiter = RateLimiter(MemoryBucketStore(), {'POST auth.login': '1/minute',
+                                                'api.api_food': '1/minute'})
+
+    assert limiter.rule('auth.login', 'GET') is None
+    assert limiter.wait('auth.login', 'GET', 'ip:1') == 0
+    assert limiter.wait('auth.login', 'POST', 'ip:1') == 0
+    assert limiter.wait('auth.login', 'POST', 'ip:1') > 0
+    assert limiter.wait('auth.login', 'POST', 'ip:2') == 0
+    assert limiter.wait('api.api_food', 'GET', 'user:1') == 0
+    assert limiter.wait('api.api_food', 'POST', 'user:1') > 0
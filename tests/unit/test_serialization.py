@@ -0,0 +1,64 @@
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from flask.json.provider import DefaultJSONProvider
+from calorie_tracker import create_app
+from calorie_tracker.compression import compress_body, weak_etag
+from calorie_tracker.json_provider import OrjsonProvider
+
+
+@pytest.fixture
+def app():
+    return create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+
+def test_orjson_provider_matches_default(app):
+    """
+    Testa que o provedor orjson gera o mesmo JSON (compacto, chaves ordenadas) do padrão
+    """
+    assert isinstance(app.json, OrjsonProvider)
+    default = DefaultJSONProvider(app)
+    payload = {'name': 'Pão de queijo', 'calories': 330.0, 'protein': 62, 'tags': None,
+               'day': date(2024, 1, 2), 'at': datetime(2024, 1, 2, 3, 4, 5),
+               'price': Decimal('1.50'), 'items': [{'b': 1, 'a': 2}]}
+
+    with app.app_context():
+        fast = app.json.dumps(payload)
+        assert json.loads(fast) == json.loads(default.dumps(payload))
+        assert fast.startswith('{"at":"Tue, 02 Jan 2024 03:04:05 GMT","calories":330.0,')
+        assert app.json.loads(fast.encode()) == json.loads(fast)
+        # Opções do módulo json continuam funcionando
+        assert app.json.dumps({'a': 1}, indent=2) == '{\n  "a": 1\n}'
+
+        response = app.json.response(payload)
+        assert response.mimetype == 'application/json'
+        assert response.get_json() == json.loads(fast)
+
+def test_json_provider_setting():
+    """
+    Testa a escolha do provedor por JSON_PROVIDER
+    """
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'JSON_PROVIDER': 'default'})
+    assert type(app.json) is DefaultJSONProvider
+
+    with pytest.raises(RuntimeError):
+        create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'JSON_PROVIDER': 'ujson'})
+
+def test_compress_body(app):
+    """
+    Testa a compressão por tamanho mínimo e Accept-Encoding
+    """
+    data = b'{"name":"Arroz"}' * 200
+    body, encoding = compress_body(data, 'gzip, deflate', app.config)
+    assert encoding == 'gzip'
+    assert gzip.decompress(body) == data
+    assert len(body) < len(data)
+
+    assert compress_body(data, None, app.config) == (data, None)
+    assert compress_body(data, 'gzip;q=0, identity', app.config) == (data, None)
+    assert compress_body(data[:100], 'gzip', app.config) == (data[:100], None)
+    assert compress_body(data, 'gzip', {**app.config, 'COMPRESS_MIN_SIZE': 0}) == (data, None)
+
+    assert weak_etag('"abc"') == 'W/"abc"'
+    assert weak_etag('W/"abc"') == 'W/"abc"'